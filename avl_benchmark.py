@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+AVL Tree Benchmark for CrossDebate
+
+Compares the recursive AVLTree methods (insert/delete/search with an explicit
+root argument) against the iterative insert_key/delete_key/search_key, and
+the memory of __slots__ nodes against plain nodes with a per-instance dict,
+and the throughput of readers running concurrently with a writer on a
+lock-guarded AVLTree versus a lock-free PersistentAVLTree, and the
+array-backed ArrayAVLTree against AVLTree for numeric keys.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from avl_tree import ArrayAVLTree, AVLTree, Node, PersistentAVLTree
+
+DEFAULT_KEYS = 200_000
+DEFAULT_READERS = [1, 4, 16]
+DEFAULT_DURATION = 2.0
+
+
+class _DictNode(Node):
+    """Node subclass without __slots__, so every instance gets a __dict__ like the original Node."""
+
+
+class _DictTree(AVLTree):
+    _node = _DictNode
+
+
+def _timed(action: Callable[[int], None], keys: List[int]) -> float:
+    start = time.perf_counter()
+    for key in keys:
+        action(key)
+    return len(keys) / (time.perf_counter() - start)
+
+
+def benchmark_operations(keys: List[int]) -> Dict[str, Dict[str, float]]:
+    """
+    Time insert, search and delete of every key with both code paths.
+
+    Returns:
+        Operations per second by implementation and operation
+    """
+    lookups = random.Random(7).sample(keys, len(keys))
+    results = {}
+
+    tree = AVLTree()
+
+    def insert(key):
+        tree.root = tree.insert(tree.root, key)
+
+    def delete(key):
+        tree.root = tree.delete(tree.root, key)
+
+    results['recursive'] = {
+        'insert': _timed(insert, keys),
+        'search': _timed(lambda key: tree.search(tree.root, key), lookups),
+        'delete': _timed(delete, lookups),
+    }
+
+    tree = AVLTree()
+    results['iterative'] = {
+        'insert': _timed(tree.insert_key, keys),
+        'search': _timed(tree.search_key, lookups),
+        'delete': _timed(tree.delete_key, lookups),
+    }
+    return results
+
+
+def benchmark_memory(keys: List[int]) -> Dict[str, Dict[str, float]]:
+    """
+    Measure the memory and number of allocations needed to hold the keys.
+
+    Returns:
+        Bytes and allocated blocks per key, by node layout
+    """
+    results = {}
+    for name, cls in (('dict node', _DictTree), ('slots node', AVLTree)):
+        tree = cls()
+        tracemalloc.start()
+        try:
+            for key in keys:
+                tree.insert_key(key)
+            snapshot = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+        stats = snapshot.statistics('filename')
+        size = sum(stat.size for stat in stats)
+        blocks = sum(stat.count for stat in stats)
+        results[name] = {'bytes_per_key': size / len(keys), 'blocks_per_key': blocks / len(keys)}
+        del tree
+    return results
+
+
+def benchmark_numeric(count: int) -> Dict[str, Dict[str, float]]:
+    """
+    Compare AVLTree and ArrayAVLTree holding count int keys.
+
+    Memory is measured on a separate build, since tracing allocations slows
+    the array version (which boxes an int on every read) far more than the
+    object version. Keys are created while memory is traced, so the int
+    objects the object tree keeps alive are counted too.
+
+    Returns:
+        Bytes per key, inserts per second and lookups per second, by implementation
+    """
+    modulus = count * 10
+    keys = [(i * 2654435761) % modulus + modulus for i in range(count)]
+    lookups = random.Random(3).sample(keys, min(count, 100_000))
+    results = {}
+    for name, factory in (('AVLTree', AVLTree), ("ArrayAVLTree('q')", ArrayAVLTree)):
+        tree = factory()
+        inserts = _timed(tree.insert_key, keys)
+        searches = _timed(tree.search_key, lookups)
+        del tree
+        tree = factory()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            for i in range(count):
+                tree.insert_key((i * 2654435761) % modulus + modulus)
+            used = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        del tree
+        results[name] = {'bytes_per_key': used / count, 'inserts_per_sec': inserts,
+                         'lookups_per_sec': searches}
+    return results
+
+
+class _LockedTree:
+    """AVLTree whose readers and writer share one lock, the baseline for PersistentAVLTree."""
+
+    def __init__(self, tree: AVLTree):
+        self._tree = tree
+        self._lock = threading.Lock()
+
+    def search_key(self, key):
+        with self._lock:
+            return self._tree.search_key(key)
+
+    def insert_key(self, key):
+        with self._lock:
+            self._tree.insert_key(key)
+
+    def delete_key(self, key):
+        with self._lock:
+            self._tree.delete_key(key)
+
+
+def run_readers(tree, readers: int, keys: List[int], duration: float) -> Dict[str, float]:
+    """
+    Run search_key on reader threads while one writer inserts and deletes keys.
+
+    Returns:
+        Lookups per second across all readers and writer operations per second
+    """
+    stop = threading.Event()
+    counts = [0] * (readers + 1)
+    key_space = len(keys) * 10
+
+    def reader(index):
+        rng = random.Random(index)
+        lookups = [rng.choice(keys) for _ in range(256)]
+        search = tree.search_key
+        done = 0
+        while not stop.is_set():
+            for key in lookups:
+                search(key)
+            done += len(lookups)
+        counts[index] = done
+
+    def writer():
+        rng = random.Random(-1)
+        done = 0
+        while not stop.is_set():
+            key = rng.randrange(key_space)
+            tree.insert_key(key)
+            tree.delete_key(key)
+            done += 2
+        counts[readers] = done
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start  # Includes the batches finished after stop
+    return {'readers': readers, 'lookups_per_sec': sum(counts[:readers]) / elapsed,
+            'writes_per_sec': counts[readers] / elapsed}
+
+
+def benchmark_readers(keys: List[int], reader_counts: List[int] = DEFAULT_READERS,
+                      duration: float = DEFAULT_DURATION) -> Dict[str, List[Dict[str, float]]]:
+    """Compare reader throughput during writes on a locked AVLTree and a PersistentAVLTree."""
+    ordered = sorted(keys)
+    factories = {
+        'AVLTree+lock': lambda: _LockedTree(AVLTree.from_sorted(ordered)),
+        'PersistentAVLTree': lambda: PersistentAVLTree.from_sorted(ordered),
+    }
+    return {name: [run_readers(factory(), n, keys, duration) for n in reader_counts]
+            for name, factory in factories.items()}
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="CrossDebate AVL tree benchmark")
+    parser.add_argument("--keys", type=int, default=DEFAULT_KEYS,
+                        help=f"Number of distinct keys (default: {DEFAULT_KEYS})")
+    parser.add_argument("--readers", type=int, nargs="+", default=DEFAULT_READERS,
+                        help="Reader thread counts for the concurrent run (default: 1 4 16)")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION,
+                        help=f"Seconds per concurrent run (default: {DEFAULT_DURATION})")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    keys = random.Random(42).sample(range(args.keys * 10), args.keys)
+    results = {'operations': benchmark_operations(keys), 'memory': benchmark_memory(keys),
+               'readers': benchmark_readers(keys, args.readers, args.duration),
+               'numeric': benchmark_numeric(args.keys)}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'implementation':<14}{'insert/s':>12}{'search/s':>12}{'delete/s':>12}")
+    for name, row in results['operations'].items():
+        print(f"{name:<14}{row['insert']:>12,.0f}{row['search']:>12,.0f}{row['delete']:>12,.0f}")
+    print(f"\n{'node layout':<14}{'bytes/key':>12}{'blocks/key':>12}")
+    for name, row in results['memory'].items():
+        print(f"{name:<14}{row['bytes_per_key']:>12.1f}{row['blocks_per_key']:>12.2f}")
+    print(f"\n{'implementation':<20}{'readers':>8}{'lookups/s':>12}{'writes/s':>12}")
+    for name, rows in results['readers'].items():
+        for row in rows:
+            print(f"{name:<20}{row['readers']:>8}{row['lookups_per_sec']:>12,.0f}"
+                  f"{row['writes_per_sec']:>12,.0f}")
+    print(f"\n{'numeric keys':<20}{'bytes/key':>10}{'inserts/s':>12}{'lookups/s':>12}")
+    for name, row in results['numeric'].items():
+        print(f"{name:<20}{row['bytes_per_key']:>10.1f}{row['inserts_per_sec']:>12,.0f}"
+              f"{row['lookups_per_sec']:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,68 @@
+import bisect
+import itertools
+import math
+import mmap as _mmap
+import operator
+import struct
+import threading
+from array import array
+
+# Formato de save(): cabeçalho + chaves em ordem (um array ordenado é uma árvore
+# perfeitamente balanceada implícita). Tipos: 'q' int64, 'd' float64, 's' str UTF-8,
+# esta última com count + 1 offsets 'Q' seguidos dos bytes das chaves.
+AVL_MAGIC = b"AVLTREE1"
+_AVL_HEADER = struct.Struct("<8sc7xQ")  # magic, tipo, contagem (24 bytes: mantém o alinhamento de 8)
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+def _save_keys(path, keys):
+    # Um único tipo exato por arquivo: misturar int e float, ou guardar ints fora
+    # de int64 como 'd', mudaria chaves e buscas depois de load()
+    keys = list(keys)
+    if all(type(key) is int and _INT64_MIN <= key <= _INT64_MAX for key in keys):
+        kind = b'q'
+    elif all(type(key) is float for key in keys):
+        kind = b'd'
+    elif all(type(key) is str for key in keys):
+        kind = b's'
+    else:
+        raise TypeError("save() exige chaves todas int de 64 bits, todas float ou todas str")
+    with open(path, 'wb') as f:
+        f.write(_AVL_HEADER.pack(AVL_MAGIC, kind, len(keys)))
+        if kind == b's':
+            encoded = [key.encode() for key in keys]
+            offsets = array('Q', [0])
+            for data in encoded:
+                offsets.append(offsets[-1] + len(data))
+            f.write(offsets.tobytes())
+            f.writelines(encoded)
+        else:
+            f.write(array(kind.decode(), keys).tobytes())
+    return len(keys)
+
+
+class _StrKeys:
+    # Sequência de chaves str lida sob demanda dos offsets + bytes mapeados
+    __slots__ = ('_offsets', '_data')
+
+    def __init__(self, offsets, data):
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        return str(self._data[self._offsets[index]:self._offsets[index + 1]], 'utf-8')
+
+
 class Node:
+    # __slots__ evita um __dict__ por nó: menos memória e acesso mais rápido aos campos
+    __slots__ = ('key', 'left', 'right', 'height')
+
     def __init__(self, key):
         self.key = key
         self.left = None
@@ -6,6 +70,8 @@ class Node:
         self.height = 1
 
 class AVLTree:
+    _node = Node  # Classe dos nós criados pelos métodos iterativos; subclasses podem trocá-la
+
     def __init__(self):
         self.root = None
         
@@ -166,18 +232,1483 @@ class AVLTree:
             current = current.right
         return current.key
         
-    # Métodos de conveniência para uso externo
+    # Rotações usadas pelas versões iterativas, com o cálculo de altura embutido
+    def _rotate_right(self, z):
+        y = z.left
+        t2 = y.right
+        y.right = z
+        z.left = t2
+        hl = t2.height if t2 else 0
+        zr = z.right
+        hr = zr.height if zr else 0
+        z.height = h = (hl if hl > hr else hr) + 1
+        yl = y.left
+        hl = yl.height if yl else 0
+        y.height = (hl if hl > h else h) + 1
+        return y
+
+    def _rotate_left(self, z):
+        y = z.right
+        t2 = y.left
+        y.left = z
+        z.right = t2
+        hr = t2.height if t2 else 0
+        zl = z.left
+        hl = zl.height if zl else 0
+        z.height = h = (hl if hl > hr else hr) + 1
+        yr = y.right
+        hr = yr.height if yr else 0
+        y.height = (hr if hr > h else h) + 1
+        return y
+
+    def _rebalance(self, path):
+        # Sobe pelo caminho (raiz -> pai do nó alterado) recalculando alturas e
+        # rotacionando; para assim que a altura de uma subárvore não muda mais
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            left = node.left
+            right = node.right
+            hl = left.height if left else 0
+            hr = right.height if right else 0
+            old = node.height
+            if hl - hr > 1:
+                ll = left.left
+                lr = left.right
+                if (ll.height if ll else 0) < (lr.height if lr else 0):
+                    node.left = self._rotate_left(left)  # Caso Left Right
+                sub = self._rotate_right(node)
+            elif hr - hl > 1:
+                rl = right.left
+                rr = right.right
+                if (rr.height if rr else 0) < (rl.height if rl else 0):
+                    node.right = self._rotate_right(right)  # Caso Right Left
+                sub = self._rotate_left(node)
+            else:
+                h = (hl if hl > hr else hr) + 1
+                if h == old:
+                    return
+                node.height = h
+                continue
+            # A rotação trocou a raiz da subárvore: religa ao pai
+            if i:
+                parent = path[i - 1]
+                if parent.left is node:
+                    parent.left = sub
+                else:
+                    parent.right = sub
+            else:
+                self.root = sub
+            if sub.height == old:
+                return
+
+    # Métodos de conveniência para uso externo (iterativos, com pilha de caminho explícita)
+    # insert_key devolve o nó com a chave (novo ou já existente); delete_key, o nó removido ou None
     def insert_key(self, key):
-        self.root = self.insert(self.root, key)
-        
+        node = self.root
+        if node is None:
+            self.root = node = self._node(key)
+            return node
+        path = []
+        while True:
+            path.append(node)
+            if key < node.key:
+                child = node.left
+                if child is None:
+                    node.left = child = self._node(key)
+                    break
+            elif node.key < key:
+                child = node.right
+                if child is None:
+                    node.right = child = self._node(key)
+                    break
+            else:  # Chaves iguais não são permitidas
+                return node
+            node = child
+        self._rebalance(path)
+        return child
+
     def delete_key(self, key):
-        self.root = self.delete(self.root, key)
-        
+        path = []
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                path.append(node)
+                node = node.left
+            elif node.key < key:
+                path.append(node)
+                node = node.right
+            else:
+                break
+        if node is None:
+            return None
+        # Pai do nó removido (antes de o caminho ganhar os nós até o sucessor)
+        parent = path[-1] if path else None
+        if node.left is not None and node.right is not None:
+            # Nó com dois filhos: o sucessor é religado no lugar do nó, sem copiar chaves
+            index = len(path)
+            path.append(node)
+            above = node
+            successor = node.right
+            while successor.left is not None:
+                path.append(successor)
+                above = successor
+                successor = successor.left
+            if above is node:
+                node.right = successor.right
+            else:
+                above.left = successor.right
+            successor.left = node.left
+            successor.right = node.right
+            successor.height = node.height
+            path[index] = successor
+            replacement = successor
+        else:
+            replacement = node.left if node.left is not None else node.right
+        if parent is None:
+            self.root = replacement
+        elif parent.left is node:
+            parent.left = replacement
+        else:
+            parent.right = replacement
+        node.left = node.right = None
+        self._rebalance(path)
+        return node
+
+    # Vizinhos de uma chave: maior nó <= key (ou < key) e menor nó >= key (ou > key)
+    def _floor_node(self, key, inclusive=True):
+        best = None
+        node = self.root
+        while node is not None:
+            if node.key < key or (inclusive and not key < node.key):
+                best = node
+                node = node.right
+            else:
+                node = node.left
+        return best
+
+    def _ceiling_node(self, key, inclusive=True):
+        best = None
+        node = self.root
+        while node is not None:
+            if key < node.key or (inclusive and not node.key < key):
+                best = node
+                node = node.left
+            else:
+                node = node.right
+        return best
+
     def search_key(self, key):
-        return self.search(self.root, key)
+        node = self.root
+        while node is not None:
+            node_key = node.key
+            if key < node_key:
+                node = node.left
+            elif node_key < key:
+                node = node.right
+            else:
+                return node
+        return None
         
     def find_min(self):
         return self.get_min(self.root)
         
     def find_max(self):
         return self.get_max(self.root)
+
+    # Persistência compacta: só as chaves, em ordem
+    def save(self, path):
+        """
+        Grava as chaves em formato binário compacto; devolve quantas. As chaves
+        devem ser todas int de 64 bits, todas float ou todas str (senão, TypeError).
+        """
+        return _save_keys(path, self.irange())
+
+    @staticmethod
+    def load(path, mmap=True):
+        """Abre um arquivo de save() como FrozenAVLTree somente leitura, mapeado em memória se mmap."""
+        return FrozenAVLTree(path, mmap)
+
+    # Construção em O(n) e operações baseadas em join (split/join/união/interseção/diferença).
+    # As operações reaproveitam os nós: as árvores de entrada ficam vazias.
+    def _fix(self, node):
+        left = node.left
+        right = node.right
+        hl = left.height if left else 0
+        hr = right.height if right else 0
+        node.height = (hl if hl > hr else hr) + 1
+
+    def _tree(self, root):
+        tree = type(self)()
+        tree.root = root
+        return tree
+
+    @classmethod
+    def from_sorted(cls, iterable):
+        """
+        Constrói uma árvore perfeitamente balanceada a partir de chaves em ordem crescente, em O(n).
+        Chaves repetidas consecutivas são ignoradas; chaves fora de ordem geram ValueError.
+        """
+        tree = cls()
+        tree._load_sorted(iterable)
+        return tree
+
+    def _load_sorted(self, iterable):
+        keys = []
+        for key in iterable:
+            if keys and not keys[-1] < key:
+                if key < keys[-1]:
+                    raise ValueError(f"from_sorted() recebeu chaves fora de ordem: {key!r} após {keys[-1]!r}")
+                continue
+            keys.append(key)
+        self.root = self._build(keys, 0, len(keys))
+
+    def _build(self, keys, lo, hi):
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        node = self._node(keys[mid])
+        node.left = self._build(keys, lo, mid)
+        node.right = self._build(keys, mid + 1, hi)
+        node.height = (hi - lo).bit_length()  # Altura de uma subárvore perfeitamente balanceada
+        return node
+
+    def copy(self):
+        def clone(node):
+            if node is None:
+                return None
+            twin = self._node(node.key)
+            twin.left = clone(node.left)
+            twin.right = clone(node.right)
+            self._fix(twin)
+            return twin
+        return self._tree(clone(self.root))
+
+    def _join(self, left, node, right):
+        # Une left < node < right numa árvore AVL em O(|altura(left) - altura(right)|)
+        hl = left.height if left else 0
+        hr = right.height if right else 0
+        if hl > hr + 1:
+            return self._join_right(left, node, right)
+        if hr > hl + 1:
+            return self._join_left(left, node, right)
+        node.left = left
+        node.right = right
+        self._fix(node)
+        return node
+
+    def _join_right(self, left, node, right):
+        # left é mais alta: desce pela sua borda direita até achar altura compatível
+        outer = left.left
+        inner = left.right
+        ho = outer.height if outer else 0
+        hi = inner.height if inner else 0
+        if hi <= (right.height if right else 0) + 1:
+            node.left = inner
+            node.right = right
+            self._fix(node)
+            if node.height <= ho + 1:
+                left.right = node
+                self._fix(left)
+                return left
+            left.right = self._rotate_right(node)
+            self._fix(left)
+            return self._rotate_left(left)
+        sub = self._join_right(inner, node, right)
+        left.right = sub
+        self._fix(left)
+        if sub.height <= ho + 1:
+            return left
+        return self._rotate_left(left)
+
+    def _join_left(self, left, node, right):
+        # Espelho de _join_right: right é mais alta
+        outer = right.right
+        inner = right.left
+        ho = outer.height if outer else 0
+        hi = inner.height if inner else 0
+        if hi <= (left.height if left else 0) + 1:
+            node.left = left
+            node.right = inner
+            self._fix(node)
+            if node.height <= ho + 1:
+                right.left = node
+                self._fix(right)
+                return right
+            right.left = self._rotate_left(node)
+            self._fix(right)
+            return self._rotate_right(right)
+        sub = self._join_left(left, node, inner)
+        right.left = sub
+        self._fix(right)
+        if sub.height <= ho + 1:
+            return right
+        return self._rotate_right(right)
+
+    def _split(self, root, key):
+        # Devolve (chaves < key, nó com key ou None, chaves > key)
+        if root is None:
+            return None, None, None
+        left = root.left
+        right = root.right
+        if key < root.key:
+            less, found, greater = self._split(left, key)
+            return less, found, self._join(greater, root, right)
+        if root.key < key:
+            less, found, greater = self._split(right, key)
+            return self._join(left, root, less), found, greater
+        return left, root, right
+
+    def _split_last(self, root):
+        # Remove o maior nó de root; devolve (restante, maior nó)
+        if root.right is None:
+            return root.left, root
+        rest, last = self._split_last(root.right)
+        return self._join(root.left, root, rest), last
+
+    def _join2(self, left, right):
+        if left is None:
+            return right
+        rest, last = self._split_last(left)
+        return self._join(rest, last, right)
+
+    def split(self, key):
+        """
+        Divide a árvore em (chaves < key, chaves >= key) em O(log n).
+        Os nós passam para as duas árvores devolvidas e esta fica vazia.
+        """
+        less, greater = self._split_at(self.root, key)
+        self.root = None
+        return self._tree(less), self._tree(greater)
+
+    def _split_at(self, root, key):
+        # Devolve (chaves < key, chaves >= key); _join religa todos os filhos do nó encontrado
+        less, found, greater = self._split(root, key)
+        if found is not None:
+            greater = self._join(None, found, greater)
+        return less, greater
+
+    @classmethod
+    def join(cls, left, right):
+        """
+        Concatena duas árvores em que toda chave de left é menor que toda chave de right, em O(log n).
+        As duas árvores ficam vazias.
+        """
+        if left.root is not None and right.root is not None and not left.find_max() < right.find_min():
+            raise ValueError("join() exige que todas as chaves de left sejam menores que as de right")
+        tree = left._tree(left._join2(left.root, right.root))
+        left.root = right.root = None
+        return tree
+
+    def _union(self, a, b):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        less, _, greater = self._split(b, a.key)  # Chave repetida: fica o nó de a
+        left = self._union(a.left, less)
+        right = self._union(a.right, greater)
+        return self._join(left, a, right)
+
+    def _intersection(self, a, b):
+        if a is None or b is None:
+            return None
+        less, found, greater = self._split(b, a.key)
+        left = self._intersection(a.left, less)
+        right = self._intersection(a.right, greater)
+        if found is not None:
+            return self._join(left, a, right)
+        return self._join2(left, right)
+
+    def _difference(self, a, b):
+        if a is None or b is None:
+            return a
+        less, _, greater = self._split(a, b.key)
+        left = self._difference(less, b.left)
+        right = self._difference(greater, b.right)
+        return self._join2(left, right)
+
+    def union(self, other):
+        """União em O(m log(n/m + 1)), m <= n os tamanhos; as duas árvores ficam vazias."""
+        return self._set_operation(self._union, other)
+
+    def intersection(self, other):
+        """Interseção em O(m log(n/m + 1)); as duas árvores ficam vazias."""
+        return self._set_operation(self._intersection, other)
+
+    def difference(self, other):
+        """Chaves desta árvore ausentes em other, em O(m log(n/m + 1)); as duas árvores ficam vazias."""
+        return self._set_operation(self._difference, other)
+
+    def _set_operation(self, operation, other):
+        root = operation(self.root, other.root)
+        self.root = other.root = None
+        return self._tree(root)
+
+    # Iteração em ordem com pilha explícita: memória O(log n), sem copiar a árvore
+    def __iter__(self):
+        return self.irange()
+
+    def __reversed__(self):
+        return self.irange(reverse=True)
+
+    def _iter_nodes(self, lo=None, hi=None, inclusive=(True, True), reverse=False):
+        lo_inclusive, hi_inclusive = inclusive
+        stack = []
+        node = self.root
+        if not reverse:
+            # Empilha o caminho até a primeira chave >= lo (ou > lo)
+            while node is not None:
+                if lo is None or (not node.key < lo if lo_inclusive else lo < node.key):
+                    stack.append(node)
+                    node = node.left
+                else:
+                    node = node.right
+            while stack:
+                node = stack.pop()
+                if hi is not None and (hi < node.key if hi_inclusive else not node.key < hi):
+                    return
+                yield node
+                node = node.right
+                while node is not None:
+                    stack.append(node)
+                    node = node.left
+        else:
+            # Espelho: parte da última chave <= hi (ou < hi) e desce em ordem decrescente
+            while node is not None:
+                if hi is None or (not hi < node.key if hi_inclusive else node.key < hi):
+                    stack.append(node)
+                    node = node.right
+                else:
+                    node = node.left
+            while stack:
+                node = stack.pop()
+                if lo is not None and (node.key < lo if lo_inclusive else not lo < node.key):
+                    return
+                yield node
+                node = node.left
+                while node is not None:
+                    stack.append(node)
+                    node = node.right
+
+    def irange(self, lo=None, hi=None, inclusive=(True, True), reverse=False):
+        """
+        Gera as chaves entre lo e hi em ordem (decrescente se reverse), de forma preguiçosa.
+        lo ou hi None deixam o intervalo aberto daquele lado; inclusive diz se cada extremo entra.
+        A árvore não deve ser alterada durante a iteração.
+        """
+        for node in self._iter_nodes(lo, hi, inclusive, reverse):
+            yield node.key
+
+    def delete_range(self, lo, hi, inclusive=(True, True)):
+        """
+        Remove as chaves entre lo e hi em O(log n) com dois splits e um join,
+        destacando subárvores inteiras. Devolve as chaves removidas como uma nova árvore.
+        """
+        self.root, middle = self._cut(self.root, lo, hi, inclusive)
+        return self._tree(middle)
+
+    def _cut(self, root, lo, hi, inclusive):
+        # Devolve (chaves fora do intervalo, chaves dentro dele)
+        lo_inclusive, hi_inclusive = inclusive
+        less, found, rest = self._split(root, lo)
+        if found is not None:
+            if lo_inclusive:
+                rest = self._join(None, found, rest)
+            else:
+                less = self._join(less, found, None)
+        middle, found, greater = self._split(rest, hi)
+        if found is not None:
+            if hi_inclusive:
+                middle = self._join(middle, found, None)
+            else:
+                greater = self._join(None, found, greater)
+        return self._join2(less, greater), middle
+
+
+class Monoid:
+    """
+    Agregação associativa mantida por AugmentedAVLTree em cada subárvore.
+    measure(key) dá o valor de uma chave, combine junta dois valores (na ordem
+    das chaves) e identity é o neutro, devolvido para intervalos vazios.
+    """
+    __slots__ = ('combine', 'identity', 'measure')
+
+    def __init__(self, combine, identity, measure=None):
+        self.combine = combine
+        self.identity = identity
+        self.measure = measure if measure is not None else (lambda key: key)
+
+
+SUM = Monoid(operator.add, 0)
+MIN = Monoid(min, math.inf)
+MAX = Monoid(max, -math.inf)
+COUNT = Monoid(operator.add, 0, lambda key: 1)
+
+
+class AugmentedNode(Node):
+    __slots__ = ('size', 'agg')
+
+    def __init__(self, key):
+        super().__init__(key)
+        self.size = 1
+        self.agg = None
+
+
+class AugmentedAVLTree(AVLTree):
+    """
+    AVLTree que guarda em cada nó o tamanho da subárvore e, opcionalmente, o
+    agregado de um Monoid sobre as suas chaves. Os campos são refeitos por
+    _fix() em toda rotação e em todo nó do caminho de inserção/remoção, o que
+    permite rank/select e agregados de intervalo em O(log n).
+    """
+
+    def __init__(self, monoid=None):
+        super().__init__()
+        self.monoid = monoid
+
+    def _tree(self, root):
+        tree = type(self)(self.monoid)
+        tree.root = root
+        return tree
+
+    @classmethod
+    def from_sorted(cls, iterable, monoid=None):
+        tree = cls(monoid)
+        tree._load_sorted(iterable)
+        return tree
+
+    def _node(self, key):
+        node = AugmentedNode(key)
+        if self.monoid is not None:
+            node.agg = self.monoid.measure(key)
+        return node
+
+    def _fix(self, node):
+        left = node.left
+        right = node.right
+        hl = hr = 0
+        size = 1
+        monoid = self.monoid
+        if monoid is not None:
+            agg = monoid.measure(node.key)
+        if left is not None:
+            hl = left.height
+            size += left.size
+            if monoid is not None:
+                agg = monoid.combine(left.agg, agg)
+        if right is not None:
+            hr = right.height
+            size += right.size
+            if monoid is not None:
+                agg = monoid.combine(agg, right.agg)
+        node.height = (hl if hl > hr else hr) + 1
+        node.size = size
+        if monoid is not None:
+            node.agg = agg
+
+    def _build(self, keys, lo, hi):
+        node = super()._build(keys, lo, hi)
+        if node is not None:
+            self._fix(node)
+        return node
+
+    def _rotate_right(self, z):
+        y = z.left
+        z.left = y.right
+        y.right = z
+        self._fix(z)
+        self._fix(y)
+        return y
+
+    def _rotate_left(self, z):
+        y = z.right
+        z.right = y.left
+        y.left = z
+        self._fix(z)
+        self._fix(y)
+        return y
+
+    def _rebalance(self, path):
+        # Sem parada antecipada: tamanhos e agregados mudam em todo o caminho
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            self._fix(node)
+            left = node.left
+            right = node.right
+            balance = (left.height if left else 0) - (right.height if right else 0)
+            if balance > 1:
+                if self.get_balance(left) < 0:
+                    node.left = self._rotate_left(left)  # Caso Left Right
+                sub = self._rotate_right(node)
+            elif balance < -1:
+                if self.get_balance(right) > 0:
+                    node.right = self._rotate_right(right)  # Caso Right Left
+                sub = self._rotate_left(node)
+            else:
+                continue
+            if i:
+                parent = path[i - 1]
+                if parent.left is node:
+                    parent.left = sub
+                else:
+                    parent.right = sub
+            else:
+                self.root = sub
+
+    # As versões recursivas não mantêm os campos aumentados: delegam às iterativas
+    def insert(self, root, key):
+        if root is not self.root:
+            raise ValueError("AugmentedAVLTree só aceita insert() a partir da raiz")
+        self.insert_key(key)
+        return self.root
+
+    def delete(self, root, key):
+        if root is not self.root:
+            raise ValueError("AugmentedAVLTree só aceita delete() a partir da raiz")
+        self.delete_key(key)
+        return self.root
+
+    def __len__(self):
+        return self.root.size if self.root else 0
+
+    def _count_below(self, key, inclusive):
+        # Quantidade de chaves < key (ou <= key se inclusive)
+        count = 0
+        node = self.root
+        while node is not None:
+            if node.key < key or (inclusive and not key < node.key):
+                count += 1 + (node.left.size if node.left else 0)
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+    def rank(self, key):
+        """Quantidade de chaves menores que key, em O(log n)."""
+        return self._count_below(key, False)
+
+    def select(self, k):
+        """A k-ésima menor chave (a partir de 0; negativos contam do fim), em O(log n)."""
+        size = len(self)
+        if k < 0:
+            k += size
+        if not 0 <= k < size:
+            raise IndexError("select() fora do intervalo")
+        node = self.root
+        while True:
+            left = node.left.size if node.left else 0
+            if k < left:
+                node = node.left
+            elif k == left:
+                return node.key
+            else:
+                k -= left + 1
+                node = node.right
+
+    def count_range(self, lo, hi, inclusive=(True, True)):
+        """Quantidade de chaves entre lo e hi, em O(log n)."""
+        count = self._count_below(hi, inclusive[1]) - self._count_below(lo, not inclusive[0])
+        return count if count > 0 else 0
+
+    def aggregate_range(self, lo, hi, inclusive=(True, True)):
+        """Agregado do monoid sobre as chaves entre lo e hi, em O(log n)."""
+        monoid = self.monoid
+        if monoid is None:
+            raise ValueError("aggregate_range() exige uma árvore criada com um monoid")
+        combine = monoid.combine
+        measure = monoid.measure
+        identity = monoid.identity
+        lo_inclusive, hi_inclusive = inclusive
+
+        def above_lo(key):
+            return not key < lo if lo_inclusive else lo < key
+
+        def below_hi(key):
+            return not hi < key if hi_inclusive else key < hi
+
+        # Desce até o primeiro nó dentro do intervalo, onde as duas bordas se separam
+        node = self.root
+        while node is not None:
+            if not above_lo(node.key):
+                node = node.right
+            elif not below_hi(node.key):
+                node = node.left
+            else:
+                break
+        if node is None:
+            return identity
+        # Borda esquerda: cada nó dentro do intervalo leva junto a sua subárvore direita
+        left_acc = identity
+        current = node.left
+        while current is not None:
+            if above_lo(current.key):
+                right = current.right.agg if current.right else identity
+                left_acc = combine(combine(measure(current.key), right), left_acc)
+                current = current.left
+            else:
+                current = current.right
+        # Borda direita: cada nó dentro do intervalo leva junto a sua subárvore esquerda
+        right_acc = identity
+        current = node.right
+        while current is not None:
+            if below_hi(current.key):
+                left = current.left.agg if current.left else identity
+                right_acc = combine(right_acc, combine(left, measure(current.key)))
+                current = current.right
+            else:
+                current = current.left
+        return combine(combine(left_acc, measure(node.key)), right_acc)
+
+
+class MapNode(AugmentedNode):
+    __slots__ = ('value',)
+
+    def __init__(self, key):
+        super().__init__(key)
+        self.value = None
+
+
+_MAX_END = Monoid(max, -math.inf, operator.itemgetter(1))  # Maior fim de intervalo da subárvore
+
+
+class IntervalTree(AugmentedAVLTree):
+    """
+    Árvore de intervalos semiabertos [início, fim) sobre AugmentedAVLTree: as
+    chaves são tuplas (início, fim, id), com um id único por add(), e cada nó
+    guarda o item associado como AVLMap guarda valores, então janelas repetidas
+    convivem. Cada subárvore guarda o maior fim, mantido pelas mesmas rotações.
+    Inserção e remoção continuam O(log n); consultas de sobreposição podam as
+    subárvores cujo maior fim não alcança a janela.
+    """
+
+    _ids = itertools.count()  # Compartilhado entre árvores: split/join/união nunca misturam ids
+
+    def __init__(self, monoid=None):
+        super().__init__(monoid if monoid is not None else _MAX_END)
+
+    def _node(self, key):
+        node = MapNode(key)
+        node.agg = self.monoid.measure(key)
+        return node
+
+    def copy(self):
+        tree = super().copy()
+        for twin, node in zip(tree._iter_nodes(), self._iter_nodes()):
+            twin.value = node.value
+        return tree
+
+    def add(self, start, end, item=None):
+        """
+        Acrescenta [start, end) com item; a mesma janela pode aparecer várias vezes.
+        Intervalos vazios (start == end) não contêm ponto algum e geram ValueError.
+        """
+        if not start < end:
+            raise ValueError(f"Intervalo inválido ou vazio: [{start!r}, {end!r})")
+        self.insert_key((start, end, next(self._ids))).value = item
+
+    def remove(self, start, end, item=None):
+        """Remove um intervalo [start, end) cujo item é igual a item; devolve se achou algum."""
+        for node in self._iter_nodes((start, end), (start, end, math.inf)):
+            if node.value == item:
+                self.delete_key(node.key)
+                return True
+        return False
+
+    def intervals(self):
+        """Gera as tuplas (início, fim, item) de todos os intervalos, em ordem de início."""
+        for node in self._iter_nodes():
+            start, end, _ = node.key
+            yield start, end, node.value
+
+    def _overlap(self, lo, hi, hi_inclusive):
+        # Um único percurso em ordem de início, com poda nos dois lados: subárvores
+        # cujo maior fim não passa de lo são puladas inteiras, e um nó que começa
+        # depois da janela não é empilhado, o que descarta também a sua subárvore direita
+        stack = []
+        node = self.root
+        while True:
+            while node is not None and lo < node.agg:
+                start = node.key[0]
+                if start < hi or (hi_inclusive and start == hi):
+                    stack.append(node)
+                node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            start, end, _ = node.key
+            if lo < end:
+                yield start, end, node.value
+            node = node.right
+
+    def overlapping(self, lo, hi):
+        """
+        Gera, em ordem de início, as tuplas (início, fim, item) dos intervalos
+        que cruzam [lo, hi), podando pelo maior fim de cada subárvore.
+        Uma janela vazia (hi <= lo) não cruza nenhum intervalo.
+        """
+        if not lo < hi:
+            return iter(())
+        return self._overlap(lo, hi, False)
+
+    def stab(self, point):
+        """Gera as tuplas (início, fim, item) dos intervalos que contêm point."""
+        return self._overlap(point, point, True)
+
+
+class AVLMap(AugmentedAVLTree):
+    """
+    Mapa ordenado: cada nó guarda a chave e o seu valor, então não é preciso
+    um dict paralelo. Herda de AugmentedAVLTree para ter len() em O(1) e
+    rank/select; iteração, irange, split/join e operações de conjunto operam
+    sobre as chaves e levam os valores junto (na união, fica o valor desta árvore).
+    """
+
+    def __init__(self, items=None, monoid=None):
+        super().__init__(monoid)
+        if items is not None:
+            for key, value in (items.items() if hasattr(items, 'items') else items):
+                self[key] = value
+
+    def _tree(self, root):
+        tree = type(self)(monoid=self.monoid)
+        tree.root = root
+        return tree
+
+    def _node(self, key):
+        node = MapNode(key)
+        if self.monoid is not None:
+            node.agg = self.monoid.measure(key)
+        return node
+
+    @classmethod
+    def from_sorted(cls, items, monoid=None):
+        """Constrói o mapa em O(n) a partir de pares (chave, valor) em ordem crescente de chave."""
+        pairs = list(items)
+        tree = cls(monoid=monoid)
+        tree._load_sorted(key for key, _ in pairs)
+        # Chaves repetidas: vale o último valor, como em dict
+        values = {}
+        for key, value in pairs:
+            values[key] = value
+        for node in tree._iter_nodes():
+            node.value = values[node.key]
+        return tree
+
+    def copy(self):
+        tree = super().copy()
+        for twin, node in zip(tree._iter_nodes(), self._iter_nodes()):
+            twin.value = node.value
+        return tree
+
+    def __getitem__(self, key):
+        node = self.search_key(key)
+        if node is None:
+            raise KeyError(key)
+        return node.value
+
+    def __setitem__(self, key, value):
+        self.insert_key(key).value = value
+
+    def __delitem__(self, key):
+        if self.delete_key(key) is None:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return self.search_key(key) is not None
+
+    def get(self, key, default=None):
+        node = self.search_key(key)
+        return default if node is None else node.value
+
+    def keys(self):
+        return self.irange()
+
+    def values(self):
+        for node in self._iter_nodes():
+            yield node.value
+
+    def items(self, lo=None, hi=None, inclusive=(True, True), reverse=False):
+        """Gera os pares (chave, valor) entre lo e hi em ordem, como irange()."""
+        for node in self._iter_nodes(lo, hi, inclusive, reverse):
+            yield node.key, node.value
+
+    @staticmethod
+    def _item(node):
+        return None if node is None else (node.key, node.value)
+
+    def floor(self, key):
+        """Par (chave, valor) com a maior chave <= key, ou None."""
+        return self._item(self._floor_node(key))
+
+    def ceiling(self, key):
+        """Par (chave, valor) com a menor chave >= key, ou None."""
+        return self._item(self._ceiling_node(key))
+
+    def predecessor(self, key):
+        """Par (chave, valor) com a maior chave < key, ou None."""
+        return self._item(self._floor_node(key, inclusive=False))
+
+    def successor(self, key):
+        """Par (chave, valor) com a menor chave > key, ou None."""
+        return self._item(self._ceiling_node(key, inclusive=False))
+
+    def pop_min(self):
+        """Remove e devolve o par (chave, valor) de menor chave; KeyError se vazio."""
+        if self.root is None:
+            raise KeyError("pop_min() em mapa vazio")
+        node = self.delete_key(self.find_min())
+        return node.key, node.value
+
+    def pop_max(self):
+        """Remove e devolve o par (chave, valor) de maior chave; KeyError se vazio."""
+        if self.root is None:
+            raise KeyError("pop_max() em mapa vazio")
+        node = self.delete_key(self.find_max())
+        return node.key, node.value
+
+
+class PersistentAVLTree(AVLTree):
+    """
+    AVLTree persistente: insert(root, key) e delete(root, key) nunca alteram
+    nós existentes; copiam os O(log n) nós do caminho e devolvem uma nova
+    raiz, compartilhando o resto com a versão anterior. insert_key/delete_key
+    publicam a nova raiz com uma única atribuição, então leitores não precisam
+    de lock: cada leitura (ou snapshot()) vê uma versão inteira e imutável.
+    Versões antigas são liberadas pela contagem de referências do Python assim
+    que nenhum snapshot as usa. Escritores são serializados por um lock próprio.
+    split, join, union, intersection e difference não esvaziam as árvores de
+    entrada como em AVLTree: devolvem árvores novas que compartilham nós com elas.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.version = 0
+        self._write_lock = threading.Lock()
+
+    def _tree(self, root):
+        tree = type(self)()
+        tree.root = root
+        return tree
+
+    def _make(self, key, left, right):
+        node = self._node(key)
+        node.left = left
+        node.right = right
+        hl = left.height if left else 0
+        hr = right.height if right else 0
+        node.height = (hl if hl > hr else hr) + 1
+        return node
+
+    def _balance(self, key, left, right):
+        # Monta um nó novo já balanceado; as rotações também criam nós novos
+        make = self._make
+        hl = left.height if left else 0
+        hr = right.height if right else 0
+        if hl > hr + 1:
+            ll = left.left
+            lr = left.right
+            if (ll.height if ll else 0) >= (lr.height if lr else 0):
+                return make(left.key, ll, make(key, lr, right))
+            return make(lr.key, make(left.key, ll, lr.left), make(key, lr.right, right))
+        if hr > hl + 1:
+            rl = right.left
+            rr = right.right
+            if (rr.height if rr else 0) >= (rl.height if rl else 0):
+                return make(right.key, make(key, left, rl), rr)
+            return make(rl.key, make(key, left, rl.left), make(right.key, rl.right, rr))
+        return make(key, left, right)
+
+    def insert(self, root, key):
+        if root is None:
+            return self._make(key, None, None)
+        if key < root.key:
+            left = self.insert(root.left, key)
+            return root if left is root.left else self._balance(root.key, left, root.right)
+        if root.key < key:
+            right = self.insert(root.right, key)
+            return root if right is root.right else self._balance(root.key, root.left, right)
+        return root  # Chave já presente: a versão não muda
+
+    def _delete_min(self, root):
+        # Devolve (nova raiz sem a menor chave, menor chave)
+        if root.left is None:
+            return root.right, root.key
+        left, key = self._delete_min(root.left)
+        return self._balance(root.key, left, root.right), key
+
+    def delete(self, root, key):
+        if root is None:
+            return None
+        if key < root.key:
+            left = self.delete(root.left, key)
+            return root if left is root.left else self._balance(root.key, left, root.right)
+        if root.key < key:
+            right = self.delete(root.right, key)
+            return root if right is root.right else self._balance(root.key, root.left, right)
+        if root.left is None:
+            return root.right
+        if root.right is None:
+            return root.left
+        right, successor = self._delete_min(root.right)
+        return self._balance(successor, root.left, right)
+
+    def _publish(self, update, key):
+        # Devolve (raiz anterior, raiz publicada)
+        with self._write_lock:
+            old = self.root
+            root = update(old, key)
+            if root is not old:
+                self.root = root  # Publicação atômica da nova versão
+                self.version += 1
+        return old, root
+
+    def insert_key(self, key):
+        """Insere key numa nova versão; devolve o nó com a chave (novo ou já existente)."""
+        _, root = self._publish(self.insert, key)
+        return self.search(root, key)
+
+    def delete_key(self, key):
+        """Remove key numa nova versão; devolve o nó removido (ainda visível a snapshots antigos) ou None."""
+        old, root = self._publish(self.delete, key)
+        return None if root is old else self.search(old, key)
+
+    def snapshot(self):
+        """Versão atual, imutável, para leitura sem locks enquanto outros threads escrevem."""
+        tree = self._tree(self.root)
+        tree.version = self.version
+        return tree
+
+    # Operações baseadas em join: _join monta nós novos com _balance em vez de religar os
+    # existentes, então split/join/união/interseção/diferença devolvem árvores novas que
+    # compartilham subárvores com as de entrada, e estas (e seus snapshots) ficam intactas
+    def _join(self, left, node, right):
+        return self._join_key(left, node.key, right)
+
+    def _join_key(self, left, key, right):
+        # Desce pela borda da árvore mais alta e rebalanceia na volta, copiando só esse caminho
+        hl = left.height if left else 0
+        hr = right.height if right else 0
+        if hl > hr + 1:
+            return self._balance(left.key, left.left, self._join_key(left.right, key, right))
+        if hr > hl + 1:
+            return self._balance(right.key, self._join_key(left, key, right.left), right.right)
+        return self._make(key, left, right)
+
+    def _check_persistent(self, other):
+        # Compartilhar nós com uma árvore mutável deixaria o resultado exposto às alterações dela
+        if not isinstance(other, PersistentAVLTree):
+            raise TypeError(f"esperava PersistentAVLTree, recebeu {type(other).__name__}")
+
+    def split(self, key):
+        """Divide em (chaves < key, chaves >= key) em O(log n), sem alterar esta árvore."""
+        less, greater = self._split_at(self.root, key)
+        return self._tree(less), self._tree(greater)
+
+    @classmethod
+    def join(cls, left, right):
+        """
+        Concatena duas árvores em que toda chave de left é menor que toda chave de right,
+        em O(log n), sem alterá-las.
+        """
+        left._check_persistent(right)
+        left_root = left.root
+        right_root = right.root
+        if left_root is not None and right_root is not None \
+                and not left.get_max(left_root) < right.get_min(right_root):
+            raise ValueError("join() exige que todas as chaves de left sejam menores que as de right")
+        return left._tree(left._join2(left_root, right_root))
+
+    def _set_operation(self, operation, other):
+        self._check_persistent(other)
+        return self._tree(operation(self.root, other.root))
+
+    def delete_range(self, lo, hi, inclusive=(True, True)):
+        """
+        Remove as chaves entre lo e hi numa nova versão, em O(log n).
+        Devolve as chaves removidas como uma nova árvore.
+        """
+        with self._write_lock:
+            old = self.root
+            root, middle = self._cut(old, lo, hi, inclusive)
+            if middle is not None:
+                self.root = root
+                self.version += 1
+        return self._tree(middle)
+
+
+class ArrayAVLTree:
+    """
+    AVLTree para chaves numéricas em estrutura de arrays: chave, filho esquerdo,
+    filho direito e altura de cada nó ficam em arrays paralelos (módulo array),
+    ligados por índice, sem um objeto Python por chave. O índice 0 é uma
+    sentinela vazia (altura 0), o que dispensa testes de None nas contas de
+    altura. Índices liberados formam uma lista livre encadeada pelo array de
+    filhos esquerdos, e os arrays crescem dobrando de tamanho.
+    Mesma API de consulta de AVLTree, mas search_key devolve a chave (ou None),
+    já que não há objetos nó.
+    """
+
+    def __init__(self, typecode='q', capacity=0):
+        self.typecode = typecode
+        self._keys = array(typecode, [0])
+        self._left = array('i', [0])
+        self._right = array('i', [0])
+        self._height = array('b', [0])
+        self.root = 0
+        self._free = 0  # Primeiro índice livre (0 = nenhum)
+        self._size = 0
+        if capacity:
+            self._grow(capacity)
+
+    @classmethod
+    def from_sorted(cls, iterable, typecode='q'):
+        keys = array(typecode)
+        for key in iterable:
+            if keys and not keys[-1] < key:
+                if key < keys[-1]:
+                    raise ValueError(f"from_sorted() recebeu chaves fora de ordem: {key!r} após {keys[-1]!r}")
+                continue
+            keys.append(key)
+        n = len(keys)
+        tree = cls(typecode)
+        # Nó i + 1 guarda keys[i]: em ordem, cada meio de intervalo vira raiz da subárvore
+        tree._keys.extend(keys)
+        tree._left.extend(array('i', [0]) * n)
+        tree._right.extend(array('i', [0]) * n)
+        tree._height.extend(array('b', [0]) * n)
+        tree.root = tree._build(1, n + 1)
+        tree._size = n
+        return tree
+
+    def _build(self, lo, hi):
+        if lo >= hi:
+            return 0
+        mid = (lo + hi) // 2
+        self._left[mid] = self._build(lo, mid)
+        self._right[mid] = self._build(mid + 1, hi)
+        self._height[mid] = (hi - lo).bit_length()
+        return mid
+
+    def _grow(self, extra):
+        start = len(self._keys)
+        self._keys.extend(array(self.typecode, [0]) * extra)
+        # Encadeia os novos índices na lista livre: left[i] = i + 1, o último aponta para o antigo início
+        self._left.extend(range(start + 1, start + extra + 1))
+        self._left[start + extra - 1] = self._free
+        self._right.extend(array('i', [0]) * extra)
+        self._height.extend(array('b', [0]) * extra)
+        self._free = start
+
+    def _alloc(self, key):
+        node = self._free
+        if not node:
+            self._grow(max(16, len(self._keys)))
+            node = self._free
+        self._free = self._left[node]
+        self._keys[node] = key
+        self._left[node] = 0
+        self._right[node] = 0
+        self._height[node] = 1
+        return node
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, key):
+        return self.search_key(key) is not None
+
+    def _rotate_right(self, z):
+        left, right, height = self._left, self._right, self._height
+        y = left[z]
+        left[z] = right[y]
+        right[y] = z
+        hl = height[left[z]]
+        hr = height[right[z]]
+        height[z] = h = (hl if hl > hr else hr) + 1
+        hl = height[left[y]]
+        height[y] = (hl if hl > h else h) + 1
+        return y
+
+    def _rotate_left(self, z):
+        left, right, height = self._left, self._right, self._height
+        y = right[z]
+        right[z] = left[y]
+        left[y] = z
+        hl = height[left[z]]
+        hr = height[right[z]]
+        height[z] = h = (hl if hl > hr else hr) + 1
+        hr = height[right[y]]
+        height[y] = (hr if hr > h else h) + 1
+        return y
+
+    def _rebalance(self, path):
+        # Igual a AVLTree._rebalance, com índices no lugar de nós
+        left, right, height = self._left, self._right, self._height
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            l = left[node]
+            r = right[node]
+            hl = height[l]
+            hr = height[r]
+            old = height[node]
+            if hl - hr > 1:
+                if height[left[l]] < height[right[l]]:
+                    left[node] = self._rotate_left(l)  # Caso Left Right
+                sub = self._rotate_right(node)
+            elif hr - hl > 1:
+                if height[right[r]] < height[left[r]]:
+                    right[node] = self._rotate_right(r)  # Caso Right Left
+                sub = self._rotate_left(node)
+            else:
+                h = (hl if hl > hr else hr) + 1
+                if h == old:
+                    return
+                height[node] = h
+                continue
+            if i:
+                parent = path[i - 1]
+                if left[parent] == node:
+                    left[parent] = sub
+                else:
+                    right[parent] = sub
+            else:
+                self.root = sub
+            if height[sub] == old:
+                return
+
+    def insert_key(self, key):
+        node = self.root
+        if not node:
+            self.root = self._alloc(key)
+            self._size += 1
+            return
+        keys, left, right = self._keys, self._left, self._right
+        path = []
+        while True:
+            path.append(node)
+            node_key = keys[node]
+            if key < node_key:
+                child = left[node]
+                if not child:
+                    left[node] = self._alloc(key)
+                    break
+            elif node_key < key:
+                child = right[node]
+                if not child:
+                    right[node] = self._alloc(key)
+                    break
+            else:  # Chaves iguais não são permitidas
+                return
+            node = child
+        self._size += 1
+        self._rebalance(path)
+
+    def delete_key(self, key):
+        keys, left, right, height = self._keys, self._left, self._right, self._height
+        path = []
+        node = self.root
+        while node:
+            node_key = keys[node]
+            if key < node_key:
+                path.append(node)
+                node = left[node]
+            elif node_key < key:
+                path.append(node)
+                node = right[node]
+            else:
+                break
+        if not node:
+            return
+        parent = path[-1] if path else 0
+        if left[node] and right[node]:
+            # Dois filhos: o sucessor é religado no lugar do nó
+            index = len(path)
+            path.append(node)
+            above = node
+            successor = right[node]
+            while left[successor]:
+                path.append(successor)
+                above = successor
+                successor = left[successor]
+            if above == node:
+                right[node] = right[successor]
+            else:
+                left[above] = right[successor]
+            left[successor] = left[node]
+            right[successor] = right[node]
+            height[successor] = height[node]
+            path[index] = successor
+            replacement = successor
+        else:
+            replacement = left[node] or right[node]
+        if not parent:
+            self.root = replacement
+        elif left[parent] == node:
+            left[parent] = replacement
+        else:
+            right[parent] = replacement
+        # Devolve o índice à lista livre
+        right[node] = 0
+        height[node] = 0
+        left[node] = self._free
+        self._free = node
+        self._size -= 1
+        self._rebalance(path)
+
+    def search_key(self, key):
+        keys, left, right = self._keys, self._left, self._right
+        node = self.root
+        while node:
+            node_key = keys[node]
+            if key < node_key:
+                node = left[node]
+            elif node_key < key:
+                node = right[node]
+            else:
+                return node_key
+        return None
+
+    def find_min(self):
+        node = self.root
+        if not node:
+            return None
+        while self._left[node]:
+            node = self._left[node]
+        return self._keys[node]
+
+    def find_max(self):
+        node = self.root
+        if not node:
+            return None
+        while self._right[node]:
+            node = self._right[node]
+        return self._keys[node]
+
+    def __iter__(self):
+        return self.irange()
+
+    def __reversed__(self):
+        return self.irange(reverse=True)
+
+    def irange(self, lo=None, hi=None, inclusive=(True, True), reverse=False):
+        """Gera as chaves entre lo e hi em ordem (decrescente se reverse), como AVLTree.irange()."""
+        keys = self._keys
+        first, second = (self._left, self._right) if not reverse else (self._right, self._left)
+        start, stop = (lo, hi) if not reverse else (hi, lo)
+        start_inclusive, stop_inclusive = inclusive if not reverse else inclusive[::-1]
+        # before(a, b): a vem antes de b na direção da iteração
+        if not reverse:
+            def before(a, b):
+                return a < b
+        else:
+            def before(a, b):
+                return b < a
+        stack = []
+        node = self.root
+        while node:
+            key = keys[node]
+            if start is None or (not before(key, start) if start_inclusive else before(start, key)):
+                stack.append(node)
+                node = first[node]
+            else:
+                node = second[node]
+        while stack:
+            node = stack.pop()
+            key = keys[node]
+            if stop is not None and (before(stop, key) if stop_inclusive else not before(key, stop)):
+                return
+            yield key
+            node = second[node]
+            while node:
+                stack.append(node)
+                node = first[node]
+
+    def save(self, path):
+        return _save_keys(path, self.irange())
+
+    @staticmethod
+    def load(path, mmap=True):
+        return FrozenAVLTree(path, mmap)
+
+
+class FrozenAVLTree:
+    """
+    Árvore somente leitura aberta de um arquivo de AVLTree.save(). As chaves
+    ordenadas formam uma árvore balanceada implícita: buscas são buscas
+    binárias direto sobre o arquivo mapeado (ou lido, se mmap=False), sem
+    reconstruir nós. search_key devolve a chave encontrada ou None.
+    """
+
+    def __init__(self, path, mmap=True):
+        with open(path, 'rb') as f:
+            if mmap:
+                self._buffer = _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ)
+            else:
+                self._buffer = f.read()
+        view = memoryview(self._buffer)
+        magic, kind, count = _AVL_HEADER.unpack_from(view, 0)
+        if magic != AVL_MAGIC:
+            view.release()
+            self.close()
+            raise ValueError(f"{path} não é um arquivo de AVLTree.save()")
+        self._view = view
+        start = _AVL_HEADER.size
+        if kind == b's':
+            offsets_end = start + 8 * (count + 1)
+            self._keys = _StrKeys(view[start:offsets_end].cast('Q'), view[offsets_end:])
+        else:
+            self._keys = view[start:start + 8 * count].cast(kind.decode())
+
+    def close(self):
+        keys = getattr(self, '_keys', ())
+        views = [keys._offsets, keys._data] if isinstance(keys, _StrKeys) else [keys]
+        views.append(getattr(self, '_view', None))
+        for view in views:
+            if isinstance(view, memoryview):
+                view.release()
+        self._keys = ()
+        self._view = None
+        if isinstance(self._buffer, _mmap.mmap):
+            self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def search_key(self, key):
+        keys = self._keys
+        index = bisect.bisect_left(keys, key)
+        if index < len(keys):
+            found = keys[index]
+            if not key < found:
+                return found
+        return None
+
+    def __contains__(self, key):
+        return self.search_key(key) is not None
+
+    def find_min(self):
+        return self._keys[0] if len(self._keys) else None
+
+    def find_max(self):
+        return self._keys[-1] if len(self._keys) else None
+
+    def __iter__(self):
+        return self.irange()
+
+    def __reversed__(self):
+        return self.irange(reverse=True)
+
+    def irange(self, lo=None, hi=None, inclusive=(True, True), reverse=False):
+        """Gera as chaves entre lo e hi em ordem (decrescente se reverse), como AVLTree.irange()."""
+        keys = self._keys
+        start = 0 if lo is None else (bisect.bisect_left if inclusive[0] else bisect.bisect_right)(keys, lo)
+        stop = len(keys) if hi is None else (bisect.bisect_right if inclusive[1] else bisect.bisect_left)(keys, hi)
+        indices = range(stop - 1, start - 1, -1) if reverse else range(start, stop)
+        for index in indices:
+            yield keys[index]
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Cache Benchmark for CrossDebate
+
+Measures the throughput, hit rate and memory of the cache implementations
+in lru_cache.py and cache_policies.py, on synthetic workloads or replayed
+access traces, so capacity and policy settings can be tuned with real
+numbers. Run `python cache_benchmark.py trace --output results.json` to
+keep a report for comparison across commits.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import threading
+import time
+import tracemalloc
+import zlib
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from cache_policies import POLICIES, make_cache
+from lru_cache import CompactLRUCache, ConcurrentLRUCache, LRUCache
+
+DEFAULT_CAPACITY = 10_000
+DEFAULT_OPS = 200_000
+DEFAULT_THREADS = [1, 4, 16, 64]
+DEFAULT_PUT_RATIO = 0.2
+
+
+class LockedLRUCache:
+    """
+    LRUCache guarded by a single global lock.
+    The plain class is not safe to share between threads, so this is the
+    baseline every concurrent implementation is compared against.
+    """
+
+    def __init__(self, capacity: int):
+        self._cache = LRUCache(capacity)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            return self._cache.get(key)
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._cache.put(key, value)
+
+
+def _make_workload(ops: int, key_space: int, put_ratio: float, seed: int) -> List[tuple]:
+    """Generate a reproducible list of (is_put, key) operations."""
+    rng = random.Random(seed)
+    return [(rng.random() < put_ratio, f"key:{rng.randrange(key_space)}") for _ in range(ops)]
+
+
+def run_threaded(cache: Any, threads: int, ops: int, key_space: int,
+                 put_ratio: float = DEFAULT_PUT_RATIO, seed: int = 42) -> Dict[str, float]:
+    """
+    Run a mixed get/put workload on cache from several threads.
+
+    Args:
+        cache: Object exposing get(key) and put(key, value)
+        threads: Number of worker threads
+        ops: Total number of operations, split evenly across threads
+        key_space: Number of distinct keys in the workload
+        put_ratio: Fraction of operations that are puts
+        seed: Seed for the workload generator
+
+    Returns:
+        Dictionary with elapsed time and throughput in operations per second
+    """
+    per_thread = max(1, ops // threads)
+    workloads = [_make_workload(per_thread, key_space, put_ratio, seed + i) for i in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(workload):
+        get, put = cache.get, cache.put
+        barrier.wait()
+        for is_put, key in workload:
+            if is_put:
+                put(key, key)
+            else:
+                get(key)
+
+    workers = [threading.Thread(target=worker, args=(w,)) for w in workloads]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    total = per_thread * threads
+    return {'threads': threads, 'ops': total, 'seconds': elapsed, 'ops_per_sec': total / elapsed}
+
+
+def benchmark_concurrency(capacity: int = DEFAULT_CAPACITY, ops: int = DEFAULT_OPS,
+                          thread_counts: List[int] = DEFAULT_THREADS,
+                          segments: int = 16) -> Dict[str, List[Dict[str, float]]]:
+    """
+    Compare the single-lock LRUCache against ConcurrentLRUCache.
+
+    Returns:
+        Results per implementation, one entry per thread count
+    """
+    factories: Dict[str, Callable[[], Any]] = {
+        'LRUCache+lock': lambda: LockedLRUCache(capacity),
+        'ConcurrentLRUCache': lambda: ConcurrentLRUCache(capacity, segments=segments),
+    }
+    results: Dict[str, List[Dict[str, float]]] = {}
+    for name, factory in factories.items():
+        results[name] = [run_threaded(factory(), n, ops, capacity * 2) for n in thread_counts]
+    return results
+
+
+def memory_per_entry(factory: Callable[[], Any], entries: int) -> float:
+    """Bytes allocated per entry when filling a fresh cache with entries float values."""
+    keys = [f"key:{i}" for i in range(entries)]
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        cache = factory()
+        for i, key in enumerate(keys):
+            cache.put(key, i * 0.5)
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    return used / entries
+
+
+def run_single(cache: Any, workload: List[tuple]) -> float:
+    """Run a (is_put, key) workload on one thread and return operations per second."""
+    get, put = cache.get, cache.put
+    start = time.perf_counter()
+    for is_put, key in workload:
+        if is_put:
+            put(key, 1.0)
+        else:
+            get(key)
+    return len(workload) / (time.perf_counter() - start)
+
+
+def benchmark_compact(capacity: int = DEFAULT_CAPACITY, ops: int = DEFAULT_OPS,
+                      entries: int = 1_000_000) -> Dict[str, Dict[str, float]]:
+    """
+    Compare LRUCache with CompactLRUCache on memory and single-threaded throughput.
+
+    Returns:
+        Bytes per entry (cache of `entries` float values, keys excluded) and
+        ops/sec of a mixed workload, by implementation
+    """
+    factories: Dict[str, Callable[[int], Any]] = {
+        'LRUCache': LRUCache,
+        'CompactLRUCache': CompactLRUCache,
+        "CompactLRUCache('d')": lambda size: CompactLRUCache(size, typecode='d'),
+    }
+    workload = _make_workload(ops, capacity * 2, DEFAULT_PUT_RATIO, seed=42)
+    return {name: {'bytes_per_entry': memory_per_entry(lambda: factory(entries), entries),
+                   'ops_per_sec': run_single(factory(capacity), workload)}
+            for name, factory in factories.items()}
+
+
+def load_trace(path: str, key_pattern: Optional[str] = None) -> List[str]:
+    """
+    Read an access trace, ignoring blank lines.
+
+    Args:
+        path: Trace file with one key per line, or a production log
+        key_pattern: Regular expression whose first group (or whole match)
+            extracts the key from each log line; lines without a match are skipped
+
+    Returns:
+        The accessed keys in order
+    """
+    with open(path) as f:
+        if key_pattern is None:
+            return [line.strip() for line in f if line.strip()]
+        regex = re.compile(key_pattern)
+        trace = []
+        for line in f:
+            match = regex.search(line)
+            if match:
+                trace.append(match.group(1) if regex.groups else match.group(0))
+        return trace
+
+
+def save_trace(trace: Iterable[str], path: str) -> None:
+    """Write a trace with one key per line, readable by load_trace()."""
+    with open(path, "w") as f:
+        for key in trace:
+            f.write(key + "\n")
+
+
+def zipf_trace(length: int, keys: int, skew: float = 1.0, seed: int = 42,
+               prefix: str = "key") -> List[str]:
+    """Generate accesses whose key popularity follows a Zipf distribution."""
+    rng = random.Random(seed)
+    cum_weights = list(itertools.accumulate(1.0 / (rank ** skew) for rank in range(1, keys + 1)))
+    return [f"{prefix}:{index}" for index in rng.choices(range(keys), cum_weights=cum_weights, k=length)]
+
+
+def scan_trace(length: int, start: int = 0, prefix: str = "scan") -> List[str]:
+    """Generate a sequential sweep over keys that are never accessed again."""
+    return [f"{prefix}:{index}" for index in range(start, start + length)]
+
+
+def loop_trace(length: int, keys: int, prefix: str = "loop") -> List[str]:
+    """Cycle over the same keys in order, the worst case for LRU when keys exceed capacity."""
+    return [f"{prefix}:{index % keys}" for index in range(length)]
+
+
+def mixed_trace(length: int, keys: int, skew: float = 1.0, seed: int = 42) -> List[str]:
+    """Interleave Zipf, loop and scan phases in equal shares, alternating every keys accesses."""
+    phase = max(1, keys)
+    generators = [
+        lambda n, offset: zipf_trace(n, keys * 10, skew, seed + offset),
+        lambda n, offset: loop_trace(n, keys + keys // 2),
+        lambda n, offset: scan_trace(n, start=offset),
+    ]
+    trace: List[str] = []
+    for offset in range(0, length, phase):
+        trace.extend(generators[(offset // phase) % 3](min(phase, length - offset), offset))
+    return trace
+
+
+def scan_polluted_trace(length: int, keys: int, scan_every: int, scan_length: int,
+                        skew: float = 1.0, seed: int = 42) -> List[str]:
+    """Zipf traffic interrupted by periodic one-off scans, like a batch analysis job."""
+    hot = zipf_trace(length, keys, skew, seed)
+    trace: List[str] = []
+    for offset in range(0, length, scan_every):
+        trace.extend(hot[offset:offset + scan_every])
+        trace.extend(scan_trace(scan_length, start=offset * scan_length))
+    return trace
+
+
+def replay(cache: Any, trace: Iterable[str],
+           cost_of: Optional[Callable[[str], float]] = None) -> Dict[str, float]:
+    """
+    Replay a trace against cache, loading every miss with put().
+
+    Args:
+        cache: Object exposing get(key) and put(key, value)
+        trace: Sequence of accessed keys
+        cost_of: Optional function returning the load cost of a key
+
+    Returns:
+        Dictionary with the hit rate and the share of load cost avoided
+    """
+    hits = requests = 0
+    cost_total = cost_saved = 0.0
+    passes_cost = cost_of is not None and isinstance(cache, POLICIES['greedydual'])
+    for key in trace:
+        requests += 1
+        cost = cost_of(key) if cost_of is not None else 1.0
+        cost_total += cost
+        if cache.get(key) is not None:
+            hits += 1
+            cost_saved += cost
+        elif passes_cost:
+            cache.put(key, key, cost=cost)
+        else:
+            cache.put(key, key)
+    return {
+        'requests': requests,
+        'hit_rate': hits / requests if requests else 0.0,
+        'cost_hit_rate': cost_saved / cost_total if cost_total else 0.0,
+    }
+
+
+def compare_policies(trace: List[str], capacity: int, policies: Iterable[str] = POLICIES,
+                     cost_of: Optional[Callable[[str], float]] = None) -> Dict[str, Dict[str, float]]:
+    """Replay the same trace against every policy and return the results by policy name."""
+    return {policy: replay(make_cache(policy, capacity), trace, cost_of) for policy in policies}
+
+
+def measure(policy: str, capacity: int, trace: List[str]) -> Dict[str, float]:
+    """
+    Replay trace against a fresh cache of the given policy.
+
+    Throughput and memory come from separate runs, since tracing allocations
+    slows the replay down several times.
+
+    Returns:
+        Dictionary with hit_rate, ops_per_sec and peak_memory_bytes (the
+        largest amount of memory allocated during the replay)
+    """
+    start = time.perf_counter()
+    result = replay(make_cache(policy, capacity), trace)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    try:
+        replay(make_cache(policy, capacity), trace)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'requests': result['requests'], 'hit_rate': result['hit_rate'],
+            'ops_per_sec': result['requests'] / elapsed if elapsed else 0.0,
+            'peak_memory_bytes': peak}
+
+
+def synthetic_traces(workloads: Iterable[str], length: int, keys: int,
+                     skews: Iterable[float]) -> Dict[str, List[str]]:
+    """Generate the named synthetic traces; 'zipf' and 'mix' yield one trace per skew."""
+    traces: Dict[str, List[str]] = {}
+    for workload in workloads:
+        if workload == "scan":
+            traces["scan"] = scan_trace(length)
+        elif workload == "loop":
+            traces["loop"] = loop_trace(length, keys)
+        else:
+            make = zipf_trace if workload == "zipf" else mixed_trace
+            for skew in skews:
+                traces[f"{workload}(skew={skew})"] = make(length, keys, skew)
+    return traces
+
+
+def run_traces(traces: Dict[str, List[str]], capacity: int,
+               policies: Iterable[str] = POLICIES) -> Dict[str, Any]:
+    """
+    Measure every policy on every trace.
+
+    Returns:
+        JSON-ready report with the environment (commit, Python version) and
+        results[trace][policy] as returned by measure()
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        'capacity': capacity,
+        'results': {name: {policy: measure(policy, capacity, trace) for policy in policies}
+                    for name, trace in traces.items()},
+    }
+
+
+def _key_cost(key: str) -> float:
+    """Deterministic pseudo load cost between 0.1 and 10 seconds."""
+    return 0.1 + (zlib.crc32(key.encode()) % 1000) / 100.0
+
+
+def _print_table(results: Dict[str, List[Dict[str, float]]]) -> None:
+    print(f"{'implementation':<22}{'threads':>8}{'ops/sec':>14}")
+    for name, rows in results.items():
+        for row in rows:
+            print(f"{name:<22}{row['threads']:>8}{row['ops_per_sec']:>14,.0f}")
+
+
+def _print_compact(results: Dict[str, Dict[str, float]]) -> None:
+    print(f"{'implementation':<22}{'bytes/entry':>12}{'ops/sec':>14}")
+    for name, row in results.items():
+        print(f"{name:<22}{row['bytes_per_entry']:>12.1f}{row['ops_per_sec']:>14,.0f}")
+
+
+def _print_traces(report: Dict[str, Any]) -> None:
+    print(f"{'trace':<22}{'policy':<12}{'hit rate':>10}{'ops/sec':>14}{'peak MiB':>10}")
+    for trace, rows in report['results'].items():
+        for policy, row in rows.items():
+            print(f"{trace:<22}{policy:<12}{row['hit_rate']:>10.2%}{row['ops_per_sec']:>14,.0f}"
+                  f"{row['peak_memory_bytes'] / 2 ** 20:>10.1f}")
+
+
+def _print_policies(results: Dict[str, Dict[str, float]]) -> None:
+    print(f"{'policy':<14}{'hit rate':>10}{'cost hit rate':>15}")
+    for name, row in results.items():
+        print(f"{name:<14}{row['hit_rate']:>10.2%}{row['cost_hit_rate']:>15.2%}")
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="CrossDebate cache benchmark")
+    parser.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY,
+                        help=f"Cache capacity (default: {DEFAULT_CAPACITY})")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    commands = parser.add_subparsers(dest="command")
+
+    concurrency = commands.add_parser("concurrency", help="Multi-threaded throughput")
+    concurrency.add_argument("--ops", type=int, default=DEFAULT_OPS,
+                             help=f"Total operations per run (default: {DEFAULT_OPS})")
+    concurrency.add_argument("--threads", type=int, nargs="+", default=DEFAULT_THREADS,
+                             help="Thread counts to benchmark (default: 1 4 16 64)")
+    concurrency.add_argument("--segments", type=int, default=16,
+                             help="Segments for ConcurrentLRUCache (default: 16)")
+
+    policies = commands.add_parser("policies", help="Hit rate of each eviction policy")
+    policies.add_argument("--trace", type=str,
+                          help="Trace file with one key per line (default: synthetic Zipf with scans)")
+    policies.add_argument("--length", type=int, default=DEFAULT_OPS,
+                          help=f"Length of the synthetic trace (default: {DEFAULT_OPS})")
+    policies.add_argument("--skew", type=float, default=0.9,
+                          help="Zipf skew of the synthetic trace (default: 0.9)")
+    policies.add_argument("--policy", nargs="+", default=list(POLICIES), choices=list(POLICIES),
+                          help="Policies to compare (default: all)")
+    policies.add_argument("--costs", action="store_true",
+                          help="Weight each key by a pseudo load cost")
+
+    compact = commands.add_parser("compact", help="Memory and throughput of CompactLRUCache")
+    compact.add_argument("--ops", type=int, default=DEFAULT_OPS,
+                         help=f"Operations in the throughput run (default: {DEFAULT_OPS})")
+    compact.add_argument("--entries", type=int, default=1_000_000,
+                         help="Entries in the memory run (default: 1000000)")
+
+    traces = commands.add_parser("trace", help="Replay traces: hit rate, ops/sec and peak memory")
+    traces.add_argument("--trace", nargs="+", default=[],
+                        help="Recorded trace files (default: synthetic workloads)")
+    traces.add_argument("--key-pattern", type=str,
+                        help="Regex extracting the key from each line of a production log")
+    traces.add_argument("--workload", nargs="+", default=["zipf", "scan", "loop", "mix"],
+                        choices=["zipf", "scan", "loop", "mix"],
+                        help="Synthetic workloads (default: all)")
+    traces.add_argument("--length", type=int, default=DEFAULT_OPS,
+                        help=f"Length of each synthetic trace (default: {DEFAULT_OPS})")
+    traces.add_argument("--skew", type=float, nargs="+", default=[0.6, 0.9, 1.2],
+                        help="Zipf skews of the zipf and mix workloads (default: 0.6 0.9 1.2)")
+    traces.add_argument("--policy", nargs="+", default=list(POLICIES), choices=list(POLICIES),
+                        help="Policies to replay (default: all)")
+    traces.add_argument("--output", type=str, help="Also write the JSON report to this file")
+    traces.add_argument("--save-traces", type=str,
+                        help="Directory to write the replayed traces to, for later runs")
+    args = parser.parse_args()
+
+    if args.command == "policies":
+        if args.trace:
+            trace = load_trace(args.trace)
+        else:
+            trace = scan_polluted_trace(args.length, args.capacity * 10, scan_every=args.capacity * 2,
+                                        scan_length=args.capacity, skew=args.skew)
+        results = compare_policies(trace, args.capacity, args.policy,
+                                   _key_cost if args.costs else None)
+        printer = _print_policies
+    elif args.command == "trace":
+        if args.trace:
+            replayed = {path: load_trace(path, args.key_pattern) for path in args.trace}
+        else:
+            replayed = synthetic_traces(args.workload, args.length, args.capacity * 2, args.skew)
+        if args.save_traces:
+            os.makedirs(args.save_traces, exist_ok=True)
+            for name, trace in replayed.items():
+                save_trace(trace, os.path.join(args.save_traces, re.sub(r"\W+", "_", name) + ".trace"))
+        results = run_traces(replayed, args.capacity, args.policy)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(results, f, indent=2)
+        printer = _print_traces
+    elif args.command == "compact":
+        results = benchmark_compact(args.capacity, args.ops, args.entries)
+        printer = _print_compact
+    else:
+        results = benchmark_concurrency(args.capacity, getattr(args, "ops", DEFAULT_OPS),
+                                        getattr(args, "threads", DEFAULT_THREADS),
+                                        getattr(args, "segments", 16))
+        printer = _print_table
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        printer(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,461 @@
+"""
+Scan-resistant and cost-aware alternatives to lru_cache.LRUCache.
+
+Every policy exposes the LRUCache interface (get/put/keys/values/items,
+len() and clear()) so callers can switch with make_cache() without
+touching the code that uses the cache.
+"""
+
+import heapq
+import itertools
+from array import array
+from collections import OrderedDict
+from typing import Dict, Generic, Optional, TypeVar
+
+from lru_cache import LRUCache
+
+T = TypeVar('T')  # Generic type for stored models
+
+_MISSING = object()  # Sentinel distinguishing a miss from a stored value
+
+
+class CountMinSketch:
+    """
+    Count-min sketch of access frequencies with periodic aging.
+    Counters saturate at 15 and are halved once sample_size increments have
+    been recorded, so the sketch tracks recent popularity in a few bytes per
+    cache entry.
+    """
+
+    MAX_COUNT = 15
+
+    def __init__(self, width: int, depth: int = 4, sample_size: Optional[int] = None):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            width: Minimum number of counters per row (rounded up to a power of two)
+            depth: Number of independent rows
+            sample_size: Increments between agings (defaults to 10 * width)
+        """
+        size = 1
+        while size < max(16, width):
+            size <<= 1
+        self.width = size
+        self.depth = depth
+        self.sample_size = sample_size or 10 * size
+        self._mask = size - 1
+        self._rows = [array('B', bytes(size)) for _ in range(depth)]
+        self._additions = 0
+
+    def _indexes(self, key):
+        """Return one counter index per row using double hashing."""
+        h1 = hash(key)
+        h2 = (h1 >> 16) | 1
+        mask = self._mask
+        return [(h1 + i * h2) & mask for i in range(self.depth)]
+
+    def increment(self, key) -> None:
+        """Record one access to key."""
+        for row, index in zip(self._rows, self._indexes(key)):
+            if row[index] < self.MAX_COUNT:
+                row[index] += 1
+        self._additions += 1
+        if self._additions >= self.sample_size:
+            self._age()
+
+    def estimate(self, key) -> int:
+        """Return the estimated recent access count of key."""
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+
+    def _age(self) -> None:
+        """Halve every counter so old popularity fades out."""
+        self._rows = [array('B', bytes(count >> 1 for count in row)) for row in self._rows]
+        self._additions //= 2
+
+    def clear(self) -> None:
+        """Reset all counters."""
+        self._rows = [array('B', bytes(self.width)) for _ in range(self.depth)]
+        self._additions = 0
+
+
+class TinyLFUCache(Generic[T]):
+    """
+    W-TinyLFU cache: a small LRU admission window in front of a segmented LRU.
+    New entries land in the window; when it overflows, its oldest entry only
+    enters the main area if the frequency sketch rates it above the main
+    area's eviction victim. One-off keys from a scan therefore die in the
+    window instead of flushing the hot working set.
+    """
+
+    def __init__(self, capacity: int, window_ratio: float = 0.01, protected_ratio: float = 0.8):
+        """
+        Initialize a new W-TinyLFU cache.
+
+        Args:
+            capacity: Maximum number of models to store in the cache
+            window_ratio: Share of the capacity used by the admission window
+            protected_ratio: Share of the main area reserved for re-used entries
+        """
+        self.capacity = max(1, capacity)
+        self._window_capacity = max(1, int(self.capacity * window_ratio)) if self.capacity > 1 else 0
+        self._main_capacity = self.capacity - self._window_capacity
+        self._protected_capacity = int(self._main_capacity * protected_ratio)
+        self._window = OrderedDict()
+        self._probation = OrderedDict()
+        self._protected = OrderedDict()
+        self._sketch = CountMinSketch(self.capacity)
+
+    def get(self, key: str) -> Optional[T]:
+        """
+        Retrieve a model from the cache and record the access.
+
+        Args:
+            key: Identifier for the model
+
+        Returns:
+            The model if found, None otherwise
+        """
+        self._sketch.increment(key)
+        value = self._window.get(key, _MISSING)
+        if value is not _MISSING:
+            self._window.move_to_end(key)
+            return value
+        value = self._protected.get(key, _MISSING)
+        if value is not _MISSING:
+            self._protected.move_to_end(key)
+            return value
+        value = self._probation.pop(key, _MISSING)
+        if value is not _MISSING:
+            self._promote(key, value)
+            return value
+        return None
+
+    def _promote(self, key: str, value: T) -> None:
+        """Move a re-used probation entry into the protected segment."""
+        self._protected[key] = value
+        if len(self._protected) > self._protected_capacity:
+            demoted_key, demoted_value = self._protected.popitem(last=False)
+            self._probation[demoted_key] = demoted_value
+
+    def put(self, key: str, value: T) -> bool:
+        """
+        Add or update a model in the cache.
+
+        Args:
+            key: Identifier for the model
+            value: The model to store
+
+        Returns:
+            True, for compatibility with LRUCache.put
+        """
+        for segment in (self._window, self._protected):
+            if key in segment:
+                segment[key] = value
+                segment.move_to_end(key)
+                return True
+        if key in self._probation:
+            del self._probation[key]
+            self._promote(key, value)
+            return True
+
+        self._window[key] = value
+        if len(self._window) > self._window_capacity:
+            self._admit(*self._window.popitem(last=False))
+        return True
+
+    def _admit(self, key: str, value: T) -> None:
+        """Offer a window candidate to the main area, evicting the colder entry."""
+        if len(self._probation) + len(self._protected) < self._main_capacity:
+            self._probation[key] = value
+            return
+        victims = self._probation if self._probation else self._protected
+        victim = next(iter(victims))
+        if self._sketch.estimate(key) > self._sketch.estimate(victim):
+            del victims[victim]
+            self._probation[key] = value
+
+    def __len__(self) -> int:
+        """Return the number of items in the cache."""
+        return len(self._window) + len(self._probation) + len(self._protected)
+
+    def clear(self) -> None:
+        """Clear all items and the frequency history."""
+        self._window.clear()
+        self._probation.clear()
+        self._protected.clear()
+        self._sketch.clear()
+
+    def items(self):
+        """Return all (key, value) pairs: probation, protected, then window entries."""
+        return list(itertools.chain(self._probation.items(), self._protected.items(),
+                                    self._window.items()))
+
+    def keys(self):
+        """Return all keys: probation, protected, then window entries."""
+        return [key for key, _ in self.items()]
+
+    def values(self):
+        """Return all values: probation, protected, then window entries."""
+        return [value for _, value in self.items()]
+
+
+class ARCCache(Generic[T]):
+    """
+    Adaptive Replacement Cache.
+    Splits the cache into entries seen once (T1) and entries seen at least
+    twice (T2), and remembers recently evicted keys of each (B1, B2). Hits on
+    those ghost lists shift the target size of T1, so the cache adapts
+    between recency and frequency and a scan can only flush T1.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Initialize a new ARC cache.
+
+        Args:
+            capacity: Maximum number of models to store in the cache
+        """
+        self.capacity = max(1, capacity)
+        self._t1 = OrderedDict()
+        self._t2 = OrderedDict()
+        self._b1 = OrderedDict()  # Ghost keys evicted from T1
+        self._b2 = OrderedDict()  # Ghost keys evicted from T2
+        self._target = 0  # Adaptive target size of T1
+
+    def get(self, key: str) -> Optional[T]:
+        """
+        Retrieve a model from the cache and mark it as frequently used.
+
+        Args:
+            key: Identifier for the model
+
+        Returns:
+            The model if found, None otherwise
+        """
+        value = self._t2.get(key, _MISSING)
+        if value is not _MISSING:
+            self._t2.move_to_end(key)
+            return value
+        value = self._t1.pop(key, _MISSING)
+        if value is not _MISSING:
+            self._t2[key] = value
+            return value
+        return None
+
+    def _replace(self, in_b2: bool) -> None:
+        """Evict from T1 or T2 into the matching ghost list, following the target."""
+        if self._t1 and (len(self._t1) > self._target or
+                         (in_b2 and len(self._t1) == self._target) or not self._t2):
+            old_key, _ = self._t1.popitem(last=False)
+            self._b1[old_key] = None
+        else:
+            old_key, _ = self._t2.popitem(last=False)
+            self._b2[old_key] = None
+
+    def put(self, key: str, value: T) -> bool:
+        """
+        Add or update a model in the cache.
+
+        Args:
+            key: Identifier for the model
+            value: The model to store
+
+        Returns:
+            True, for compatibility with LRUCache.put
+        """
+        if key in self._t1:
+            del self._t1[key]
+            self._t2[key] = value
+            return True
+        if key in self._t2:
+            self._t2[key] = value
+            self._t2.move_to_end(key)
+            return True
+
+        full = len(self._t1) + len(self._t2) >= self.capacity
+        if key in self._b1:
+            self._target = min(self.capacity,
+                               self._target + max(len(self._b2) // len(self._b1), 1))
+            del self._b1[key]
+            if full:
+                self._replace(False)
+            self._t2[key] = value
+            return True
+        if key in self._b2:
+            self._target = max(0, self._target - max(len(self._b1) // len(self._b2), 1))
+            del self._b2[key]
+            if full:
+                self._replace(True)
+            self._t2[key] = value
+            return True
+
+        if len(self._t1) + len(self._b1) >= self.capacity:
+            if len(self._t1) < self.capacity:
+                self._b1.popitem(last=False)
+                if full:
+                    self._replace(False)
+            else:
+                self._t1.popitem(last=False)
+        elif full:
+            if len(self._t1) + len(self._t2) + len(self._b1) + len(self._b2) >= 2 * self.capacity:
+                self._b2.popitem(last=False)
+            self._replace(False)
+        self._t1[key] = value
+        return True
+
+    def __len__(self) -> int:
+        """Return the number of items in the cache."""
+        return len(self._t1) + len(self._t2)
+
+    def clear(self) -> None:
+        """Clear all items and ghost entries."""
+        self._t1.clear()
+        self._t2.clear()
+        self._b1.clear()
+        self._b2.clear()
+        self._target = 0
+
+    def items(self):
+        """Return all (key, value) pairs: entries seen once, then entries seen repeatedly."""
+        return list(itertools.chain(self._t1.items(), self._t2.items()))
+
+    def keys(self):
+        """Return all keys: entries seen once, then entries seen repeatedly."""
+        return [key for key, _ in self.items()]
+
+    def values(self):
+        """Return all values: entries seen once, then entries seen repeatedly."""
+        return [value for _, value in self.items()]
+
+
+class GreedyDualCache(Generic[T]):
+    """
+    Cost-aware GreedyDual cache.
+    Each entry gets a priority of L + cost, where cost is typically the time
+    it took to load and L is the priority of the last evicted entry. The
+    entry with the lowest priority is evicted first, so expensive models
+    outlive cheap results of the same age; with equal costs it behaves as LRU.
+    """
+
+    def __init__(self, capacity: int, default_cost: float = 1.0):
+        """
+        Initialize a new GreedyDual cache.
+
+        Args:
+            capacity: Maximum number of models to store in the cache
+            default_cost: Cost assumed for entries put without one
+        """
+        self.capacity = max(1, capacity)
+        self.default_cost = default_cost
+        self._values: Dict[str, T] = {}
+        self._costs: Dict[str, float] = {}
+        self._entries: Dict[str, tuple] = {}  # key -> current (priority, sequence)
+        self._heap = []  # (priority, sequence, key), including stale entries
+        self._inflation = 0.0
+        self._sequence = itertools.count()
+
+    def _touch(self, key: str) -> None:
+        """Refresh the priority of key from the current inflation value."""
+        entry = (self._inflation + self._costs[key], next(self._sequence))
+        self._entries[key] = entry
+        heapq.heappush(self._heap, (entry[0], entry[1], key))
+        # Stale heap entries accumulate on hits; rebuild once they dominate
+        if len(self._heap) > 4 * len(self._entries) + 64:
+            self._heap = [(p, s, k) for k, (p, s) in self._entries.items()]
+            heapq.heapify(self._heap)
+
+    def get(self, key: str) -> Optional[T]:
+        """
+        Retrieve a model from the cache and restore its priority.
+
+        Args:
+            key: Identifier for the model
+
+        Returns:
+            The model if found, None otherwise
+        """
+        value = self._values.get(key, _MISSING)
+        if value is _MISSING:
+            return None
+        self._touch(key)
+        return value
+
+    def put(self, key: str, value: T, cost: Optional[float] = None) -> bool:
+        """
+        Add or update a model in the cache.
+
+        Args:
+            key: Identifier for the model
+            value: The model to store
+            cost: Cost of reloading the model (e.g. load time in seconds)
+
+        Returns:
+            True, for compatibility with LRUCache.put
+        """
+        if key not in self._values and len(self._values) >= self.capacity:
+            self._evict()
+        self._values[key] = value
+        self._costs[key] = self.default_cost if cost is None else cost
+        self._touch(key)
+        return True
+
+    def _evict(self) -> None:
+        """Remove the entry with the lowest priority and inflate L to it."""
+        while self._heap:
+            priority, sequence, key = heapq.heappop(self._heap)
+            if self._entries.get(key) == (priority, sequence):
+                self._inflation = priority
+                del self._values[key], self._costs[key], self._entries[key]
+                return
+
+    def __len__(self) -> int:
+        """Return the number of items in the cache."""
+        return len(self._values)
+
+    def clear(self) -> None:
+        """Clear all items from the cache."""
+        self._values.clear()
+        self._costs.clear()
+        self._entries.clear()
+        self._heap = []
+        self._inflation = 0.0
+
+    def keys(self):
+        """Return all keys, from lowest to highest priority."""
+        return sorted(self._entries, key=self._entries.__getitem__)
+
+    def values(self):
+        """Return all values, from lowest to highest priority."""
+        return [self._values[key] for key in self.keys()]
+
+    def items(self):
+        """Return all (key, value) pairs, from lowest to highest priority."""
+        return [(key, self._values[key]) for key in self.keys()]
+
+
+POLICIES = {
+    'lru': LRUCache,
+    'tinylfu': TinyLFUCache,
+    'arc': ARCCache,
+    'greedydual': GreedyDualCache,
+}
+
+
+def make_cache(policy: str, capacity: int, **kwargs):
+    """
+    Create a cache with the given eviction policy.
+
+    Args:
+        policy: One of 'lru', 'tinylfu', 'arc' or 'greedydual'
+        capacity: Maximum number of models to store in the cache
+        **kwargs: Extra options for the policy's constructor
+
+    Returns:
+        A cache exposing the LRUCache interface
+    """
+    try:
+        factory = POLICIES[policy]
+    except KeyError:
+        raise ValueError(f"Unknown cache policy {policy!r}; expected one of {sorted(POLICIES)}")
+    return factory(capacity, **kwargs)
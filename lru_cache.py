@@ -1,24 +1,392 @@
+import asyncio
+import bisect
+import concurrent.futures
+import inspect
+import logging
+import math
+import os
+import struct
+import threading
+import time
+from array import array
 from collections import OrderedDict
-from typing import Any, Optional, TypeVar, Generic
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar, Generic, Union
 
 T = TypeVar('T')  # Generic type for stored models
 
+logger = logging.getLogger("lru_cache")
+
+_MISSING = object()  # Sentinel distinguishing a miss from a stored value
+
+SNAPSHOT_MAGIC = b"LRUSNAP1"
+# magic, flags, entry count, total key bytes, total value bytes
+_SNAPSHOT_HEADER = struct.Struct("<8sBQQQ")
+_SNAPSHOT_VALUES = 1  # Flag: the snapshot carries serialized values
+_SNAPSHOT_TTLS = 2  # Flag: the snapshot carries remaining TTLs
+_NO_VALUE = 0xFFFFFFFFFFFFFFFF  # Value length of an entry saved without a value
+
+class TimerWheel:
+    """
+    Hierarchical timer wheel tracking the deadline of each key.
+    Level 0 holds one bucket per tick; every higher level covers `slots` times
+    the span of the level below. advance() only visits buckets whose time has
+    come and cascades coarse buckets into finer ones on the way, so sweeping
+    costs O(expired) amortized instead of a scan over every key.
+    """
+    
+    def __init__(self, tick: float = 1.0, slots: int = 64, levels: int = 4, start: float = 0.0):
+        """
+        Initialize an empty timer wheel.
+        
+        Args:
+            tick: Resolution of the wheel in seconds
+            slots: Number of buckets per level
+            levels: Number of levels in the hierarchy
+            start: Current time, in the same unit as the deadlines
+        """
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self._wheels = [[set() for _ in range(slots)] for _ in range(levels)]
+        self._spans = [slots ** level for level in range(levels + 1)]
+        self._location = {}  # key -> (level, slot)
+        self._deadlines = {}  # key -> deadline in ticks
+        self._now = int(start // tick)
+    
+    def __len__(self) -> int:
+        """Return the number of scheduled keys."""
+        return len(self._deadlines)
+    
+    def schedule(self, key: str, deadline: float) -> None:
+        """Schedule key to expire at deadline, replacing any previous schedule."""
+        self.cancel(key)
+        ticks = max(math.ceil(deadline / self.tick), self._now + 1)
+        self._deadlines[key] = ticks
+        self._place(key, ticks)
+    
+    def cancel(self, key: str) -> None:
+        """Remove key from the wheel if it is scheduled."""
+        location = self._location.pop(key, None)
+        if location is not None:
+            level, slot = location
+            self._wheels[level][slot].discard(key)
+            del self._deadlines[key]
+    
+    def upcoming(self) -> list:
+        """
+        Return the keys due on the next tick, which advance() has not released yet.
+        
+        Their deadlines fall inside the tick that is currently running, so some
+        of them may already have passed.
+        """
+        next_tick = self._now + 1
+        keys = list(self._wheels[0][next_tick % self.slots])
+        level = 1
+        # Coarse buckets whose window starts on the next tick have not cascaded yet
+        while level < self.levels and next_tick % self._spans[level] == 0:
+            slot = (next_tick // self._spans[level]) % self.slots
+            keys.extend(key for key in self._wheels[level][slot]
+                        if self._deadlines[key] == next_tick)
+            level += 1
+        return keys
+    
+    def _place(self, key: str, ticks: int) -> None:
+        """Put key in the finest bucket whose span reaches its deadline."""
+        delta = ticks - self._now
+        top = self.levels - 1
+        for level in range(self.levels):
+            if delta < self._spans[level + 1] or level == top:
+                if delta >= self._spans[level + 1]:
+                    # Beyond the wheel horizon: park it in the farthest bucket
+                    ticks = self._now + self._spans[level + 1] - 1
+                slot = (ticks // self._spans[level]) % self.slots
+                self._wheels[level][slot].add(key)
+                self._location[key] = (level, slot)
+                return
+    
+    def advance(self, now: float) -> list:
+        """
+        Move the wheel forward to now.
+        
+        Args:
+            now: Current time, in the same unit as the deadlines
+            
+        Returns:
+            The keys whose deadline has passed, removed from the wheel
+        """
+        target = int(now // self.tick)
+        expired = []
+        if target - self._now >= self._spans[self.levels]:
+            # Idle for longer than the whole wheel: rebuild it from scratch
+            pending = self._deadlines
+            self._wheels = [[set() for _ in range(self.slots)] for _ in range(self.levels)]
+            self._location, self._deadlines = {}, {}
+            self._now = target
+            for key, ticks in pending.items():
+                if ticks <= target:
+                    expired.append(key)
+                else:
+                    self._deadlines[key] = ticks
+                    self._place(key, ticks)
+            return expired
+        
+        while self._now < target:
+            self._now += 1
+            now_ticks = self._now
+            # Cascade coarse buckets whose window starts now, highest level first
+            level = 1
+            while level < self.levels and now_ticks % self._spans[level] == 0:
+                level += 1
+            for cascade in range(level - 1, 0, -1):
+                slot = (now_ticks // self._spans[cascade]) % self.slots
+                bucket = self._wheels[cascade][slot]
+                if bucket:
+                    self._wheels[cascade][slot] = set()
+                    for key in bucket:
+                        self._place(key, self._deadlines[key])
+            slot = now_ticks % self.slots
+            bucket = self._wheels[0][slot]
+            if bucket:
+                self._wheels[0][slot] = set()
+                for key in bucket:
+                    del self._location[key]
+                    del self._deadlines[key]
+                expired.extend(bucket)
+        return expired
+
+
+class _ColdValue:
+    """Placeholder for a restored value, materialized as thaw(arg) on first access."""
+    __slots__ = ('thaw', 'arg')
+    
+    def __init__(self, thaw: Callable[[Any], Any], arg: Any):
+        self.thaw = thaw
+        self.arg = arg
+
+
+class RemovalCause:
+    """Reasons an entry leaves the cache."""
+    SIZE = 'size'  # Evicted to respect capacity or max_weight
+    EXPIRED = 'expired'  # Its time-to-live ran out
+    REPLACED = 'replaced'  # Overwritten by a put() of the same key
+    EXPLICIT = 'explicit'  # Removed by invalidate()
+
+
+class _StatsShard:
+    """Counters owned by a single thread."""
+    __slots__ = ('hits', 'misses', 'puts', 'updates', 'rejected', 'removals',
+                 'prefixes', 'loads', 'load_failures', 'load_seconds', 'load_buckets')
+    
+    def __init__(self, buckets: int):
+        self.hits = self.misses = self.puts = self.updates = self.rejected = 0
+        self.removals: Dict[str, int] = {}
+        self.prefixes: Dict[str, list] = {}  # prefix -> [hits, misses, evictions]
+        self.loads = self.load_failures = 0
+        self.load_seconds = 0.0
+        self.load_buckets = [0] * buckets
+
+
+class CacheStats:
+    """
+    Low-overhead hit, miss, eviction and load counters for LRUCache.
+    Every thread increments its own shard without taking a lock and
+    snapshot() merges the shards on read, so recording stays cheap enough
+    to leave on in production. One instance may be shared by several
+    caches, e.g. all segments of a ConcurrentLRUCache.
+    """
+    
+    # Upper bounds in seconds of the load latency histogram buckets
+    LOAD_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, math.inf)
+    
+    def __init__(self, key_prefix: Optional[Callable[[str], str]] = None):
+        """
+        Initialize empty statistics.
+        
+        Args:
+            key_prefix: Optional function mapping a key to the prefix it is
+                reported under, e.g. lambda key: key.split(':', 1)[0]
+        """
+        self.key_prefix = key_prefix
+        self._registry_lock = threading.Lock()
+        self._local = threading.local()
+        self._shards = []
+    
+    def _shard(self) -> _StatsShard:
+        """Return the calling thread's shard, creating it on first use."""
+        try:
+            return self._local.shard
+        except AttributeError:
+            return self._new_shard()
+    
+    def _new_shard(self) -> _StatsShard:
+        """Create and register a shard for the calling thread."""
+        shard = _StatsShard(len(self.LOAD_BUCKETS))
+        with self._registry_lock:
+            self._shards.append(shard)
+        self._local.shard = shard
+        return shard
+    
+    def _prefix(self, shard: _StatsShard, key: str) -> list:
+        """Return the per-prefix counters of key within shard."""
+        prefix = self.key_prefix(key)
+        counters = shard.prefixes.get(prefix)
+        if counters is None:
+            counters = shard.prefixes[prefix] = [0, 0, 0]
+        return counters
+    
+    def record_hit(self, key: str) -> None:
+        """Record a lookup that found key."""
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        shard.hits += 1
+        if self.key_prefix is not None:
+            self._prefix(shard, key)[0] += 1
+    
+    def record_miss(self, key: str) -> None:
+        """Record a lookup that did not find key."""
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        shard.misses += 1
+        if self.key_prefix is not None:
+            self._prefix(shard, key)[1] += 1
+    
+    def record_put(self, key: str, update: bool, stored: bool = True) -> None:
+        """Record a put(), distinguishing new keys, updates and rejected entries."""
+        shard = self._shard()
+        if not stored:
+            shard.rejected += 1
+        elif update:
+            shard.updates += 1
+        else:
+            shard.puts += 1
+    
+    def record_removal(self, key: str, cause: str) -> None:
+        """Record an entry leaving the cache for the given RemovalCause."""
+        shard = self._shard()
+        shard.removals[cause] = shard.removals.get(cause, 0) + 1
+        if self.key_prefix is not None and cause in (RemovalCause.SIZE, RemovalCause.EXPIRED):
+            self._prefix(shard, key)[2] += 1
+    
+    def record_load(self, key: str, seconds: float, success: bool = True) -> None:
+        """Record how long a loader took and whether it succeeded."""
+        shard = self._shard()
+        shard.loads += 1
+        if not success:
+            shard.load_failures += 1
+        shard.load_seconds += seconds
+        shard.load_buckets[bisect.bisect_left(self.LOAD_BUCKETS, seconds)] += 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Merge the counters of every thread.
+        
+        Returns:
+            JSON-serializable dictionary of the current statistics
+        """
+        with self._registry_lock:
+            shards = list(self._shards)
+        hits = sum(shard.hits for shard in shards)
+        misses = sum(shard.misses for shard in shards)
+        removals: Dict[str, int] = {}
+        prefixes: Dict[str, Dict[str, int]] = {}
+        histogram = [0] * len(self.LOAD_BUCKETS)
+        for shard in shards:
+            for cause, count in list(shard.removals.items()):
+                removals[cause] = removals.get(cause, 0) + count
+            for prefix, (p_hits, p_misses, p_evictions) in list(shard.prefixes.items()):
+                merged = prefixes.setdefault(prefix, {'hits': 0, 'misses': 0, 'evictions': 0})
+                merged['hits'] += p_hits
+                merged['misses'] += p_misses
+                merged['evictions'] += p_evictions
+            for index, count in enumerate(shard.load_buckets):
+                histogram[index] += count
+        loads = sum(shard.loads for shard in shards)
+        load_seconds = sum(shard.load_seconds for shard in shards)
+        return {
+            'hits': hits,
+            'misses': misses,
+            'requests': hits + misses,
+            'hit_ratio': hits / (hits + misses) if hits + misses else 0.0,
+            'puts': sum(shard.puts for shard in shards),
+            'updates': sum(shard.updates for shard in shards),
+            'rejected': sum(shard.rejected for shard in shards),
+            'evictions': {cause: removals.get(cause, 0)
+                          for cause in (RemovalCause.SIZE, RemovalCause.EXPIRED)},
+            'removals': removals,
+            'loads': {
+                'count': loads,
+                'failures': sum(shard.load_failures for shard in shards),
+                'total_seconds': load_seconds,
+                'mean_seconds': load_seconds / loads if loads else 0.0,
+                'histogram': {f"le_{bound:g}": count
+                              for bound, count in zip(self.LOAD_BUCKETS, histogram)},
+            },
+            'prefixes': prefixes,
+        }
+    
+    def reset(self) -> None:
+        """Start counting from zero; increments racing with the reset may be lost."""
+        with self._registry_lock:
+            self._shards = []
+            self._local = threading.local()
+
+
 class LRUCache(Generic[T]):
     """
     Least Recently Used (LRU) Cache implementation using OrderedDict.
     Automatically manages model instances by keeping most recently used ones
     and discarding least recently used ones when capacity is reached.
+    Entries may carry a time-to-live; expired entries are dropped lazily on
+    get() and swept proactively through a TimerWheel.
     """
     
-    def __init__(self, capacity: int):
+    def __init__(self, capacity: int,
+                 weigher: Optional[Callable[[str, T], int]] = None,
+                 max_weight: Optional[int] = None,
+                 default_ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 stats: Optional[CacheStats] = None):
         """
         Initialize a new LRU Cache with specified capacity.
         
         Args:
             capacity: Maximum number of models to store in the cache
+            weigher: Optional function returning the weight (e.g. bytes) of an entry
+            max_weight: Optional budget for the total weight of all entries
+            default_ttl: Optional time-to-live in seconds for entries put without one
+            clock: Time source used for expiry, in seconds
+            stats: Optional CacheStats recording hits, misses, removals and loads
         """
+        if max_weight is not None and weigher is None:
+            raise ValueError("max_weight requires a weigher")
         self.capacity = max(1, capacity)  # Ensure capacity is at least 1
         self.cache = OrderedDict()  # Ordered dictionary to track usage order
+        self.weigher = weigher
+        self.max_weight = max_weight
+        self.default_ttl = default_ttl
+        self.stats = stats
+        self._clock = clock
+        # Route every put() through _put_tracked() so all removals go via _remove()
+        self._tracked = weigher is not None or stats is not None
+        self._weights = {}  # Weight of each entry, only used in weighted mode
+        self._total_weight = 0
+        self._expires = {}  # Deadline of each entry that has a TTL
+        self._wheel = None  # Created on the first entry with a TTL
+        self._lock = threading.RLock()  # Guards the single-flight bookkeeping
+        self._inflight = {}  # key -> Future of a running synchronous load
+        self._ainflight = {}  # (event loop, key) -> Task of a running async load
+        self._loaded_at = {}  # Load time of entries that may be refreshed
+        self._executor = None  # Created on the first background refresh
+        self._cold = 0  # Number of restored entries whose value is still a _ColdValue
+        self._snapshot_stop = None  # Event stopping the periodic snapshot thread
+        self._snapshot_args = None  # (path, serializer) of the periodic snapshots
+        self._listeners = []  # (listener, executor) pairs told about every removal
+        self._releaser = None  # Default listener executor, created on first use
+        self._releases = set()  # Listener calls not finished yet
     
     def get(self, key: str) -> Optional[T]:
         """
@@ -28,24 +396,53 @@ class LRUCache(Generic[T]):
             key: Identifier for the model
             
         Returns:
-            The model if found, None otherwise
+            The model if found and not expired, None otherwise
         """
-        if key not in self.cache:
+        value = self.cache.get(key, _MISSING)
+        if value is _MISSING:
+            if self.stats is not None:
+                self.stats.record_miss(key)
             return None
+        if self._expires:
+            deadline = self._expires.get(key)
+            if deadline is not None and deadline <= self._clock():
+                self._remove(key, RemovalCause.EXPIRED)
+                if self.stats is not None:
+                    self.stats.record_miss(key)
+                return None
+        if self._cold and type(value) is _ColdValue:
+            # Under the lock, so a background warm-up never thaws the same key twice
+            with self._lock:
+                value = self.cache.get(key, _MISSING)
+                if type(value) is _ColdValue:
+                    value = self._thaw(key, value)
+            if value is _MISSING:
+                if self.stats is not None:
+                    self.stats.record_miss(key)
+                return None
             
         # Move this item to the end (most recently used)
-        value = self.cache.pop(key)
-        self.cache[key] = value
+        self.cache.move_to_end(key)
+        if self.stats is not None:
+            self.stats.record_hit(key)
         return value
     
-    def put(self, key: str, value: T) -> None:
+    def put(self, key: str, value: T, ttl: Optional[float] = None) -> bool:
         """
         Add or update a model in the cache.
         
         Args:
             key: Identifier for the model
             value: The model to store
+            ttl: Optional time-to-live in seconds, overriding default_ttl
+            
+        Returns:
+            True if the model was stored, False if it weighs more than max_weight
         """
+        if ttl is None:
+            ttl = self.default_ttl
+        if self._tracked or ttl is not None or self._expires or self._loaded_at or self._cold:
+            return self._put_tracked(key, value, ttl)
         # If key exists, remove it first to update its position
         if key in self.cache:
             self.cache.pop(key)
@@ -54,23 +451,1198 @@ class LRUCache(Generic[T]):
             self.cache.popitem(last=False)
         # Add the new item as most recently used
         self.cache[key] = value
+        return True
+    
+    def _put_tracked(self, key: str, value: T, ttl: Optional[float]) -> bool:
+        """Store an entry that needs weight, expiry or statistics bookkeeping."""
+        if ttl is not None and ttl <= 0:
+            raise ValueError(f"ttl must be positive, got {ttl}")
+        if self._expires:
+            self.purge_expired()
+        weight = 0
+        if self.weigher is not None:
+            weight = self.weigher(key, value)
+            if weight < 0:
+                raise ValueError(f"weigher returned a negative weight for {key!r}: {weight}")
+        # Drop the previous value first; a rejected update must not leave it stale
+        update = key in self.cache
+        if self.max_weight is not None and weight > self.max_weight:
+            if update:
+                # Nothing replaces the old value: it is simply removed
+                self._remove(key, RemovalCause.EXPLICIT)
+            if self.stats is not None:
+                self.stats.record_put(key, update, stored=False)
+            return False
+        if update:
+            previous = self._remove(key, RemovalCause.REPLACED)
+            # A restored value never loaded is not reported; _remove() already uncounted it
+            if previous is not value and type(previous) is not _ColdValue:
+                self._notify(key, previous, RemovalCause.REPLACED)
+        
+        # Evict least recently used entries until the new one fits
+        while self.cache and (len(self.cache) >= self.capacity or
+                              (self.max_weight is not None and
+                               self._total_weight + weight > self.max_weight)):
+            self._remove(next(iter(self.cache)), RemovalCause.SIZE)
+        
+        if self.stats is not None:
+            self.stats.record_put(key, update)
+        self.cache[key] = value
+        if self.weigher is not None:
+            self._weights[key] = weight
+            self._total_weight += weight
+        if ttl is not None:
+            self._set_deadline(key, ttl)
+        return True
+    
+    def _set_deadline(self, key: str, ttl: float) -> None:
+        """Schedule key to expire ttl seconds from now."""
+        deadline = self._clock() + ttl
+        if self._wheel is None:
+            self._wheel = TimerWheel(start=self._clock())
+        self._expires[key] = deadline
+        self._wheel.schedule(key, deadline)
+    
+    def _remove(self, key: str, cause: str) -> T:
+        """Remove an entry together with its bookkeeping, recording the RemovalCause."""
+        value = self.cache.pop(key)
+        if self.stats is not None:
+            self.stats.record_removal(key, cause)
+        if self.weigher is not None:
+            self._total_weight -= self._weights.pop(key)
+        if self._expires and self._expires.pop(key, None) is not None:
+            self._wheel.cancel(key)
+        if self._loaded_at:
+            self._loaded_at.pop(key, None)
+        if self._cold and type(value) is _ColdValue:
+            self._cold -= 1
+        elif self._listeners and cause != RemovalCause.REPLACED:
+            self._notify(key, value, cause)  # Replacements are reported by the caller
+        return value
+    
+    def add_removal_listener(self, listener: Callable[[str, T, str], None],
+                             executor: Optional[concurrent.futures.Executor] = None) -> None:
+        """
+        Call listener(key, value, cause) off the request thread whenever an entry leaves.
+        
+        Listeners see every RemovalCause: evictions for size, expiry, replacement
+        by a different value and explicit removal (invalidate() and clear()).
+        They are the place to close a model's context or unmap its weights.
+        Restored entries that were never materialized are not reported.
+        
+        Args:
+            listener: Function called with the key, the removed value and the cause
+            executor: Executor running the listener; by default a single
+                background thread shared by this cache's listeners, which
+                keeps releases in removal order
+        """
+        self._listeners.append((listener, executor))
+        self._tracked = True  # Every removal must go through _remove()
+    
+    def remove_removal_listener(self, listener: Callable[[str, T, str], None]) -> None:
+        """Stop calling listener for future removals."""
+        self._listeners = [entry for entry in self._listeners if entry[0] is not listener]
+    
+    def _notify(self, key: str, value: T, cause: str) -> None:
+        """Hand a removed entry to every listener's executor."""
+        for listener, executor in self._listeners:
+            if executor is None:
+                if self._releaser is None:
+                    self._releaser = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="lru-cache-release")
+                executor = self._releaser
+            future = executor.submit(self._call_listener, listener, key, value, cause)
+            with self._lock:
+                self._releases.add(future)
+            future.add_done_callback(self._release_done)
+    
+    @staticmethod
+    def _call_listener(listener: Callable[[str, T, str], None], key: str, value: T,
+                       cause: str) -> None:
+        try:
+            listener(key, value, cause)
+        except Exception as exc:
+            logger.error(f"Removal listener failed for {key!r} ({cause}): {exc}")
+    
+    def _release_done(self, future: concurrent.futures.Future) -> None:
+        with self._lock:
+            self._releases.discard(future)
+    
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the removal listeners still running or queued, e.g. at shutdown.
+        
+        Args:
+            timeout: Maximum number of seconds to wait, forever if None
+            
+        Returns:
+            True if every pending listener call has finished
+        """
+        with self._lock:
+            pending = list(self._releases)
+        _, not_done = concurrent.futures.wait(pending, timeout)
+        return not not_done
+    
+    def _thaw(self, key: str, cold: _ColdValue) -> Any:
+        """Materialize a restored value in place; drop the entry if that fails."""
+        try:
+            value = cold.thaw(cold.arg)
+        except Exception as exc:
+            logger.warning(f"Could not restore cached value of {key!r}: {exc}")
+            if self.cache.get(key) is cold:
+                self._remove(key, RemovalCause.EXPLICIT)
+            return _MISSING
+        if self.cache.get(key) is cold:
+            self.cache[key] = value  # Assigning an existing key keeps its position
+            self._cold -= 1
+        return value
+    
+    def _thaw_all(self) -> None:
+        """Materialize every restored value, most recently used first."""
+        with self._lock:
+            for key, value in reversed(list(self.cache.items())):
+                if type(value) is _ColdValue:
+                    self._thaw(key, value)
+    
+    def _lookup(self, key: str) -> Any:
+        """Like get(), but return _MISSING on a miss so stored None values count as hits."""
+        value = self.cache.get(key, _MISSING)
+        if value is not _MISSING and self._expires:
+            deadline = self._expires.get(key)
+            if deadline is not None and deadline <= self._clock():
+                self._remove(key, RemovalCause.EXPIRED)
+                value = _MISSING
+        if self._cold and type(value) is _ColdValue:
+            value = self._thaw(key, value)
+        if value is _MISSING:
+            if self.stats is not None:
+                self.stats.record_miss(key)
+            return _MISSING
+        self.cache.move_to_end(key)
+        if self.stats is not None:
+            self.stats.record_hit(key)
+        return value
+    
+    def _is_stale(self, key: str, refresh_after: Optional[float]) -> bool:
+        """Return True if a loaded entry is older than refresh_after seconds."""
+        if refresh_after is None:
+            return False
+        loaded_at = self._loaded_at.get(key)
+        return loaded_at is not None and self._clock() - loaded_at >= refresh_after
+    
+    def _store_loaded(self, key: str, value: T, ttl: Optional[float],
+                      refresh_after: Optional[float]) -> None:
+        """Store a freshly loaded value, remembering its load time if it may be refreshed."""
+        if self.put(key, value, ttl) and refresh_after is not None:
+            self._loaded_at[key] = self._clock()
+    
+    def get_or_load(self, key: str, loader: Callable[[str], T],
+                    ttl: Optional[float] = None,
+                    refresh_after: Optional[float] = None) -> T:
+        """
+        Return the cached model, loading it once no matter how many threads miss.
+        
+        Concurrent misses on the same key wait for a single loader call and
+        share its result. A loader exception is raised in every waiting
+        caller and nothing is cached, so the next call tries again.
+        
+        Args:
+            key: Identifier for the model
+            loader: Function called with key to produce the model on a miss
+            ttl: Optional time-to-live in seconds for the loaded model
+            refresh_after: Optional age in seconds after which a hit still
+                returns the cached model but reloads it in the background
+            
+        Returns:
+            The cached or freshly loaded model
+        """
+        with self._lock:
+            value = self._lookup(key)
+            if value is not _MISSING:
+                if self._is_stale(key, refresh_after) and key not in self._inflight:
+                    future = self._inflight[key] = concurrent.futures.Future()
+                    self._background().submit(self._refresh, key, loader, ttl, refresh_after, future)
+                return value
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = concurrent.futures.Future()
+        if not leader:
+            return future.result()
+        return self._load(key, loader, ttl, refresh_after, future)
+    
+    def _load(self, key: str, loader: Callable[[str], T], ttl: Optional[float],
+              refresh_after: Optional[float], future: concurrent.futures.Future) -> T:
+        """Run loader for the single-flight leader and publish the outcome to the waiters."""
+        started = time.perf_counter()
+        try:
+            value = loader(key)
+        except BaseException as exc:
+            if self.stats is not None:
+                self.stats.record_load(key, time.perf_counter() - started, success=False)
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(exc)
+            raise
+        if self.stats is not None:
+            self.stats.record_load(key, time.perf_counter() - started)
+        with self._lock:
+            self._store_loaded(key, value, ttl, refresh_after)
+            del self._inflight[key]
+        future.set_result(value)
+        return value
+    
+    def _refresh(self, key: str, loader: Callable[[str], T], ttl: Optional[float],
+                 refresh_after: Optional[float], future: concurrent.futures.Future) -> None:
+        """Reload a stale entry in the background, keeping the old value if it fails."""
+        try:
+            self._load(key, loader, ttl, refresh_after, future)
+        except Exception as exc:
+            logger.warning(f"Background refresh of {key!r} failed: {exc}")
+    
+    def _background(self) -> concurrent.futures.ThreadPoolExecutor:
+        """Return the executor used for background work, creating it on first use."""
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix="lru-cache")
+        return self._executor
+    
+    async def aget_or_load(self, key: str, loader: Callable[[str], Union[T, Awaitable[T]]],
+                           ttl: Optional[float] = None,
+                           refresh_after: Optional[float] = None) -> T:
+        """
+        Async version of get_or_load() for coroutines running on an event loop.
+        
+        Concurrent misses on the same key within one event loop await a single
+        loader task. Cancelling one waiter does not cancel the shared load.
+        
+        Args:
+            key: Identifier for the model
+            loader: Function or coroutine function called with key on a miss
+            ttl: Optional time-to-live in seconds for the loaded model
+            refresh_after: Optional age in seconds after which a hit still
+                returns the cached model but reloads it in the background
+            
+        Returns:
+            The cached or freshly loaded model
+        """
+        loop = asyncio.get_running_loop()
+        flight = (loop, key)
+        with self._lock:
+            value = self._lookup(key)
+            task = self._ainflight.get(flight)
+            if value is not _MISSING:
+                if self._is_stale(key, refresh_after) and task is None:
+                    task = self._start_aload(flight, loader, ttl, refresh_after)
+                    task.add_done_callback(self._log_refresh_failure)
+                return value
+            if task is None:
+                task = self._start_aload(flight, loader, ttl, refresh_after)
+        return await asyncio.shield(task)
+    
+    def _start_aload(self, flight: tuple, loader: Callable[[str], Union[T, Awaitable[T]]],
+                     ttl: Optional[float], refresh_after: Optional[float]) -> asyncio.Task:
+        """Create and register the shared task loading one key."""
+        task = asyncio.ensure_future(self._aload(flight, loader, ttl, refresh_after))
+        self._ainflight[flight] = task
+        return task
+    
+    async def _aload(self, flight: tuple, loader: Callable[[str], Union[T, Awaitable[T]]],
+                     ttl: Optional[float], refresh_after: Optional[float]) -> T:
+        """Run loader once and cache its result; exceptions reach every awaiting caller."""
+        key = flight[1]
+        started = time.perf_counter()
+        try:
+            try:
+                value = loader(key)
+                if inspect.isawaitable(value):
+                    value = await value
+            except BaseException:
+                if self.stats is not None:
+                    self.stats.record_load(key, time.perf_counter() - started, success=False)
+                raise
+            if self.stats is not None:
+                self.stats.record_load(key, time.perf_counter() - started)
+            with self._lock:
+                self._store_loaded(key, value, ttl, refresh_after)
+            return value
+        finally:
+            with self._lock:
+                self._ainflight.pop(flight, None)
+    
+    @staticmethod
+    def _log_refresh_failure(task: asyncio.Task) -> None:
+        """Log (and thereby retrieve) the error of a background async refresh."""
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background refresh failed: {task.exception()}")
+    
+    def invalidate(self, key: str) -> bool:
+        """
+        Remove a model from the cache.
+        
+        Args:
+            key: Identifier for the model
+            
+        Returns:
+            True if the model was cached, False otherwise
+        """
+        if key not in self.cache:
+            return False
+        self._remove(key, RemovalCause.EXPLICIT)
+        return True
+    
+    def purge_expired(self) -> int:
+        """
+        Drop every expired entry, visiting only the timer buckets that are due.
+        
+        Returns:
+            Number of entries removed
+        """
+        if not self._expires:
+            return 0
+        now = self._clock()
+        removed = 0
+        for key in self._wheel.advance(now):
+            deadline = self._expires.get(key)
+            if deadline is None:
+                continue
+            if deadline <= now:
+                self._remove(key, RemovalCause.EXPIRED)
+                removed += 1
+            else:
+                self._wheel.schedule(key, deadline)
+        return removed
+    
+    def _purge_exact(self) -> None:
+        """
+        Drop expired entries to the exact deadline, not just to the last timer tick.
+        
+        purge_expired() releases whole ticks, so entries due within the tick
+        that is running would still be listed although get() no longer
+        returns them; this also checks the keys due on the next tick.
+        """
+        self.purge_expired()
+        if not self._expires:
+            return
+        now = self._clock()
+        for key in self._wheel.upcoming():
+            if self._expires[key] <= now:
+                self._remove(key, RemovalCause.EXPIRED)
+    
+    @property
+    def weight(self) -> int:
+        """Total weight of all entries (the item count when no weigher is set)."""
+        if self.weigher is None:
+            return len(self.cache)
+        return self._total_weight
     
     def __len__(self) -> int:
-        """Return the number of items in the cache."""
+        """Return the number of items in the cache, leaving out expired ones."""
+        if self._expires:
+            self._purge_exact()
         return len(self.cache)
     
     def clear(self) -> None:
         """Clear all items from the cache."""
+        if self._listeners:
+            for key, value in self.cache.items():
+                if type(value) is not _ColdValue:
+                    self._notify(key, value, RemovalCause.EXPLICIT)
         self.cache.clear()
+        self._weights.clear()
+        self._total_weight = 0
+        self._expires.clear()
+        self._wheel = None
+        self._loaded_at.clear()
+        self._cold = 0
     
     def keys(self):
         """Return all keys in the cache, ordered from least to most recently used."""
+        if self._expires:
+            self._purge_exact()
         return self.cache.keys()
     
     def values(self):
         """Return all values in the cache, ordered from least to most recently used."""
+        if self._expires:
+            self._purge_exact()
+        if self._cold:
+            self._thaw_all()
         return self.cache.values()
     
     def items(self):
         """Return all (key, value) pairs in the cache, ordered from least to most recently used."""
+        if self._expires:
+            self._purge_exact()
+        if self._cold:
+            self._thaw_all()
         return self.cache.items()
+    
+    def save_snapshot(self, path: str, serializer: Any = None) -> int:
+        """
+        Write the cache's recency order, and optionally its values, to a snapshot file.
+        
+        The file is columnar: a header, then the key lengths (in characters),
+        the UTF-8 keys, the remaining TTLs if any entry has one and, with a
+        serializer, the value lengths and values. Keys must be strings.
+        It is written to a temporary file and renamed, so a crash never
+        leaves a truncated snapshot behind.
+        
+        Args:
+            path: Destination file
+            serializer: Optional object with dumps() returning bytes or str (such
+                as pickle or json); without it only keys are saved
+            
+        Returns:
+            Number of entries written
+        """
+        with self._lock:
+            if self._expires:
+                self.purge_expired()
+            now = self._clock()
+            entries = list(self.cache.items())
+            deadlines = [self._expires.get(key) for key, _ in entries] if self._expires else None
+        
+        key_lengths = array('I', [len(key) for key, _ in entries])
+        key_blob = "".join([key for key, _ in entries]).encode()
+        flags = 0
+        ttls = array('d')
+        if deadlines is not None:
+            flags |= _SNAPSHOT_TTLS
+            ttls.extend(math.nan if deadline is None else deadline - now for deadline in deadlines)
+        value_lengths, blobs = array('Q'), []
+        if serializer is not None:
+            flags |= _SNAPSHOT_VALUES
+            for _, value in entries:
+                if type(value) is _ColdValue:
+                    value = value.thaw(value.arg)
+                blob = serializer.dumps(value)
+                if isinstance(blob, str):  # e.g. the json module
+                    blob = blob.encode()
+                blobs.append(blob)
+                value_lengths.append(len(blob))
+        
+        temporary = f"{path}.tmp"
+        with open(temporary, 'wb') as f:
+            f.write(_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, flags, len(entries),
+                                          len(key_blob), sum(value_lengths)))
+            f.write(key_lengths.tobytes())
+            f.write(key_blob)
+            f.write(ttls.tobytes())
+            if flags & _SNAPSHOT_VALUES:
+                f.write(value_lengths.tobytes())
+                f.write(b"".join(blobs))
+        os.replace(temporary, path)
+        return len(entries)
+    
+    def load_snapshot(self, path: str, serializer: Any = None,
+                      loader: Optional[Callable[[str], T]] = None,
+                      warm: str = 'eager') -> int:
+        """
+        Restore entries from a snapshot, preserving their recency order.
+        
+        Values come from the snapshot when it has them and a serializer is
+        given, otherwise from loader(key). Entries whose TTL ran out are
+        skipped, and when the snapshot is larger than the capacity only the
+        most recently used entries are kept.
+        
+        Args:
+            path: Snapshot written by save_snapshot()
+            serializer: Object with loads() accepting bytes, for snapshots that carry values
+            loader: Function producing the value of a key, for key-only restores
+            warm: 'eager' to materialize every value now, 'lazy' to do it on
+                first access, or 'background' to do it on a background thread
+                
+        Returns:
+            Number of entries restored
+        """
+        if warm not in ('eager', 'lazy', 'background'):
+            raise ValueError(f"warm must be 'eager', 'lazy' or 'background', got {warm!r}")
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, flags, count, key_bytes, value_bytes = _SNAPSHOT_HEADER.unpack_from(data, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not an LRUCache snapshot")
+        has_values = bool(flags & _SNAPSHOT_VALUES) and serializer is not None
+        if not has_values and loader is None:
+            raise ValueError("restoring values needs a serializer for a snapshot with values, or a loader")
+        
+        view = memoryview(data)
+        offset = _SNAPSHOT_HEADER.size
+        key_lengths = array('I')
+        key_lengths.frombytes(view[offset:offset + key_lengths.itemsize * count])
+        offset += key_lengths.itemsize * count
+        key_text = str(view[offset:offset + key_bytes], 'utf-8')
+        offset += key_bytes
+        ttls = array('d')
+        if flags & _SNAPSHOT_TTLS:
+            ttls.frombytes(view[offset:offset + 8 * count])
+            offset += 8 * count
+        value_lengths = array('Q')
+        if flags & _SNAPSHOT_VALUES:
+            value_lengths.frombytes(view[offset:offset + 8 * count])
+            offset += 8 * count
+        
+        # Entries are stored least recently used first; keep the newest that fit
+        first = max(0, count - self.capacity)
+        key_offset = sum(key_lengths[:first])
+        value_offset = offset + sum(value_lengths[:first])
+        lazy = warm != 'eager' and self.weigher is None
+        thaw = serializer.loads if has_values else loader
+        restored = 0
+        with self._lock:
+            # Make room up front so the restored entries become the most recent ones
+            while self.cache and len(self.cache) + count - first > self.capacity:
+                self._remove(next(iter(self.cache)), RemovalCause.SIZE)
+            cache = self.cache
+            for index in range(first, count):
+                key_end = key_offset + key_lengths[index]
+                key = key_text[key_offset:key_end]
+                key_offset = key_end
+                if flags & _SNAPSHOT_VALUES:
+                    value_end = value_offset + value_lengths[index]
+                    arg = bytes(view[value_offset:value_end]) if has_values else key
+                    value_offset = value_end
+                else:
+                    arg = key
+                ttl = ttls[index] if ttls else None
+                if ttl != ttl:  # NaN: the entry has no TTL
+                    ttl = None
+                elif ttl is not None and ttl <= 0:
+                    continue
+                if self.weigher is not None:
+                    self.put(key, thaw(arg), ttl)
+                else:
+                    if key in cache:
+                        previous = self._remove(key, RemovalCause.REPLACED)
+                        if type(previous) is not _ColdValue:
+                            self._notify(key, previous, RemovalCause.REPLACED)
+                    if lazy:
+                        cache[key] = _ColdValue(thaw, arg)
+                        self._cold += 1
+                    else:
+                        cache[key] = thaw(arg)
+                    if ttl is not None:
+                        self._set_deadline(key, ttl)
+                restored += 1
+        if warm == 'background' and self._cold:
+            threading.Thread(target=self._warm_in_background, name="lru-cache-warm",
+                             daemon=True).start()
+        return restored
+    
+    def _warm_in_background(self) -> None:
+        """Materialize restored values one at a time, most recently used first."""
+        with self._lock:
+            keys = list(reversed(self.cache.keys()))
+        for key in keys:
+            with self._lock:
+                if not self._cold:
+                    return
+                value = self.cache.get(key)
+                if type(value) is _ColdValue:
+                    self._thaw(key, value)
+    
+    def start_snapshots(self, path: str, interval: float, serializer: Any = None) -> None:
+        """
+        Save a snapshot every interval seconds on a background thread until stop_snapshots().
+        
+        Args:
+            path: Destination file
+            interval: Seconds between snapshots
+            serializer: Optional object with dumps(); without it only keys are saved
+        """
+        self.stop_snapshots(final=False)
+        stop = self._snapshot_stop = threading.Event()
+        
+        def run():
+            while not stop.wait(interval):
+                try:
+                    self.save_snapshot(path, serializer)
+                except Exception as exc:
+                    logger.error(f"Periodic snapshot to {path} failed: {exc}")
+        
+        self._snapshot_args = (path, serializer)
+        threading.Thread(target=run, name="lru-cache-snapshot", daemon=True).start()
+    
+    def stop_snapshots(self, final: bool = True) -> None:
+        """
+        Stop periodic snapshots, e.g. at shutdown.
+        
+        Args:
+            final: Write one last snapshot before returning
+        """
+        if self._snapshot_stop is None:
+            return
+        self._snapshot_stop.set()
+        self._snapshot_stop = None
+        if final:
+            self.save_snapshot(*self._snapshot_args)
+
+
+class CompactLRUCache(Generic[T]):
+    """
+    LRU Cache for millions of small entries, without OrderedDict's linked nodes.
+    Each entry lives in a numbered slot: a dict maps the key to its slot and
+    the recency list is a pair of integer prev/next arrays indexed by slot.
+    Slots released by invalidate() are reused by the next insertion. With a
+    typecode, values are stored unboxed in an array as well, which is where
+    most of the saving on key -> number caches comes from.
+    """
+    
+    def __init__(self, capacity: int, typecode: Optional[str] = None):
+        """
+        Initialize a new compact LRU Cache with specified capacity.
+        
+        Args:
+            capacity: Maximum number of entries to store in the cache
+            typecode: Optional array typecode (e.g. 'd' or 'q') for numeric values
+        """
+        self.capacity = max(1, capacity)  # Ensure capacity is at least 1
+        self.typecode = typecode
+        self._links = 'i' if self.capacity < 2 ** 31 else 'q'
+        self._empty = array(typecode, [0])[0] if typecode else None  # Filler of unused slots
+        self.clear()
+    
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        self._slots: Dict[str, int] = {}  # key -> slot
+        self._keys: list = []  # slot -> key, needed to evict by slot
+        self._values = array(self.typecode) if self.typecode else []
+        self._prev = array(self._links)
+        self._next = array(self._links)
+        self._head = -1  # Least recently used slot
+        self._tail = -1  # Most recently used slot
+        self._free: list = []  # Slots released by invalidate()
+    
+    def _unlink(self, slot: int) -> None:
+        """Detach slot from the recency list."""
+        prev, nxt = self._prev[slot], self._next[slot]
+        if prev < 0:
+            self._head = nxt
+        else:
+            self._next[prev] = nxt
+        if nxt < 0:
+            self._tail = prev
+        else:
+            self._prev[nxt] = prev
+    
+    def _append(self, slot: int) -> None:
+        """Link slot in as the most recently used entry."""
+        tail = self._tail
+        self._prev[slot] = tail
+        self._next[slot] = -1
+        if tail < 0:
+            self._head = slot
+        else:
+            self._next[tail] = slot
+        self._tail = slot
+    
+    def get(self, key: str) -> Optional[T]:
+        """
+        Retrieve a value from the cache and mark it as recently used.
+        
+        Args:
+            key: Identifier for the entry
+            
+        Returns:
+            The value if found, None otherwise
+        """
+        slot = self._slots.get(key)
+        if slot is None:
+            return None
+        if slot != self._tail:
+            # Inlined _unlink() + _append(): slot is not the tail, so it has a successor
+            prev, nxt = self._prev, self._next
+            before, after = prev[slot], nxt[slot]
+            if before < 0:
+                self._head = after
+            else:
+                nxt[before] = after
+            prev[after] = before
+            tail = self._tail
+            nxt[tail] = slot
+            prev[slot] = tail
+            nxt[slot] = -1
+            self._tail = slot
+        return self._values[slot]
+    
+    def put(self, key: str, value: T) -> bool:
+        """
+        Add or update an entry in the cache.
+        
+        Args:
+            key: Identifier for the entry
+            value: The value to store
+            
+        Returns:
+            True, the entry is always stored
+        """
+        slot = self._slots.get(key)
+        if slot is not None:
+            self._values[slot] = value
+            if slot != self._tail:
+                self._unlink(slot)
+                self._append(slot)
+            return True
+        if len(self._slots) >= self.capacity:
+            # Reuse the least recently used slot in place
+            slot = self._head
+            del self._slots[self._keys[slot]]
+            self._unlink(slot)
+            self._keys[slot] = key
+            self._values[slot] = value
+        elif self._free:
+            slot = self._free.pop()
+            self._keys[slot] = key
+            self._values[slot] = value
+        else:
+            slot = len(self._keys)
+            self._keys.append(key)
+            self._values.append(value)
+            self._prev.append(-1)
+            self._next.append(-1)
+        self._slots[key] = slot
+        self._append(slot)
+        return True
+    
+    def invalidate(self, key: str) -> bool:
+        """Remove an entry, returning True if it was cached."""
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return False
+        self._unlink(slot)
+        self._keys[slot] = None
+        self._values[slot] = self._empty
+        self._free.append(slot)
+        return True
+    
+    def __len__(self) -> int:
+        """Return the current number of entries in the cache."""
+        return len(self._slots)
+    
+    def _order(self):
+        """Yield the occupied slots from least to most recently used."""
+        slot, nxt = self._head, self._next
+        while slot >= 0:
+            yield slot
+            slot = nxt[slot]
+    
+    def keys(self):
+        """Return the keys ordered from least to most recently used."""
+        return [self._keys[slot] for slot in self._order()]
+    
+    def values(self):
+        """Return the values ordered from least to most recently used."""
+        return [self._values[slot] for slot in self._order()]
+    
+    def items(self):
+        """Return the (key, value) pairs ordered from least to most recently used."""
+        return [(self._keys[slot], self._values[slot]) for slot in self._order()]
+
+
+class ConcurrentLRUCache(Generic[T]):
+    """
+    Thread-safe LRU Cache split into independently locked segments.
+    Keys are hash-partitioned across several LRUCache segments, each guarded
+    by its own lock, so threads working on different keys rarely contend.
+    Recency is tracked per segment: a full segment evicts its own least
+    recently used entry, which keeps the total size within capacity.
+    """
+    
+    def __init__(self, capacity: int, segments: int = 16,
+                 default_ttl: Optional[float] = None,
+                 stats: Optional[CacheStats] = None):
+        """
+        Initialize a new segmented LRU Cache.
+        
+        Args:
+            capacity: Maximum number of models to store across all segments
+            segments: Number of independently locked segments
+            default_ttl: Optional time-to-live in seconds for entries put without one
+            stats: Optional CacheStats shared by all segments
+        """
+        self.capacity = max(1, capacity)
+        segments = max(1, min(segments, self.capacity))
+        # Spread the capacity so the segment capacities sum to exactly capacity
+        base, extra = divmod(self.capacity, segments)
+        self.stats = stats
+        self._segments = [LRUCache(base + (1 if i < extra else 0), default_ttl=default_ttl,
+                                   stats=stats)
+                          for i in range(segments)]
+        # Each segment's own lock also guards its single-flight loads
+        self._locks = [segment._lock for segment in self._segments]
+        self._releaser = None  # Listener executor shared by all segments
+    
+    def _index(self, key: str) -> int:
+        """Return the index of the segment responsible for key."""
+        return hash(key) % len(self._segments)
+    
+    def get(self, key: str) -> Optional[T]:
+        """
+        Retrieve a model from the cache and mark it as recently used.
+        
+        Args:
+            key: Identifier for the model
+            
+        Returns:
+            The model if found, None otherwise
+        """
+        index = self._index(key)
+        with self._locks[index]:
+            return self._segments[index].get(key)
+    
+    def put(self, key: str, value: T, ttl: Optional[float] = None) -> bool:
+        """
+        Add or update a model in the cache.
+        
+        Args:
+            key: Identifier for the model
+            value: The model to store
+            ttl: Optional time-to-live in seconds, overriding default_ttl
+            
+        Returns:
+            True if the model was stored
+        """
+        index = self._index(key)
+        with self._locks[index]:
+            return self._segments[index].put(key, value, ttl)
+    
+    def invalidate(self, key: str) -> bool:
+        """Remove a model from the cache, returning True if it was cached."""
+        index = self._index(key)
+        with self._locks[index]:
+            return self._segments[index].invalidate(key)
+    
+    def get_or_load(self, key: str, loader: Callable[[str], T],
+                    ttl: Optional[float] = None,
+                    refresh_after: Optional[float] = None) -> T:
+        """Return the cached model, loading it once on a miss; see LRUCache.get_or_load()."""
+        return self._segments[self._index(key)].get_or_load(key, loader, ttl, refresh_after)
+    
+    async def aget_or_load(self, key: str, loader: Callable[[str], Union[T, Awaitable[T]]],
+                           ttl: Optional[float] = None,
+                           refresh_after: Optional[float] = None) -> T:
+        """Async version of get_or_load(); see LRUCache.aget_or_load()."""
+        return await self._segments[self._index(key)].aget_or_load(key, loader, ttl, refresh_after)
+    
+    def add_removal_listener(self, listener: Callable[[str, T, str], None],
+                             executor: Optional[concurrent.futures.Executor] = None) -> None:
+        """
+        Call listener(key, value, cause) in the background on every removal; see LRUCache.
+        
+        By default all segments share a single release thread, so the cache
+        starts one thread no matter how many segments it has and removals
+        are released in the order they happened across segments.
+        """
+        if executor is None:
+            if self._releaser is None:
+                self._releaser = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="lru-cache-release")
+            executor = self._releaser
+        for lock, segment in zip(self._locks, self._segments):
+            with lock:
+                segment.add_removal_listener(listener, executor)
+    
+    def remove_removal_listener(self, listener: Callable[[str, T, str], None]) -> None:
+        """Stop calling listener for future removals."""
+        for lock, segment in zip(self._locks, self._segments):
+            with lock:
+                segment.remove_removal_listener(listener)
+    
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the pending removal listener calls of every segment."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for segment in self._segments:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not segment.drain(remaining):
+                return False
+        return True
+    
+    def purge_expired(self) -> int:
+        """Drop every expired entry from all segments and return how many were removed."""
+        removed = 0
+        for lock, segment in zip(self._locks, self._segments):
+            with lock:
+                removed += segment.purge_expired()
+        return removed
+    
+    def __len__(self) -> int:
+        """Return the number of items in the cache."""
+        total = 0
+        for lock, segment in zip(self._locks, self._segments):
+            with lock:
+                total += len(segment)
+        return total
+    
+    def clear(self) -> None:
+        """Clear all items from the cache."""
+        for lock, segment in zip(self._locks, self._segments):
+            with lock:
+                segment.clear()
+    
+    def keys(self):
+        """Return a snapshot of all keys, least to most recently used within each segment."""
+        return [key for key, _ in self.items()]
+    
+    def values(self):
+        """Return a snapshot of all values, least to most recently used within each segment."""
+        return [value for _, value in self.items()]
+    
+    def items(self):
+        """Return a snapshot of all (key, value) pairs, least to most recently used within each segment."""
+        result = []
+        for lock, segment in zip(self._locks, self._segments):
+            with lock:
+                result.extend(segment.items())
+        return result
+
+
+class _NamespaceCache(LRUCache[T]):
+    """Namespace of a NamespacedLRUCache, reporting every change in its size to the owner."""
+    
+    def __init__(self, capacity: int, resized: Callable[[int], None], **kwargs):
+        super().__init__(capacity, **kwargs)
+        self._resized = resized
+        self._tracked = True  # Every insertion and removal must be counted
+    
+    def _put_tracked(self, key: str, value: T, ttl: Optional[float]) -> bool:
+        stored = super()._put_tracked(key, value, ttl)
+        if stored:
+            self._resized(1)  # An update was counted as a removal first
+        return stored
+    
+    def _remove(self, key: str, cause: str) -> T:
+        value = super()._remove(key, cause)
+        self._resized(-1)
+        return value
+    
+    def clear(self) -> None:
+        self._resized(-len(self.cache))
+        super().clear()
+
+
+class NamespacedLRUCache(Generic[T]):
+    """
+    LRU Cache whose capacity is shared by namespaces with guaranteed quotas.
+    Every namespace (e.g. one per debate session) is its own LRUCache with a
+    minimum and a maximum share of the total capacity. A namespace may grow
+    past its minimum into capacity nobody else is using; once the cache is
+    full, a put evicts from the namespace furthest above its minimum, so
+    borrowed space is reclaimed first and no namespace ever loses entries
+    below its guaranteed share to another one. If the minimums fill the whole
+    capacity, a put into a namespace with no entry of its own to give up is
+    refused, so the cache never grows past its capacity.
+    
+    The total size and each namespace's excess over its minimum are kept up
+    to date on every change, with namespaces bucketed by excess, so a put
+    costs the same with ten namespaces or ten thousand. Namespaces created
+    on first use by put() are dropped again once their last entry is gone;
+    those created with add_namespace() stay until remove_namespace().
+    """
+    
+    def __init__(self, capacity: int, default_min_share: float = 0.0,
+                 default_max_share: float = 1.0,
+                 default_ttl: Optional[float] = None):
+        """
+        Initialize a new namespaced LRU Cache.
+        
+        Args:
+            capacity: Maximum number of entries across all namespaces
+            default_min_share: Guaranteed share of namespaces created on first use
+            default_max_share: Maximum share of namespaces created on first use
+            default_ttl: Optional time-to-live in seconds for entries put without one
+        """
+        self.capacity = max(1, capacity)
+        self.default_ttl = default_ttl
+        self._defaults = (default_min_share, default_max_share)
+        self._namespaces: Dict[str, LRUCache] = {}
+        self._quotas: Dict[str, tuple] = {}  # namespace -> (min entries, max entries)
+        self._size = 0  # Entries across all namespaces
+        self._reserved = 0  # Sum of the minimums
+        self._excess: Dict[str, int] = {}  # namespace -> entries minus its minimum
+        self._by_excess: Dict[int, set] = {}  # excess -> namespaces with that excess
+        self._top = 0  # Upper bound of the largest excess
+        self._auto = set()  # Namespaces created on first use
+    
+    def add_namespace(self, name: str, min_share: float = 0.0, max_share: float = 1.0) -> None:
+        """
+        Create a namespace or change its quota.
+        
+        Args:
+            name: Name of the namespace
+            min_share: Share of the capacity that other namespaces cannot take away
+            max_share: Share of the capacity the namespace may never exceed
+            
+        Raises:
+            ValueError: If the shares are out of range or the minimums exceed the capacity
+        """
+        self._add_namespace(name, min_share, max_share)
+        self._auto.discard(name)
+    
+    def _add_namespace(self, name: str, min_share: float, max_share: float) -> None:
+        if not 0.0 <= min_share <= max_share <= 1.0:
+            raise ValueError(f"Need 0 <= min_share <= max_share <= 1, got {min_share}, {max_share}")
+        minimum = int(min_share * self.capacity)
+        maximum = max(1, int(max_share * self.capacity))
+        previous = self._quotas.get(name, (0, 0))[0]
+        if self._reserved - previous + minimum > self.capacity:
+            raise ValueError(f"Minimum shares would reserve more than the capacity of {self.capacity}")
+        self._reserved += minimum - previous
+        self._quotas[name] = (minimum, maximum)
+        cache = self._namespaces.get(name)
+        if cache is None:
+            self._namespaces[name] = _NamespaceCache(
+                maximum, lambda delta: self._resize(name, delta),
+                default_ttl=self.default_ttl, stats=CacheStats())
+            self._set_excess(name, -minimum)
+        else:
+            self._set_excess(name, len(cache.cache) - minimum)
+            cache.capacity = maximum
+            while len(cache.cache) > maximum:
+                cache._remove(next(iter(cache.cache)), RemovalCause.SIZE)
+    
+    def remove_namespace(self, name: str) -> None:
+        """Drop a namespace with all its entries and its quota."""
+        cache = self._namespaces.pop(name, None)
+        if cache is None:
+            return
+        self._size -= len(cache.cache)
+        self._reserved -= self._quotas.pop(name)[0]
+        self._by_excess[self._excess.pop(name)].discard(name)
+        self._auto.discard(name)
+    
+    def _namespace(self, name: str) -> LRUCache:
+        cache = self._namespaces.get(name)
+        if cache is None:
+            self._add_namespace(name, *self._defaults)
+            self._auto.add(name)
+            cache = self._namespaces[name]
+        return cache
+    
+    def _set_excess(self, name: str, excess: int) -> None:
+        """Move a namespace to the bucket of its new excess."""
+        old = self._excess.get(name)
+        if old is not None:
+            self._by_excess[old].discard(name)
+        self._excess[name] = excess
+        bucket = self._by_excess.get(excess)
+        if bucket is None:
+            bucket = self._by_excess[excess] = set()
+        bucket.add(name)
+        if excess > self._top:
+            self._top = excess
+    
+    def _resize(self, name: str, delta: int) -> None:
+        """Account for entries added to (delta > 0) or removed from a namespace."""
+        self._size += delta
+        self._set_excess(name, self._excess[name] + delta)
+    
+    def _reclaim(self, name: str) -> None:
+        """Drop a namespace created on first use once it holds no entries."""
+        if name in self._auto and not self._namespaces[name].cache:
+            self.remove_namespace(name)
+    
+    def get(self, namespace: str, key: str) -> Optional[T]:
+        """
+        Retrieve a model from a namespace and mark it as recently used.
+        
+        Args:
+            namespace: Name of the namespace
+            key: Identifier for the model
+            
+        Returns:
+            The model if found and not expired, None otherwise
+        """
+        cache = self._namespaces.get(namespace)
+        if cache is None:
+            return None
+        value = cache.get(key)
+        if value is None:
+            self._reclaim(namespace)  # The lookup may have expired its last entry
+        return value
+    
+    def put(self, namespace: str, key: str, value: T, ttl: Optional[float] = None) -> bool:
+        """
+        Add or update a model in a namespace, reclaiming borrowed space if the cache is full.
+        
+        Args:
+            namespace: Name of the namespace
+            key: Identifier for the model
+            value: The model to store
+            ttl: Optional time-to-live in seconds, overriding default_ttl
+            
+        Returns:
+            True if the model was stored, False if the cache is full and no
+            namespace holds an entry that may be evicted to make room
+        """
+        cache = self._namespace(namespace)
+        if key not in cache.cache and len(cache.cache) < cache.capacity and self._size >= self.capacity:
+            if not self._evict_borrowed(namespace):
+                cache.stats.record_put(key, False, stored=False)
+                self._reclaim(namespace)
+                return False
+        stored = cache.put(key, value, ttl)
+        if not stored:
+            self._reclaim(namespace)
+        return stored
+    
+    def _evict_borrowed(self, namespace: str) -> bool:
+        """
+        Evict one entry from the namespace furthest above its minimum share.
+        
+        Returns:
+            False if nothing may be evicted: every namespace is exactly at its
+            minimum and the inserting one holds no entry of its own to give up
+        """
+        while not self._by_excess.get(self._top):
+            self._top -= 1  # Lowered lazily: buckets only empty one entry at a time
+        victim = namespace
+        if self._excess[namespace] < self._top:
+            victim = next(iter(self._by_excess[self._top]))
+        cache = self._namespaces[victim]
+        if not cache.cache:
+            return False
+        cache._remove(next(iter(cache.cache)), RemovalCause.SIZE)
+        if victim != namespace:
+            self._reclaim(victim)
+        return True
+    
+    def invalidate(self, namespace: str, key: str) -> bool:
+        """Remove a model from a namespace, returning True if it was cached."""
+        cache = self._namespaces.get(namespace)
+        if cache is None or not cache.invalidate(key):
+            return False
+        self._reclaim(namespace)
+        return True
+    
+    def __len__(self) -> int:
+        """Return the number of entries across all namespaces."""
+        return self._size
+    
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Clear one namespace, or every namespace when none is given."""
+        for name in [namespace] if namespace is not None else list(self._namespaces):
+            cache = self._namespaces.get(name)
+            if cache is not None:
+                cache.clear()
+                self._reclaim(name)
+    
+    def namespaces(self):
+        """Return the names of all namespaces."""
+        return list(self._namespaces)
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return per-namespace usage, quota and cache statistics for tuning the shares.
+        
+        Returns:
+            For each namespace, its CacheStats snapshot plus 'size', 'min', 'max'
+            and 'borrowed' (entries held above its minimum share)
+        """
+        result = {}
+        for name, cache in self._namespaces.items():
+            minimum, maximum = self._quotas[name]
+            size = len(cache.cache)
+            result[name] = dict(cache.stats.snapshot(), size=size, min=minimum, max=maximum,
+                                borrowed=max(0, size - minimum))
+        return result
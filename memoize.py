@@ -0,0 +1,161 @@
+"""
+Memoization decorator backed by a bounded LRUCache.
+
+Unlike functools.lru_cache, the cache behind @memoize can be bounded by
+weight as well as by count, expire results after a TTL, record CacheStats
+and drop selected calls by predicate. Arguments that are not hashable as
+they are (lists, dicts, sets, NumPy arrays) are normalized into hashable
+keys tagged with their type, arrays by a hash of their contents.
+"""
+
+import functools
+import hashlib
+import inspect
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from lru_cache import CacheStats, LRUCache
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional here
+    np = None
+
+# Argument types used in keys as they are, without normalization
+_PLAIN_TYPES = frozenset({str, int, float, bool, bytes, complex, type(None)})
+
+
+def _array_key(array: Any) -> Tuple[str, str, tuple, bytes]:
+    """Key of a NumPy array: dtype, shape and a digest of its contents."""
+    if array.dtype.hasobject:
+        raise TypeError("memoize cannot build a key from an object array")
+    digest = hashlib.blake2b(np.ascontiguousarray(array).tobytes(), digest_size=16).digest()
+    return ("ndarray", array.dtype.str, array.shape, digest)
+
+
+def normalize(value: Any) -> Any:
+    """
+    Turn an argument into a hashable value that compares equal for equal arguments.
+
+    Containers become a (type name, contents) pair, recursively: a list or
+    tuple (name, tuple of its items), a set or frozenset (name, frozenset),
+    a dict ('dict', frozenset of its items) and a bytearray or memoryview
+    (name, bytes). The tag keeps containers of different types apart, so
+    [1, 2] and (1, 2), or {1: 2} and {(1, 2)}, never share a key. NumPy
+    arrays become an ('ndarray', dtype, shape, content digest) tuple.
+
+    Raises:
+        TypeError: If value is neither hashable nor normalizable
+    """
+    cls = type(value)
+    if cls in _PLAIN_TYPES:
+        return value
+    if cls is tuple or cls is list:
+        return (cls.__name__, tuple(map(normalize, value)))
+    if cls is dict:
+        return ("dict", frozenset((key, normalize(item)) for key, item in value.items()))
+    if cls is set or cls is frozenset:
+        return (cls.__name__, frozenset(map(normalize, value)))
+    if cls is bytearray or cls is memoryview:
+        return (cls.__name__, bytes(value))
+    if np is not None:
+        if isinstance(value, np.ndarray):
+            return _array_key(value)
+        if isinstance(value, np.generic):
+            return value.item()
+    try:
+        hash(value)
+    except TypeError:
+        raise TypeError(f"memoize cannot build a key from a {cls.__name__} argument") from None
+    return value
+
+
+def make_key(args: tuple, kwargs: Dict[str, Any], typed: bool = False) -> tuple:
+    """
+    Build the cache key of a call.
+
+    Args:
+        args: Positional arguments of the call
+        kwargs: Keyword arguments of the call, order independent
+        typed: Tell apart arguments of different types that compare equal (1 and 1.0)
+
+    Returns:
+        (normalized args, sorted normalized kwargs) plus the argument types if typed
+    """
+    key_args = tuple(map(normalize, args))
+    key_kwargs = tuple((name, normalize(kwargs[name])) for name in sorted(kwargs)) if kwargs else ()
+    if typed:
+        types = tuple(type(arg) for arg in args) + tuple(type(kwargs[name]) for name in sorted(kwargs))
+        return key_args, key_kwargs, types
+    return key_args, key_kwargs
+
+
+def memoize(maxsize: int = 1024, *, ttl: Optional[float] = None, typed: bool = False,
+            weigher: Optional[Callable[[tuple, Any], int]] = None,
+            max_weight: Optional[int] = None,
+            stats: Optional[CacheStats] = None) -> Callable[[Callable], Callable]:
+    """
+    Cache the results of a sync or async function in an LRUCache.
+
+    Concurrent calls with the same arguments run the function once and share
+    its result (LRUCache.get_or_load / aget_or_load). Exceptions are not
+    cached. The decorated function gains:
+
+        cache: The underlying LRUCache
+        cache_key(*args, **kwargs): The key a call is stored under
+        invalidate(*args, **kwargs): Drop one call, True if it was cached
+        invalidate_if(predicate): Drop every call for which
+            predicate(args, kwargs) is true, with args and kwargs normalized
+            as in normalize(); returns the number dropped
+        cache_clear(): Drop every call
+
+    Args:
+        maxsize: Maximum number of cached calls
+        ttl: Optional time-to-live in seconds of each result
+        typed: Cache arguments of different types separately (1 and 1.0)
+        weigher: Optional function of (key, result) returning its weight, e.g. bytes
+        max_weight: Optional budget for the total weight of the cached results
+        stats: Optional CacheStats recording hits, misses and load times
+
+    Returns:
+        The decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        cache = LRUCache(maxsize, weigher=weigher, max_weight=max_weight, stats=stats)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                key = make_key(args, kwargs, typed)
+                return await cache.aget_or_load(key, lambda _: func(*args, **kwargs), ttl)
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                key = make_key(args, kwargs, typed)
+                return cache.get_or_load(key, lambda _: func(*args, **kwargs), ttl)
+
+        def cache_key(*args, **kwargs) -> tuple:
+            return make_key(args, kwargs, typed)
+
+        def invalidate(*args, **kwargs) -> bool:
+            with cache._lock:
+                return cache.invalidate(make_key(args, kwargs, typed))
+
+        def invalidate_if(predicate: Callable[[tuple, Dict[str, Any]], bool]) -> int:
+            with cache._lock:
+                doomed = [key for key in list(cache.cache) if predicate(key[0], dict(key[1]))]
+                for key in doomed:
+                    cache.invalidate(key)
+            return len(doomed)
+
+        def cache_clear() -> None:
+            with cache._lock:
+                cache.clear()
+
+        wrapper.cache = cache
+        wrapper.cache_key = cache_key
+        wrapper.invalidate = invalidate
+        wrapper.invalidate_if = invalidate_if
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
@@ -1,29 +1,367 @@
-def merge_sort(arr):
-    if len(arr) > 1:
-        mid = len(arr)//2
-        left = arr[:mid]
-        right = arr[mid:]
-        merge_sort(left)
-        merge_sort(right)
-        i = j = k = 0
-        # Mescla as duas metades
-        while i < len(left) and j < len(right):
-            if left[i] < right[j]:
-                arr[k] = left[i]
-                i += 1
+import copy
+import os
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # pragma: no cover - plataformas sem memória compartilhada
+    shared_memory = None
+
+# Tamanho mínimo de uma sequência ordenada antes das intercalações; trechos
+# menores são completados com inserção binária, mais rápida em listas curtas
+MIN_RUN = 32
+
+# Abaixo deste tamanho parallel_merge_sort ordena no próprio processo: criar
+# processos e segmentos de memória compartilhada custaria mais que o ganho
+PARALLEL_THRESHOLD = 1 << 18
+
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+def merge_sort(arr, key=None, reverse=False):
+    """
+    Ordena arr no lugar, de forma estável, como list.sort(key=key, reverse=reverse).
+
+    Aceita listas e sequências mutáveis com fatias, como array.array e arrays NumPy.
+
+    Merge sort iterativo de baixo para cima: detecta as sequências já ordenadas
+    da entrada (as estritamente decrescentes são invertidas), completa as curtas
+    até MIN_RUN com inserção binária e intercala pares de sequências alternando
+    entre arr e um único buffer auxiliar. Entradas quase ordenadas custam perto
+    de O(n). key é calculada uma única vez por elemento.
+    """
+    n = len(arr)
+    if n < 2:
+        return
+    if reverse:
+        # Ordem decrescente estável: inverte, ordena crescente e inverte de novo.
+        # Por fatias, e não com reverse(), que arrays NumPy não têm
+        arr[:] = arr[::-1]
+    if key is None:
+        keys, values = arr, None
+    else:
+        keys, values = [key(item) for item in arr], arr
+    bounds = _find_runs(keys, values, n)
+    src_keys, src_values = keys, values
+    # Buffers auxiliares do mesmo tipo da entrada: array.array e arrays NumPy
+    # só aceitam atribuição de fatias vindas de objetos do seu próprio tipo
+    dst_keys = copy.copy(keys)
+    dst_values = None if values is None else copy.copy(values)
+    # Intercala sequências vizinhas, dobrando o tamanho a cada passada
+    while len(bounds) > 2:
+        merged = [0]
+        last = len(bounds) - 1
+        for index in range(0, last - 1, 2):
+            lo, mid, hi = bounds[index], bounds[index + 1], bounds[index + 2]
+            _merge(src_keys, src_values, dst_keys, dst_values, lo, mid, hi)
+            merged.append(hi)
+        if last % 2:
+            # Sequência sem par nesta passada: só é copiada
+            lo = bounds[-2]
+            dst_keys[lo:n] = src_keys[lo:n]
+            if values is not None:
+                dst_values[lo:n] = src_values[lo:n]
+            merged.append(n)
+        bounds = merged
+        src_keys, dst_keys = dst_keys, src_keys
+        src_values, dst_values = dst_values, src_values
+    if values is None:
+        if src_keys is not arr:
+            arr[:] = src_keys
+    elif src_values is not arr:
+        arr[:] = src_values
+    if reverse:
+        arr[:] = arr[::-1]
+
+
+def _find_runs(keys, values, n):
+    # Devolve os limites [0, fim da 1ª sequência, ..., n] após preparar cada sequência
+    bounds = [0]
+    start = 0
+    while start < n:
+        end = start + 1
+        if end < n:
+            if keys[end] < keys[end - 1]:
+                # Estritamente decrescente (preserva a estabilidade ao inverter)
+                while end + 1 < n and keys[end + 1] < keys[end]:
+                    end += 1
+                end += 1
+                keys[start:end] = keys[start:end][::-1]
+                if values is not None:
+                    values[start:end] = values[start:end][::-1]
             else:
-                arr[k] = right[j]
+                while end < n and not keys[end] < keys[end - 1]:
+                    end += 1
+        if end - start < MIN_RUN:
+            stop = min(n, start + MIN_RUN)
+            _insertion_sort(keys, values, start, end, stop)
+            end = stop
+        bounds.append(end)
+        start = end
+    return bounds
+
+
+def _insertion_sort(keys, values, lo, sorted_end, hi):
+    # Inserção binária de keys[sorted_end:hi] em keys[lo:sorted_end], já ordenado
+    for i in range(sorted_end, hi):
+        item = keys[i]
+        pos = bisect_right(keys, item, lo, i)  # Depois dos iguais: estável
+        if pos < i:
+            keys[pos + 1:i + 1] = keys[pos:i]
+            keys[pos] = item
+            if values is not None:
+                value = values[i]
+                values[pos + 1:i + 1] = values[pos:i]
+                values[pos] = value
+
+
+def _merge(src_keys, src_values, dst_keys, dst_values, lo, mid, hi):
+    # Intercala src[lo:mid] e src[mid:hi] em dst[lo:hi]
+    if not src_keys[mid] < src_keys[mid - 1]:
+        # Já estão em ordem: cópia direta
+        dst_keys[lo:hi] = src_keys[lo:hi]
+        if src_values is not None:
+            dst_values[lo:hi] = src_values[lo:hi]
+        return
+    i, j, k = lo, mid, lo
+    left = src_keys[i]
+    right = src_keys[j]
+    if src_values is None:
+        while True:
+            if right < left:  # Empate fica com a esquerda: estável
+                dst_keys[k] = right
+                j += 1
+                k += 1
+                if j == hi:
+                    break
+                right = src_keys[j]
+            else:
+                dst_keys[k] = left
+                i += 1
+                k += 1
+                if i == mid:
+                    break
+                left = src_keys[i]
+    else:
+        while True:
+            if right < left:
+                dst_keys[k] = right
+                dst_values[k] = src_values[j]
                 j += 1
-            k += 1
-        # Coleta os elementos restantes, se houver
-        while i < len(left):
-            arr[k] = left[i]
-            i += 1
-            k += 1
-        while j < len(right):
-            arr[k] = right[j]
-            j += 1
-            k += 1
+                k += 1
+                if j == hi:
+                    break
+                right = src_keys[j]
+            else:
+                dst_keys[k] = left
+                dst_values[k] = src_values[i]
+                i += 1
+                k += 1
+                if i == mid:
+                    break
+                left = src_keys[i]
+    # Coleta os elementos restantes de um dos lados
+    if i < mid:
+        dst_keys[k:hi] = src_keys[i:mid]
+        if src_values is not None:
+            dst_values[k:hi] = src_values[i:mid]
+    else:
+        dst_keys[k:hi] = src_keys[j:hi]
+        if src_values is not None:
+            dst_values[k:hi] = src_values[j:hi]
+
+
+def parallel_merge_sort(data, workers=None, threshold=PARALLEL_THRESHOLD):
+    """
+    Ordena no lugar uma sequência numérica grande usando vários processos.
+
+    Os números são copiados uma vez para um segmento de
+    multiprocessing.shared_memory, dividido em um bloco por processo; cada
+    processo ordena o seu bloco direto no segmento, sem serializar os dados.
+    Depois, rodadas de intercalação juntam os blocos aos pares, em paralelo:
+    cada par é cortado em fatias de saída por co-ranking (busca binária da
+    posição de corte em cada lado), e cada fatia é intercalada por um processo
+    num segundo segmento. Os segmentos se alternam a cada rodada.
+
+    Listas só de float, listas só de int de 64 bits e objetos com buffer
+    numérico contíguo (array.array, arrays NumPy) vão para os processos.
+    Outras listas (tipos misturados, ints maiores, strings), outras sequências
+    mutáveis (com merge_sort), entradas abaixo de threshold elementos ou um só
+    worker são ordenadas no próprio processo; se o sistema não oferecer
+    memória compartilhada ou processos, usa threads sobre buffers locais.
+    """
+    n = len(data)
+    workers = workers or os.cpu_count() or 1
+    typecode = _typecode(data)
+    if typecode is None or n < threshold or workers < 2 or n < 2 * workers:
+        _sort_serial(data, typecode)
+        return
+    source = array(typecode, data) if isinstance(data, list) else data
+    nbytes = n * array(typecode).itemsize
+    segments = []
+    try:
+        if shared_memory is None:
+            raise OSError("multiprocessing.shared_memory indisponível")
+        for _ in range(2):
+            segments.append(shared_memory.SharedMemory(create=True, size=nbytes))
+    except OSError:
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+        _thread_sort(data, source, typecode, n, workers)
+        return
+    try:
+        segments[0].buf[:nbytes] = memoryview(source).cast('B')
+        names = [segment.name for segment in segments]
+        try:
+            executor = ProcessPoolExecutor(workers)
+        except (NotImplementedError, ImportError, OSError):
+            executor = None  # Sem processos: cai para threads abaixo
+        if executor is not None:
+            with executor:
+                result = _parallel_sort(executor, names, typecode, n, workers)
+            _write_back(data, segments[result].buf[:nbytes], typecode)
+    finally:
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+    if executor is None:
+        _thread_sort(data, source, typecode, n, workers)
+
+
+def _thread_sort(data, source, typecode, n, workers):
+    # Mesmo algoritmo em threads, sobre buffers locais: list.sort() e as cópias
+    # de fatias soltam pouco o GIL, mas nada depende de processos
+    raw = memoryview(source).cast('B')
+    buffers = [bytearray(raw), bytearray(len(raw))]
+    with ThreadPoolExecutor(workers) as executor:
+        result = _parallel_sort(executor, buffers, typecode, n, workers)
+    _write_back(data, buffers[result], typecode)
+
+
+def _typecode(data):
+    # Typecode do array equivalente: o formato do buffer, 'd' para listas só de
+    # float e 'q' para listas só de int que cabem em 64 bits. None (mistura de
+    # tipos, ints maiores, strings, sequências que não são list nem buffer...)
+    # ordena no próprio processo, sem conversão
+    if isinstance(data, list):
+        if all(type(item) is float for item in data):
+            return 'd'
+        if all(type(item) is int and _INT64_MIN <= item <= _INT64_MAX for item in data):
+            return 'q'
+        return None
+    try:
+        view = memoryview(data)
+    except TypeError:
+        return None
+    if view.ndim != 1 or not view.c_contiguous or view.format.lstrip('@=') not in 'bBhHiIlLqQfd':
+        raise TypeError(f"parallel_merge_sort() precisa de um buffer numérico 1-D, não {view.format!r}")
+    return view.format.lstrip('@=')
+
+
+def _sort_serial(data, typecode):
+    if isinstance(data, list):
+        data.sort()
+    elif typecode is None:
+        merge_sort(data)
+    else:
+        view = memoryview(data).cast('B').cast(typecode)
+        view[:] = array(typecode, sorted(view))
+
+
+def _write_back(data, buffer, typecode):
+    view = memoryview(buffer).cast('B').cast(typecode)
+    if isinstance(data, list):
+        data[:] = view.tolist()
+    else:
+        memoryview(data).cast('B')[:] = view.cast('B')
+    view.release()
+
+
+def _parallel_sort(executor, buffers, typecode, n, workers):
+    # Devolve o índice do buffer (0 ou 1) que termina com o resultado
+    step = -(-n // workers)
+    runs = [(lo, min(n, lo + step)) for lo in range(0, n, step)]
+    for future in [executor.submit(_sort_chunk, buffers[0], typecode, lo, hi) for lo, hi in runs]:
+        future.result()
+    src = 0
+    while len(runs) > 1:
+        pairs = len(runs) // 2
+        parts = max(1, workers // pairs)
+        tasks = []
+        merged = []
+        with _attached(buffers[src], typecode) as view:
+            for index in range(0, len(runs) - 1, 2):
+                (a_lo, a_hi), (b_lo, b_hi) = runs[index], runs[index + 1]
+                total = b_hi - a_lo
+                cuts = [(total * k) // parts for k in range(parts + 1)]
+                ranks = [_co_rank(view, a_lo, a_hi, b_lo, b_hi, r) for r in cuts]
+                for k in range(parts):
+                    i0, i1 = ranks[k], ranks[k + 1]
+                    j0, j1 = cuts[k] - i0, cuts[k + 1] - i1
+                    tasks.append((a_lo + i0, a_lo + i1, b_lo + j0, b_lo + j1, a_lo + cuts[k]))
+                merged.append((a_lo, b_hi))
+        if len(runs) % 2:
+            # Bloco sem par nesta rodada: só é copiado para o outro buffer
+            lo, hi = runs[-1]
+            tasks.append((lo, hi, hi, hi, lo))
+            merged.append(runs[-1])
+        futures = [executor.submit(_merge_range, buffers[src], buffers[1 - src], typecode, *task)
+                   for task in tasks]
+        for future in futures:
+            future.result()
+        runs = merged
+        src = 1 - src
+    return src
+
+
+def _co_rank(view, a_lo, a_hi, b_lo, b_hi, rank):
+    # Quantos dos primeiros rank elementos da intercalação estável vêm de A
+    lo = max(0, rank - (b_hi - b_lo))
+    hi = min(rank, a_hi - a_lo)
+    while lo < hi:
+        i = (lo + hi) // 2
+        if view[a_lo + i] <= view[b_lo + rank - i - 1]:  # Empate fica com A: estável
+            lo = i + 1
+        else:
+            hi = i
+    return lo
+
+
+class _attached:
+    # Abre um buffer de trabalho como memoryview tipada: nome de segmento
+    # compartilhado (processos) ou bytearray local (threads)
+    def __init__(self, buffer, typecode):
+        self._segment = shared_memory.SharedMemory(name=buffer) if isinstance(buffer, str) else None
+        raw = self._segment.buf if self._segment is not None else buffer
+        self.view = memoryview(raw).cast('B').cast(typecode)
+
+    def __enter__(self):
+        return self.view
+
+    def __exit__(self, *exc):
+        self.view.release()
+        if self._segment is not None:
+            self._segment.close()
+
+
+def _sort_chunk(buffer, typecode, lo, hi):
+    with _attached(buffer, typecode) as view:
+        view[lo:hi] = array(typecode, sorted(view[lo:hi]))
+
+
+def _merge_range(src, dst, typecode, a_lo, a_hi, b_lo, b_hi, out_lo):
+    with _attached(src, typecode) as source, _attached(dst, typecode) as target:
+        # As duas fatias já estão ordenadas: o Timsort de list.sort() as reconhece
+        # como duas sequências e só as intercala, de forma estável
+        merged = source[a_lo:a_hi].tolist()
+        merged.extend(source[b_lo:b_hi].tolist())
+        merged.sort()
+        target[out_lo:out_lo + len(merged)] = array(typecode, merged)
+
 
 if __name__ == '__main__':
     import random
@@ -31,3 +369,10 @@ if __name__ == '__main__':
     print("Vetor não ordenado:", arr)
     merge_sort(arr)
     print("Vetor ordenado:", arr)
+    palavras = ["debate", "IA", "argumento", "Modelo", "cache"]
+    merge_sort(palavras, key=str.lower, reverse=True)
+    print("Palavras (key=str.lower, reverse=True):", palavras)
+    # Demonstração pequena: threshold baixo só para exercitar o caminho paralelo
+    numeros = [random.random() for _ in range(20_000)]
+    parallel_merge_sort(numeros, workers=2, threshold=1_000)
+    print("20 mil números ordenados em paralelo:", numeros == sorted(numeros))
@@ -78,6 +78,9 @@ class ResourceMonitor:
         # Callbacks para notificações e alertas
         self.alert_callbacks = []
         
+        # Fontes de estatísticas de cache (ex.: lru_cache.CacheStats)
+        self.cache_stats = {}
+        
         logger.info(f"Monitor inicializado: CPU threshold={self.cpu_threshold}%, "
                    f"Memory threshold={self.mem_threshold}%, Interval={self.interval}s")
     
@@ -114,6 +117,33 @@ class ResourceMonitor:
         self.alert_callbacks.append(callback)
         logger.debug(f"Callback de alerta adicionado. Total de callbacks: {len(self.alert_callbacks)}")
     
+    def register_cache_stats(self, name: str, stats: Any):
+        """
+        Registra estatísticas de cache para inclusão nas métricas atuais.
+        
+        Args:
+            name: Nome do cache nas métricas
+            stats: Objeto com método snapshot() que retorna um dicionário,
+                   como lru_cache.CacheStats
+        """
+        self.cache_stats[name] = stats
+        logger.debug(f"Estatísticas do cache '{name}' registradas")
+    
+    def _collect_cache_stats(self) -> Dict[str, Any]:
+        """
+        Coleta um snapshot de cada cache registrado.
+        
+        Returns:
+            Dicionário com as estatísticas de cada cache pelo nome
+        """
+        snapshots = {}
+        for name, stats in self.cache_stats.items():
+            try:
+                snapshots[name] = stats.snapshot()
+            except Exception as e:
+                logger.error(f"Erro ao coletar estatísticas do cache '{name}': {e}")
+        return snapshots
+    
     def _monitoring_loop(self):
         """Loop principal de monitoramento, executado em thread."""
         logger.info("Iniciando loop de monitoramento")
@@ -388,6 +418,7 @@ class ResourceMonitor:
         return {
             'current': current,
             'stats': stats,
+            'caches': self._collect_cache_stats(),
             'monitoring_active': self.running
         }
 
@@ -0,0 +1,309 @@
+"""
+Cross-process cache backend stored in a shared memory segment.
+
+Every uvicorn worker on a host that opens a SharedMemoryCache with the same
+name sees the same entries, the same hit rate and a single memory budget,
+instead of each process keeping its own LRUCache copy.
+"""
+
+import hashlib
+import os
+import struct
+import tempfile
+import threading
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock
+    fcntl = None
+
+MAGIC = b"LRUSHM01"
+# magic, slots, slot_size, ways, count
+_HEADER = struct.Struct("<8sIIII")
+_HEADER_SIZE = 64
+# version (seqlock), used flag, CLOCK reference bit, key hash, key length, value length
+_SLOT = struct.Struct("<IBBxxQII")
+_VERSION = struct.Struct("<I")
+_VERSION_MASK = 0xFFFFFFFF
+_READ_RETRIES = 64
+_MAX_WAYS = 256
+
+
+def _hash_key(key: bytes) -> int:
+    """Hash that is stable across processes, unlike the randomized built-in hash()."""
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+def _open_segment(name: str, create: bool, size: int = 0) -> shared_memory.SharedMemory:
+    """Open a segment that is not unlinked when the opening process exits."""
+    try:
+        return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+    except TypeError:  # Python < 3.13 has no track argument
+        segment = shared_memory.SharedMemory(name=name, create=create, size=size)
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(segment._name, "shared_memory")
+        return segment
+
+
+def _unlink_segment(segment: shared_memory.SharedMemory) -> None:
+    """Destroy a segment opened by _open_segment()."""
+    if not hasattr(segment, "_track"):
+        # Python < 3.13: unlink() unregisters the segment again, which the
+        # resource tracker reports as an error unless it is registered first
+        from multiprocessing import resource_tracker
+        resource_tracker.register(segment._name, "shared_memory")
+    segment.unlink()
+
+
+class SharedMemoryCache:
+    """
+    Fixed-size, set-associative hash table of bytes values in shared memory.
+
+    Keys hash to a bucket of `ways` slots and each bucket evicts with the
+    CLOCK algorithm, an approximation of LRU that only needs one reference
+    bit per slot. Writers serialize on an flock()-ed lock file; readers take
+    no lock and use per-slot version counters (a seqlock) to detect and retry
+    torn reads.
+    """
+
+    def __init__(self, name: str, slots: int = 4096, slot_size: int = 4096, ways: int = 8,
+                 lock_path: Optional[str] = None):
+        """
+        Create the shared segment or attach to an existing one.
+
+        Args:
+            name: Name of the shared memory segment, identical in every process
+            slots: Maximum number of entries (rounded down to a multiple of ways)
+            slot_size: Bytes per slot, including a 24-byte slot header
+            ways: Slots per hash bucket, at most 256
+            lock_path: Lock file for writers (defaults to one in the temp directory)
+        """
+        if slot_size <= _SLOT.size:
+            raise ValueError(f"slot_size must be larger than {_SLOT.size} bytes")
+        if not 1 <= ways <= _MAX_WAYS:
+            # Each bucket keeps its CLOCK hand in a single byte
+            raise ValueError(f"ways must be between 1 and {_MAX_WAYS}, got {ways}")
+        self.name = name
+        self._thread_lock = threading.Lock()
+        self._lock_file = open(lock_path or os.path.join(tempfile.gettempdir(), f"{name}.lock"), "a+b")
+        with self._locked():
+            try:
+                self._shm = _open_segment(name, create=False)
+            except FileNotFoundError:
+                slots = max(ways, slots - slots % ways)
+                buckets = slots // ways
+                hands_size = (buckets + 7) & ~7
+                self._shm = _open_segment(name, create=True,
+                                          size=_HEADER_SIZE + hands_size + slots * slot_size)
+                _HEADER.pack_into(self._shm.buf, 0, MAGIC, slots, slot_size, ways, 0)
+        magic, slots, slot_size, ways, _ = _HEADER.unpack_from(self._shm.buf, 0)
+        if magic != MAGIC:
+            self._shm.close()
+            raise ValueError(f"Shared memory segment {name!r} is not a SharedMemoryCache")
+        self.slots = slots
+        self.slot_size = slot_size
+        self.ways = ways
+        self._buckets = slots // ways
+        self._hands = _HEADER_SIZE
+        self._data = _HEADER_SIZE + ((self._buckets + 7) & ~7)
+        self._buf = self._shm.buf
+
+    @contextmanager
+    def _locked(self):
+        """Hold the writer lock across threads and processes."""
+        with self._thread_lock:
+            if fcntl is not None:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _slot_offset(self, bucket: int, way: int) -> int:
+        return self._data + (bucket * self.ways + way) * self.slot_size
+
+    def _read_slot(self, offset: int, key_hash: int, key: bytes) -> Tuple[bool, Optional[bytes]]:
+        """
+        Read one slot without the lock.
+
+        Returns:
+            (consistent, value): value is set when the slot holds key
+        """
+        buf = self._buf
+        version, used, _, slot_hash, key_len, value_len = _SLOT.unpack_from(buf, offset)
+        if version & 1:
+            return False, None
+        value = None
+        if used and slot_hash == key_hash and key_len == len(key):
+            start = offset + _SLOT.size
+            data = bytes(buf[start:start + key_len + value_len])
+            if data[:key_len] == key:
+                value = data[key_len:]
+        return _VERSION.unpack_from(buf, offset)[0] == version, value
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Retrieve a value and set its CLOCK reference bit.
+
+        Args:
+            key: Identifier for the entry
+
+        Returns:
+            The stored bytes if found, None otherwise
+        """
+        encoded = key.encode()
+        key_hash = _hash_key(encoded)
+        bucket = key_hash % self._buckets
+        for way in range(self.ways):
+            offset = self._slot_offset(bucket, way)
+            for _ in range(_READ_RETRIES):
+                consistent, value = self._read_slot(offset, key_hash, encoded)
+                if consistent:
+                    break
+            else:
+                with self._locked():
+                    consistent, value = self._read_slot(offset, key_hash, encoded)
+            if value is not None:
+                self._buf[offset + 5] = 1  # Benign race: only ever sets the bit
+                return value
+        return None
+
+    def _write_slot(self, offset: int, key_hash: int, key: bytes, value: bytes) -> None:
+        """Overwrite a slot while holding the lock, bracketing it with version bumps."""
+        buf = self._buf
+        version = _VERSION.unpack_from(buf, offset)[0]
+        _VERSION.pack_into(buf, offset, (version + 1) & _VERSION_MASK)
+        start = offset + _SLOT.size
+        buf[start:start + len(key)] = key
+        buf[start + len(key):start + len(key) + len(value)] = value
+        _SLOT.pack_into(buf, offset, (version + 1) & _VERSION_MASK, 1, 1,
+                        key_hash, len(key), len(value))
+        _VERSION.pack_into(buf, offset, (version + 2) & _VERSION_MASK)
+
+    def _clear_slot(self, offset: int) -> None:
+        """Mark a slot free while holding the lock."""
+        version = _VERSION.unpack_from(self._buf, offset)[0]
+        _SLOT.pack_into(self._buf, offset, (version + 2) & _VERSION_MASK, 0, 0, 0, 0, 0)
+
+    def _find(self, bucket: int, key_hash: int, key: bytes) -> Optional[int]:
+        """Return the offset of the slot holding key, while holding the lock."""
+        for way in range(self.ways):
+            offset = self._slot_offset(bucket, way)
+            _, used, _, slot_hash, key_len, _ = _SLOT.unpack_from(self._buf, offset)
+            if used and slot_hash == key_hash and key_len == len(key):
+                start = offset + _SLOT.size
+                if self._buf[start:start + key_len] == key:
+                    return offset
+        return None
+
+    def _add_count(self, delta: int) -> None:
+        count_offset = _HEADER.size - 4
+        count = struct.unpack_from("<I", self._buf, count_offset)[0]
+        struct.pack_into("<I", self._buf, count_offset, count + delta)
+
+    def put(self, key: str, value: bytes) -> bool:
+        """
+        Add or update an entry, evicting with CLOCK when its bucket is full.
+
+        Args:
+            key: Identifier for the entry
+            value: Bytes to store
+
+        Returns:
+            True if stored, False if key and value do not fit in one slot
+        """
+        encoded = key.encode()
+        if len(encoded) + len(value) > self.slot_size - _SLOT.size:
+            return False
+        key_hash = _hash_key(encoded)
+        bucket = key_hash % self._buckets
+        with self._locked():
+            offset = self._find(bucket, key_hash, encoded)
+            if offset is None:
+                offset = self._victim(bucket)
+            self._write_slot(offset, key_hash, encoded, value)
+        return True
+
+    def _victim(self, bucket: int) -> int:
+        """Pick a free slot, or sweep the CLOCK hand to the first unreferenced one."""
+        for way in range(self.ways):
+            offset = self._slot_offset(bucket, way)
+            if not self._buf[offset + 4]:
+                self._add_count(1)
+                return offset
+        hand_offset = self._hands + bucket
+        hand = self._buf[hand_offset] % self.ways
+        while True:
+            offset = self._slot_offset(bucket, hand)
+            hand = (hand + 1) % self.ways
+            if self._buf[offset + 5]:
+                self._buf[offset + 5] = 0  # Second chance
+            else:
+                self._buf[hand_offset] = hand
+                return offset
+
+    def invalidate(self, key: str) -> bool:
+        """Remove an entry, returning True if it was cached."""
+        encoded = key.encode()
+        key_hash = _hash_key(encoded)
+        with self._locked():
+            offset = self._find(key_hash % self._buckets, key_hash, encoded)
+            if offset is None:
+                return False
+            self._clear_slot(offset)
+            self._add_count(-1)
+        return True
+
+    def __len__(self) -> int:
+        """Return the number of entries across all processes."""
+        return _HEADER.unpack_from(self._buf, 0)[4]
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._locked():
+            for slot in range(self.slots):
+                offset = self._data + slot * self.slot_size
+                if self._buf[offset + 4]:
+                    self._clear_slot(offset)
+            self._add_count(-len(self))
+
+    def items(self) -> List[Tuple[str, bytes]]:
+        """Return a snapshot of all (key, value) pairs, in slot order."""
+        result = []
+        with self._locked():
+            for slot in range(self.slots):
+                offset = self._data + slot * self.slot_size
+                _, used, _, _, key_len, value_len = _SLOT.unpack_from(self._buf, offset)
+                if used:
+                    start = offset + _SLOT.size
+                    data = bytes(self._buf[start:start + key_len + value_len])
+                    result.append((data[:key_len].decode(), data[key_len:]))
+        return result
+
+    def keys(self) -> List[str]:
+        """Return a snapshot of all keys, in slot order."""
+        return [key for key, _ in self.items()]
+
+    def values(self) -> List[bytes]:
+        """Return a snapshot of all values, in slot order."""
+        return [value for _, value in self.items()]
+
+    def close(self) -> None:
+        """Detach this process from the segment; other processes keep using it."""
+        self._buf = None
+        self._shm.close()
+        self._lock_file.close()
+
+    def unlink(self) -> None:
+        """Destroy the segment once every process is done with it."""
+        _unlink_segment(self._shm)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,35 @@
+"""Invariant checks shared by the AVL tree tests."""
+
+
+def check_avl(tree, monoid=None):
+    """
+    Assert that tree is a valid AVL tree and return its keys in order.
+
+    Checks the search order, the stored heights, the balance factors and, on
+    augmented nodes, the subtree sizes and the monoid aggregates.
+    """
+    keys = []
+
+    def walk(node):
+        if node is None:
+            return 0, 0
+        left_height, left_size = walk(node.left)
+        keys.append(node.key)
+        right_height, right_size = walk(node.right)
+        assert node.height == max(left_height, right_height) + 1, f"stale height at {node.key!r}"
+        assert abs(left_height - right_height) <= 1, f"unbalanced at {node.key!r}"
+        size = left_size + right_size + 1
+        if hasattr(node, "size"):
+            assert node.size == size, f"stale size at {node.key!r}"
+        if monoid is not None:
+            expected = monoid.measure(node.key)
+            if node.left is not None:
+                expected = monoid.combine(node.left.agg, expected)
+            if node.right is not None:
+                expected = monoid.combine(expected, node.right.agg)
+            assert node.agg == expected, f"stale aggregate at {node.key!r}"
+        return node.height, size
+
+    walk(tree.root)
+    assert all(a < b for a, b in zip(keys, keys[1:])), "keys out of order"
+    return keys
@@ -0,0 +1,65 @@
+"""ArrayAVLTree: struct-of-arrays AVL tree for numeric keys."""
+
+import random
+
+import pytest
+
+from avl_tree import ArrayAVLTree
+
+
+def check_arrays(tree):
+    # Same invariants as avl_helpers.check_avl, on the parallel arrays
+    keys, left, right, height = tree._keys, tree._left, tree._right, tree._height
+    assert height[0] == 0
+
+    def walk(node, lo, hi):
+        if not node:
+            return 0, []
+        key = keys[node]
+        assert (lo is None or lo < key) and (hi is None or key < hi)
+        hl, left_keys = walk(left[node], lo, key)
+        hr, right_keys = walk(right[node], key, hi)
+        assert abs(hl - hr) <= 1
+        assert height[node] == max(hl, hr) + 1
+        return height[node], left_keys + [key] + right_keys
+
+    ordered = walk(tree.root, None, None)[1]
+    assert len(ordered) == len(tree)
+    return ordered
+
+
+def test_insert_delete_and_slot_reuse():
+    rng = random.Random(13)
+    keys = rng.sample(range(-50_000, 50_000), 3_000)
+    tree = ArrayAVLTree()
+    for key in keys:
+        tree.insert_key(key)
+    assert check_arrays(tree) == sorted(keys)
+    allocated = len(tree._keys)
+    for key in keys[:1_500]:
+        tree.delete_key(key)
+    for key in keys[:1_500]:
+        tree.insert_key(key + 100_000)
+    assert len(tree._keys) == allocated  # Freed slots were reused
+    assert check_arrays(tree) == sorted(keys[1_500:] + [k + 100_000 for k in keys[:1_500]])
+
+
+def test_queries_match_the_keys():
+    tree = ArrayAVLTree.from_sorted(range(0, 100, 5))
+    assert check_arrays(tree) == list(range(0, 100, 5))
+    assert tree.search_key(15) == 15 and tree.search_key(16) is None
+    assert 95 in tree and 96 not in tree
+    assert tree.find_min() == 0 and tree.find_max() == 95
+    assert list(tree.irange(10, 30, inclusive=(False, True))) == [15, 20, 25, 30]
+    assert list(tree.irange(10, 30, reverse=True)) == [30, 25, 20, 15, 10]
+    assert list(reversed(tree))[:2] == [95, 90]
+    assert ArrayAVLTree().find_min() is None
+
+
+def test_float_keys_and_disordered_bulk_load():
+    tree = ArrayAVLTree.from_sorted([0.5, 0.5, 1.5, 2.5], typecode="d")
+    assert check_arrays(tree) == [0.5, 1.5, 2.5]
+    tree.insert_key(1.0)
+    assert list(tree) == [0.5, 1.0, 1.5, 2.5]
+    with pytest.raises(ValueError):
+        ArrayAVLTree.from_sorted([3, 1])
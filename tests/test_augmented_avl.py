@@ -0,0 +1,62 @@
+"""AugmentedAVLTree: sizes and monoid aggregates behind rank/select and range queries."""
+
+import random
+
+import pytest
+
+from avl_helpers import check_avl
+from avl_tree import COUNT, MAX, MIN, SUM, AugmentedAVLTree
+
+
+@pytest.mark.parametrize("monoid", [None, SUM, MIN, MAX, COUNT])
+def test_fields_stay_consistent_through_updates(monoid):
+    rng = random.Random(5)
+    keys = rng.sample(range(5_000), 1_000)
+    tree = AugmentedAVLTree(monoid)
+    for key in keys:
+        tree.insert_key(key)
+    for key in keys[:400]:
+        tree.delete_key(key)
+    assert check_avl(tree, monoid) == sorted(keys[400:])
+    assert len(tree) == 600
+
+
+def test_rank_select_and_count_range():
+    keys = list(range(0, 200, 2))
+    tree = AugmentedAVLTree.from_sorted(keys)
+    check_avl(tree)
+    assert [tree.select(i) for i in range(len(keys))] == keys
+    assert tree.select(-1) == 198
+    assert tree.rank(0) == 0 and tree.rank(7) == 4 and tree.rank(1000) == 100
+    assert tree.count_range(10, 20) == 6
+    assert tree.count_range(10, 20, inclusive=(False, False)) == 4
+    assert tree.count_range(20, 10) == 0
+    with pytest.raises(IndexError):
+        tree.select(100)
+
+
+def test_aggregate_range_matches_a_scan():
+    rng = random.Random(9)
+    keys = sorted(rng.sample(range(1_000), 300))
+    tree = AugmentedAVLTree.from_sorted(keys, SUM)
+    check_avl(tree, SUM)
+    for _ in range(200):
+        lo, hi = sorted(rng.sample(range(-10, 1_010), 2))
+        for inclusive in ((True, True), (True, False), (False, True), (False, False)):
+            expected = sum(k for k in keys
+                           if (lo <= k if inclusive[0] else lo < k)
+                           and (k <= hi if inclusive[1] else k < hi))
+            assert tree.aggregate_range(lo, hi, inclusive) == expected
+    with pytest.raises(ValueError):
+        AugmentedAVLTree().aggregate_range(0, 1)
+
+
+def test_split_and_set_operations_keep_the_augmentation():
+    a = AugmentedAVLTree.from_sorted(range(0, 300, 3), SUM)
+    b = AugmentedAVLTree.from_sorted(range(0, 300, 5), SUM)
+    union = a.union(b)
+    assert check_avl(union, SUM) == sorted(set(range(0, 300, 3)) | set(range(0, 300, 5)))
+    less, greater = union.split(150)
+    check_avl(less, SUM)
+    check_avl(greater, SUM)
+    assert len(less) + len(greater) == 140
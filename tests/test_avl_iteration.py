@@ -0,0 +1,49 @@
+"""Lazy in-order iteration, irange and delete_range of AVLTree."""
+
+import random
+
+import pytest
+
+from avl_helpers import check_avl
+from avl_tree import AVLTree
+
+KEYS = list(range(0, 100, 3))
+
+
+def expected(lo, hi, inclusive):
+    return [k for k in KEYS
+            if (lo is None or (lo <= k if inclusive[0] else lo < k))
+            and (hi is None or (k <= hi if inclusive[1] else k < hi))]
+
+
+def test_iteration_in_both_directions():
+    tree = AVLTree.from_sorted(KEYS)
+    assert list(tree) == KEYS
+    assert list(reversed(tree)) == KEYS[::-1]
+    assert list(AVLTree()) == []
+
+
+@pytest.mark.parametrize("lo, hi", [(None, None), (None, 30), (30, None), (30, 60),
+                                    (31, 59), (-5, 200), (60, 30)])
+@pytest.mark.parametrize("inclusive", [(True, True), (True, False), (False, True), (False, False)])
+def test_irange_bounds(lo, hi, inclusive):
+    tree = AVLTree.from_sorted(KEYS)
+    assert list(tree.irange(lo, hi, inclusive)) == expected(lo, hi, inclusive)
+    assert list(tree.irange(lo, hi, inclusive, reverse=True)) == expected(lo, hi, inclusive)[::-1]
+
+
+def test_irange_is_lazy():
+    tree = AVLTree.from_sorted(range(1_000_000))
+    iterator = tree.irange(10)
+    assert [next(iterator) for _ in range(3)] == [10, 11, 12]
+
+
+@pytest.mark.parametrize("inclusive", [(True, True), (False, False)])
+def test_delete_range_returns_the_removed_keys(inclusive):
+    rng = random.Random(3)
+    for _ in range(20):
+        tree = AVLTree.from_sorted(KEYS)
+        lo, hi = sorted(rng.sample(range(-5, 105), 2))
+        removed = tree.delete_range(lo, hi, inclusive)
+        assert check_avl(removed) == expected(lo, hi, inclusive)
+        assert check_avl(tree) == [k for k in KEYS if k not in expected(lo, hi, inclusive)]
@@ -0,0 +1,66 @@
+"""AVLTree.from_sorted, split/join and the join-based set operations."""
+
+import random
+
+import pytest
+
+from avl_helpers import check_avl
+from avl_tree import AVLTree
+
+
+def test_from_sorted_builds_a_balanced_tree():
+    for size in (0, 1, 2, 7, 100, 1023, 1024):
+        tree = AVLTree.from_sorted(range(size))
+        assert check_avl(tree) == list(range(size))
+
+
+def test_from_sorted_skips_duplicates_and_rejects_disorder():
+    assert check_avl(AVLTree.from_sorted([1, 1, 2, 3, 3])) == [1, 2, 3]
+    with pytest.raises(ValueError):
+        AVLTree.from_sorted([1, 3, 2])
+
+
+@pytest.mark.parametrize("pivot", [-1, 0, 250, 251, 499, 1000])
+def test_split_at_every_kind_of_pivot(pivot):
+    keys = list(range(0, 1000, 2))
+    less, greater = AVLTree.from_sorted(keys).split(pivot)
+    assert check_avl(less) == [k for k in keys if k < pivot]
+    assert check_avl(greater) == [k for k in keys if k >= pivot]
+
+
+def test_join_trees_of_very_different_heights():
+    rng = random.Random(2)
+    for small, large in ((0, 500), (1, 500), (3, 2000), (500, 1), (2000, 3), (300, 300)):
+        left = AVLTree.from_sorted(range(small))
+        right = AVLTree.from_sorted(range(small, small + large))
+        joined = AVLTree.join(left, right)
+        assert check_avl(joined) == list(range(small + large))
+        assert left.root is None and right.root is None
+    tree = AVLTree()
+    for key in rng.sample(range(100), 50):
+        tree.insert_key(key)
+    with pytest.raises(ValueError):
+        AVLTree.join(tree, AVLTree.from_sorted([0, 1]))
+
+
+@pytest.mark.parametrize("sizes", [(0, 50), (50, 0), (10, 400), (400, 10), (300, 300)])
+def test_set_operations_match_python_sets(sizes):
+    rng = random.Random(sum(sizes))
+    a_keys = set(rng.sample(range(1_000), sizes[0]))
+    b_keys = set(rng.sample(range(1_000), sizes[1]))
+    cases = (("union", a_keys | b_keys), ("intersection", a_keys & b_keys),
+             ("difference", a_keys - b_keys))
+    for operation, expected in cases:
+        a = AVLTree.from_sorted(sorted(a_keys))
+        b = AVLTree.from_sorted(sorted(b_keys))
+        result = getattr(a, operation)(b)
+        assert check_avl(result) == sorted(expected)
+        assert a.root is None and b.root is None
+
+
+def test_copy_is_independent():
+    tree = AVLTree.from_sorted(range(100))
+    twin = tree.copy()
+    twin.delete_key(50)
+    assert 50 in list(tree)
+    assert check_avl(twin) == [k for k in range(100) if k != 50]
@@ -0,0 +1,57 @@
+"""AVLMap: a sorted mapping storing values in the tree nodes."""
+
+import pytest
+
+from avl_helpers import check_avl
+from avl_tree import SUM, AVLMap
+
+
+def test_mapping_protocol():
+    tree = AVLMap({"b": 2, "a": 1})
+    tree["c"] = 3
+    tree["a"] = 10
+    assert tree["a"] == 10
+    assert "b" in tree and "z" not in tree
+    assert tree.get("z", 0) == 0
+    del tree["b"]
+    with pytest.raises(KeyError):
+        tree["b"]
+    with pytest.raises(KeyError):
+        del tree["b"]
+    assert list(tree.items()) == [("a", 10), ("c", 3)]
+    assert list(tree.keys()) == ["a", "c"]
+    assert list(tree.values()) == [10, 3]
+    assert len(tree) == 2
+    check_avl(tree)
+
+
+def test_neighbours_and_pops():
+    tree = AVLMap.from_sorted((k, str(k)) for k in range(0, 50, 5))
+    assert tree.floor(12) == (10, "10")
+    assert tree.ceiling(12) == (15, "15")
+    assert tree.predecessor(10) == (5, "5")
+    assert tree.successor(45) is None
+    assert tree.pop_min() == (0, "0")
+    assert tree.pop_max() == (45, "45")
+    assert list(tree.items(10, 20, reverse=True)) == [(20, "20"), (15, "15"), (10, "10")]
+    with pytest.raises(KeyError):
+        AVLMap().pop_min()
+
+
+def test_from_sorted_keeps_the_last_duplicate_and_copy_is_deep():
+    tree = AVLMap.from_sorted([(1, "a"), (1, "b"), (2, "c")], monoid=SUM)
+    assert list(tree.items()) == [(1, "b"), (2, "c")]
+    twin = tree.copy()
+    twin[1] = "changed"
+    assert tree[1] == "b"
+    check_avl(twin, SUM)
+
+
+def test_values_travel_with_split_and_union():
+    a = AVLMap((k, f"a{k}") for k in range(10))
+    b = AVLMap((k, f"b{k}") for k in range(5, 15))
+    union = a.union(b)
+    assert union[3] == "a3" and union[7] == "a7" and union[12] == "b12"
+    less, greater = union.split(7)
+    assert list(less.values())[-1] == "a6"
+    assert greater[7] == "a7"
@@ -0,0 +1,64 @@
+"""AVLTree.save() and the read-only FrozenAVLTree loaded from it."""
+
+import pytest
+
+from avl_tree import ArrayAVLTree, AVLTree, FrozenAVLTree
+
+
+@pytest.mark.parametrize("keys", [
+    list(range(-500, 500, 3)),
+    [x / 8 for x in range(-100, 100)],
+    sorted(["", "a", "ção", "zz", "β", "abc"]),
+    [],
+])
+@pytest.mark.parametrize("mmap", [True, False])
+def test_round_trip(tmp_path, keys, mmap):
+    path = tmp_path / "tree.avl"
+    assert AVLTree.from_sorted(keys).save(path) == len(keys)
+    with AVLTree.load(path, mmap=mmap) as frozen:
+        assert len(frozen) == len(keys)
+        assert list(frozen) == keys
+        assert list(reversed(frozen)) == keys[::-1]
+        for key in keys[::7]:
+            assert frozen.search_key(key) == key and key in frozen
+        if keys:
+            assert frozen.find_min() == keys[0] and frozen.find_max() == keys[-1]
+            lo, hi = keys[len(keys) // 4], keys[len(keys) // 2]
+            assert list(frozen.irange(lo, hi, inclusive=(False, True))) == \
+                [k for k in keys if lo < k <= hi]
+
+
+def test_missing_keys_and_array_tree(tmp_path):
+    path = tmp_path / "ints.avl"
+    ArrayAVLTree.from_sorted(range(0, 100, 2)).save(path)
+    with ArrayAVLTree.load(path) as frozen:
+        assert frozen.search_key(3) is None and 3 not in frozen
+        assert list(frozen.irange(95)) == [96, 98]
+
+
+def test_rejects_foreign_files_and_unsupported_keys(tmp_path):
+    path = tmp_path / "junk"
+    path.write_bytes(b"not an avl tree at all, definitely")
+    with pytest.raises(ValueError):
+        FrozenAVLTree(path)
+    with pytest.raises(TypeError):
+        AVLTree.from_sorted([(1, 2), (3, 4)]).save(tmp_path / "tuples.avl")
+
+
+@pytest.mark.parametrize("keys", [[1, 2.5, 3], [1, 2**63], [-2**63 - 1, 0]])
+def test_keys_without_one_exact_type_are_refused(tmp_path, keys):
+    path = tmp_path / "mixed.avl"
+    with pytest.raises(TypeError):
+        AVLTree.from_sorted(keys).save(path)
+    assert not path.exists() or path.stat().st_size == 0
+
+
+def test_int64_limits_round_trip_exactly(tmp_path):
+    keys = [-2**63, -1, 0, 2**53 + 1, 2**63 - 1]
+    path = tmp_path / "limits.avl"
+    AVLTree.from_sorted(keys).save(path)
+    with FrozenAVLTree(path) as frozen:
+        assert list(frozen) == keys
+        assert all(type(key) is int for key in frozen)
+        assert frozen.search_key(2**53 + 1) == 2**53 + 1
+        assert frozen.search_key(2**53) is None
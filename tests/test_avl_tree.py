@@ -0,0 +1,73 @@
+"""AVLTree: iterative and recursive insert, delete and search keep the AVL invariants."""
+
+import random
+
+import pytest
+
+from avl_helpers import check_avl
+from avl_tree import AVLTree
+
+
+@pytest.fixture
+def keys():
+    return random.Random(1).sample(range(10_000), 2_000)
+
+
+def test_iterative_insert_and_delete_keep_invariants(keys):
+    tree = AVLTree()
+    for key in keys:
+        tree.insert_key(key)
+    assert check_avl(tree) == sorted(keys)
+    doomed = keys[::2]
+    for index, key in enumerate(doomed):
+        node = tree.delete_key(key)
+        assert node is not None and node.key == key
+        if index % 100 == 0:
+            check_avl(tree)
+    assert check_avl(tree) == sorted(keys[1::2])
+
+
+def test_insert_key_returns_the_node_and_ignores_duplicates():
+    tree = AVLTree()
+    first = tree.insert_key(5)
+    assert first.key == 5
+    assert tree.insert_key(5) is first
+    assert check_avl(tree) == [5]
+
+
+def test_delete_missing_key_returns_none():
+    tree = AVLTree.from_sorted(range(10))
+    assert tree.delete_key(42) is None
+    assert check_avl(tree) == list(range(10))
+
+
+def test_search_min_max(keys):
+    tree = AVLTree()
+    for key in keys:
+        tree.insert_key(key)
+    for key in keys[:100]:
+        assert tree.search_key(key).key == key
+    assert tree.search_key(-1) is None
+    assert tree.find_min() == min(keys)
+    assert tree.find_max() == max(keys)
+    assert AVLTree().find_min() is None
+
+
+def test_recursive_api_matches_iterative(keys):
+    recursive, iterative = AVLTree(), AVLTree()
+    for key in keys:
+        recursive.root = recursive.insert(recursive.root, key)
+        iterative.insert_key(key)
+    for key in keys[:500]:
+        recursive.root = recursive.delete(recursive.root, key)
+        iterative.delete_key(key)
+    assert check_avl(recursive) == check_avl(iterative)
+    assert recursive.search(recursive.root, keys[-1]).key == keys[-1]
+
+
+def test_sequential_keys_stay_logarithmic():
+    tree = AVLTree()
+    for key in range(4096):
+        tree.insert_key(key)
+    check_avl(tree)
+    assert tree.root.height <= 1.45 * 12 + 1
@@ -0,0 +1,40 @@
+"""Trace generators, trace files and replay of the cache benchmark harness."""
+
+import json
+
+from cache_benchmark import (load_trace, loop_trace, mixed_trace, replay, run_traces, save_trace,
+                             scan_trace, synthetic_traces, zipf_trace)
+from cache_policies import make_cache
+
+
+def test_generators_are_reproducible_and_shaped():
+    assert zipf_trace(100, 10, seed=1) == zipf_trace(100, 10, seed=1)
+    assert len(set(zipf_trace(1_000, 50))) <= 50
+    assert scan_trace(3, start=5) == ["scan:5", "scan:6", "scan:7"]
+    assert loop_trace(5, 2) == ["loop:0", "loop:1", "loop:0", "loop:1", "loop:0"]
+    assert len(mixed_trace(1_000, 30)) == 1_000
+
+
+def test_trace_files_round_trip(tmp_path):
+    path = tmp_path / "trace.txt"
+    save_trace(["a", "b", "a"], path)
+    assert load_trace(path) == ["a", "b", "a"]
+    log = tmp_path / "access.log"
+    log.write_text("GET model=llama\nnoise\n\nGET model=phi\n")
+    assert load_trace(log, r"model=(\w+)") == ["llama", "phi"]
+
+
+def test_replay_counts_hits():
+    result = replay(make_cache("lru", 2), ["a", "b", "a", "c", "b"])
+    assert result["requests"] == 5
+    assert result["hit_rate"] == 1 / 5
+    loop = replay(make_cache("lru", 2), loop_trace(30, 3))
+    assert loop["hit_rate"] == 0.0  # A loop one key larger than LRU's capacity never hits
+
+
+def test_run_traces_report_is_json_ready():
+    traces = synthetic_traces(["scan", "zipf"], length=500, keys=50, skews=[0.8])
+    report = run_traces(traces, capacity=20, policies=["lru", "arc"])
+    assert set(report["results"]) == {"scan", "zipf(skew=0.8)"}
+    assert report["results"]["scan"]["lru"]["hit_rate"] == 0.0
+    json.dumps(report)
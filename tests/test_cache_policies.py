@@ -0,0 +1,55 @@
+"""Eviction policies behind make_cache(): capacity, basic API and scan resistance."""
+
+import random
+
+import pytest
+
+from cache_benchmark import replay, scan_polluted_trace
+from cache_policies import POLICIES, CountMinSketch, GreedyDualCache, make_cache
+
+
+@pytest.mark.parametrize("policy", sorted(POLICIES))
+def test_random_workload_respects_capacity(policy):
+    rng = random.Random(11)
+    cache = make_cache(policy, 20)
+    stored = {}
+    for _ in range(3_000):
+        key = f"k{rng.randrange(60)}"
+        value = cache.get(key)
+        if value is not None:
+            assert value == stored[key]
+        else:
+            stored[key] = rng.random()
+            cache.put(key, stored[key])
+        assert len(cache) <= 20
+    assert sorted(cache.keys()) == sorted(key for key, _ in cache.items())
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        make_cache("fifo", 10)
+
+
+def test_count_min_sketch_never_underestimates_before_aging():
+    sketch = CountMinSketch(64, sample_size=10**9)
+    for i in range(100):
+        for _ in range(i % 5):
+            sketch.increment(f"k{i}")
+    assert all(sketch.estimate(f"k{i}") >= i % 5 for i in range(100))
+
+
+def test_admission_policies_resist_scans():
+    trace = scan_polluted_trace(20_000, keys=500, scan_every=1_000, scan_length=400, seed=3)
+    lru = replay(make_cache("lru", 100), trace)["hit_rate"]
+    assert replay(make_cache("tinylfu", 100), trace)["hit_rate"] > lru
+    assert replay(make_cache("arc", 100), trace)["hit_rate"] > lru
+
+
+def test_greedy_dual_keeps_expensive_entries():
+    cache = GreedyDualCache(2)
+    cache.put("model", "m", cost=100.0)
+    for i in range(10):
+        cache.put(f"result{i}", i, cost=1.0)
+    assert cache.get("model") == "m"
@@ -0,0 +1,57 @@
+"""CacheStats counters, per-prefix breakdown and load histogram."""
+
+import threading
+
+import pytest
+
+from lru_cache import CacheStats, LRUCache, RemovalCause
+
+
+def test_hits_misses_puts_and_evictions():
+    stats = CacheStats(key_prefix=lambda key: key.split(":", 1)[0])
+    cache = LRUCache(2, stats=stats)
+    cache.put("user:1", 1)
+    cache.put("user:1", 2)
+    cache.put("item:1", 3)
+    cache.put("item:2", 4)  # Evicts user:1
+    assert cache.get("item:1") == 3
+    assert cache.get("user:1") is None
+    snapshot = stats.snapshot()
+    assert snapshot["hits"] == 1 and snapshot["misses"] == 1
+    assert snapshot["hit_ratio"] == 0.5
+    assert snapshot["puts"] == 3 and snapshot["updates"] == 1
+    assert snapshot["evictions"][RemovalCause.SIZE] == 1
+    assert snapshot["removals"][RemovalCause.REPLACED] == 1
+    assert snapshot["prefixes"]["user"] == {"hits": 0, "misses": 1, "evictions": 1}
+    assert snapshot["prefixes"]["item"] == {"hits": 1, "misses": 0, "evictions": 0}
+
+
+def test_loads_fill_the_histogram():
+    stats = CacheStats()
+    cache = LRUCache(4, stats=stats)
+    cache.get_or_load("a", lambda key: key)
+    with pytest.raises(RuntimeError):
+        cache.get_or_load("b", lambda key: (_ for _ in ()).throw(RuntimeError(key)))
+    loads = stats.snapshot()["loads"]
+    assert loads["count"] == 2 and loads["failures"] == 1
+    assert sum(loads["histogram"].values()) == 2
+    assert loads["histogram"]["le_0.001"] >= 1
+
+
+def test_shards_merge_across_threads_and_reset():
+    stats = CacheStats()
+
+    def worker():
+        for i in range(1_000):
+            stats.record_hit(str(i))
+            stats.record_miss(str(i))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert stats.snapshot()["requests"] == 8_000
+    stats.reset()
+    assert stats.snapshot()["requests"] == 0
+    assert stats.snapshot()["hit_ratio"] == 0.0
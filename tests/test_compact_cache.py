@@ -0,0 +1,47 @@
+"""CompactLRUCache: slot-based LRU order, slot reuse and unboxed values."""
+
+import random
+from collections import OrderedDict
+
+from lru_cache import CompactLRUCache
+
+
+def test_matches_an_ordered_dict_model():
+    rng = random.Random(10)
+    cache = CompactLRUCache(50)
+    model = OrderedDict()
+    for _ in range(5_000):
+        key = f"k{rng.randrange(120)}"
+        action = rng.random()
+        if action < 0.5:
+            value = cache.get(key)
+            assert value == model.get(key)
+            if key in model:
+                model.move_to_end(key)
+        elif action < 0.9:
+            cache.put(key, rng.random())
+            model[key] = cache._values[cache._slots[key]]
+            model.move_to_end(key)
+            if len(model) > 50:
+                model.popitem(last=False)
+        else:
+            assert cache.invalidate(key) == (model.pop(key, None) is not None)
+        assert len(cache) == len(model)
+    assert cache.items() == list(model.items())
+
+
+def test_typed_values_are_unboxed_and_slots_are_reused():
+    cache = CompactLRUCache(3, typecode="d")
+    for key, value in (("a", 1.5), ("b", 2.5), ("c", 3.5)):
+        cache.put(key, value)
+    assert cache.invalidate("b")
+    cache.put("d", 4.5)
+    assert len(cache._keys) == 3  # Reused b's slot
+    assert cache.keys() == ["a", "c", "d"]
+    assert cache.values() == [1.5, 3.5, 4.5]
+    cache.put("e", 5.5)  # Evicts a
+    assert cache.get("a") is None
+    assert cache.get("c") == 3.5
+    assert cache.keys() == ["d", "e", "c"]
+    cache.clear()
+    assert len(cache) == 0 and cache.items() == []
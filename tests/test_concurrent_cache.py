@@ -0,0 +1,71 @@
+"""ConcurrentLRUCache: segmented capacity and thread safety."""
+
+import threading
+
+from lru_cache import CacheStats, ConcurrentLRUCache
+
+
+def test_segment_capacities_sum_to_capacity():
+    cache = ConcurrentLRUCache(10, segments=4)
+    assert sum(segment.capacity for segment in cache._segments) == 10
+    assert len(ConcurrentLRUCache(3, segments=16)._segments) == 3
+
+
+def test_basic_operations():
+    cache = ConcurrentLRUCache(100, segments=4)
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    assert cache.invalidate("a")
+    assert not cache.invalidate("a")
+    assert cache.get("a") is None
+    for i in range(500):
+        cache.put(f"k{i}", i)
+    assert len(cache) <= 100
+    assert sorted(cache.keys()) == sorted(key for key, _ in cache.items())
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_threads_hammering_the_cache_stay_within_capacity():
+    stats = CacheStats()
+    cache = ConcurrentLRUCache(64, segments=8, stats=stats)
+    errors = []
+
+    def worker(offset):
+        try:
+            for i in range(2_000):
+                key = f"k{(i * 7 + offset) % 200}"
+                if cache.get(key) is None:
+                    cache.put(key, i)
+        except Exception as exc:  # pragma: no cover - the assertion below reports it
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert len(cache) <= 64
+    assert stats.snapshot()["requests"] == 16_000
+
+
+def test_get_or_load_runs_the_loader_once_per_key():
+    cache = ConcurrentLRUCache(16, segments=4)
+    calls = []
+    barrier = threading.Barrier(6)
+
+    def loader(key):
+        calls.append(key)
+        return key.upper()
+
+    def worker():
+        barrier.wait()
+        assert cache.get_or_load("x", loader) == "X"
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert calls == ["x"]
@@ -0,0 +1,130 @@
+"""IntervalTree: half-open windows with payloads and max-end pruning."""
+
+import random
+
+import pytest
+
+from avl_helpers import check_avl
+from avl_tree import IntervalTree, MapNode
+
+
+def brute(intervals, lo, hi, hi_inclusive=False):
+    if not (lo < hi or hi_inclusive):
+        return []
+    return sorted((s, e, item) for s, e, item in intervals
+                  if lo < e and (s < hi or (hi_inclusive and s == hi)))
+
+
+def test_overlapping_and_stab_match_a_scan():
+    rng = random.Random(6)
+    tree = IntervalTree()
+    intervals = []
+    for i in range(500):
+        start = rng.randrange(1_000)
+        end = start + 1 + rng.randrange(50)
+        tree.add(start, end, i)
+        intervals.append((start, end, i))
+    check_avl(tree, tree.monoid)
+    for _ in range(200):
+        lo = rng.randrange(-10, 1_060)
+        hi = lo + rng.randrange(30)
+        assert sorted(tree.overlapping(lo, hi)) == brute(intervals, lo, hi)
+        assert sorted(tree.stab(lo)) == brute(intervals, lo, lo, True)
+
+
+def test_duplicate_windows_keep_every_payload():
+    tree = IntervalTree()
+    tree.add(0, 10, "a")
+    tree.add(0, 10, "b")
+    tree.add(0, 10, "a")
+    assert len(tree) == 3
+    assert sorted(item for _, _, item in tree.stab(5)) == ["a", "a", "b"]
+    assert tree.remove(0, 10, "a")
+    assert sorted(item for _, _, item in tree.intervals()) == ["a", "b"]
+    assert not tree.remove(0, 10, "c")
+    assert not tree.remove(0, 9, "b")
+    assert tree.remove(0, 10, "b") and tree.remove(0, 10, "a")
+    assert len(tree) == 0
+
+
+def test_payloads_need_not_be_comparable():
+    tree = IntervalTree()
+    first, second = object(), object()
+    tree.add(1, 2, first)
+    tree.add(1, 2, second)
+    assert {item for _, _, item in tree.overlapping(0, 3)} == {first, second}
+
+
+def test_removal_keeps_the_max_end_augmentation():
+    rng = random.Random(8)
+    tree = IntervalTree()
+    intervals = [(s, s + 1 + rng.randrange(100), i) for i, s in
+                 enumerate(rng.randrange(1_000) for _ in range(300))]
+    for interval in intervals:
+        tree.add(*interval)
+    for interval in intervals[::2]:
+        assert tree.remove(*interval)
+    check_avl(tree, tree.monoid)
+    assert list(tree.intervals()) == sorted(intervals[1::2])
+    assert sorted(tree.overlapping(200, 400)) == brute(intervals[1::2], 200, 400)
+
+
+def test_copy_and_split_carry_payloads():
+    tree = IntervalTree()
+    for i in range(20):
+        tree.add(i, i + 5, f"w{i}")
+    twin = tree.copy()
+    assert list(twin.intervals()) == list(tree.intervals())
+    less, greater = twin.split((10,))
+    assert list(less.stab(9))[-1] == (9, 14, "w9")
+    assert list(greater.stab(10)) == [(10, 15, "w10")]
+
+
+def test_half_open_boundaries():
+    tree = IntervalTree()
+    tree.add(0, 10, "a")
+    tree.add(10, 20, "b")
+    for start, end in ((5, 5), (6, 5)):
+        with pytest.raises(ValueError):
+            tree.add(start, end)
+    assert len(tree) == 2
+    assert [item for _, _, item in tree.stab(10)] == ["b"]
+    assert [item for _, _, item in tree.stab(0)] == ["a"]
+    assert list(tree.stab(20)) == []
+    assert [item for _, _, item in tree.overlapping(9, 10)] == ["a"]
+    assert [item for _, _, item in tree.overlapping(10, 11)] == ["b"]
+    assert list(tree.overlapping(5, 5)) == []
+    assert list(tree.overlapping(20, 30)) == []
+
+
+class CountingNode(MapNode):
+    __slots__ = ('_agg',)
+    reads = 0
+
+    @property
+    def agg(self):
+        CountingNode.reads += 1
+        return self._agg
+
+    @agg.setter
+    def agg(self, value):
+        self._agg = value
+
+
+class CountingTree(IntervalTree):
+    def _node(self, key):
+        node = CountingNode(key)
+        node.agg = self.monoid.measure(key)
+        return node
+
+
+def test_queries_visit_few_nodes():
+    tree = CountingTree()
+    for i in range(1 << 14):
+        tree.add(2 * i, 2 * i + 1, i)
+    height = tree.root.height
+    for lo in (0, 5_000, 32_000):
+        CountingNode.reads = 0
+        found = list(tree.overlapping(lo, lo + 20))
+        assert len(found) == 10
+        assert CountingNode.reads <= 2 * height + 2 * len(found)
@@ -0,0 +1,105 @@
+"""TTL expiry of LRUCache and its TimerWheel, driven by a fake clock."""
+
+import pytest
+
+from lru_cache import LRUCache, RemovalCause, TimerWheel
+
+
+class FakeClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_wheel_releases_keys_once_their_tick_has_passed():
+    wheel = TimerWheel(tick=1.0, slots=4, levels=3)
+    wheel.schedule("a", 1.5)
+    wheel.schedule("b", 3.0)
+    wheel.schedule("c", 40.0)  # Beyond the first two levels
+    assert wheel.advance(1.0) == []
+    assert wheel.advance(2.0) == ["a"]
+    assert wheel.advance(3.0) == ["b"]
+    assert wheel.advance(39.0) == []
+    assert wheel.advance(40.0) == ["c"]
+    assert len(wheel) == 0
+
+
+def test_wheel_cancel_and_reschedule():
+    wheel = TimerWheel(tick=1.0, slots=4, levels=2)
+    wheel.schedule("a", 2.0)
+    wheel.schedule("a", 10.0)
+    assert wheel.advance(5.0) == []
+    wheel.cancel("a")
+    assert wheel.advance(20.0) == []
+    assert len(wheel) == 0
+
+
+def test_wheel_rebuilds_after_idling_past_its_horizon():
+    wheel = TimerWheel(tick=1.0, slots=4, levels=2)  # Horizon of 16 ticks
+    wheel.schedule("soon", 3.0)
+    wheel.schedule("later", 100.0)
+    assert wheel.advance(50.0) == ["soon"]
+    assert wheel.advance(100.0) == ["later"]
+
+
+def test_wheel_upcoming_includes_coarse_buckets_due_next_tick():
+    wheel = TimerWheel(tick=1.0, slots=4, levels=3)
+    wheel.schedule("a", 3.5)  # Tick 4 sits in a level-1 bucket
+    wheel.advance(3.0)
+    assert wheel.upcoming() == ["a"]
+
+
+def test_get_expires_entries_at_their_deadline(clock):
+    cache = LRUCache(10, clock=clock)
+    cache.put("a", 1, ttl=5)
+    clock.now = 4.9
+    assert cache.get("a") == 1
+    clock.now = 5.0
+    assert cache.get("a") is None
+
+
+def test_default_ttl_and_override(clock):
+    cache = LRUCache(10, default_ttl=2, clock=clock)
+    cache.put("short", 1)
+    cache.put("long", 2, ttl=10)
+    clock.now = 3
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+
+
+def test_listing_agrees_with_get_inside_a_tick(clock):
+    cache = LRUCache(10, clock=clock)
+    cache.put("a", 1, ttl=0.3)
+    cache.put("b", 2, ttl=63.5)  # Lands in a coarse bucket
+    cache.put("c", 3)
+    clock.now = 0.5
+    assert cache.get("a") is None
+    assert list(cache.keys()) == ["b", "c"]
+    clock.now = 63.7
+    assert len(cache) == 1
+    assert list(cache.items()) == [("c", 3)]
+
+
+def test_purge_expired_reports_removals(clock):
+    cache = LRUCache(10, clock=clock)
+    removed = []
+    cache.add_removal_listener(lambda key, value, cause: removed.append((key, cause)))
+    for i in range(5):
+        cache.put(f"k{i}", i, ttl=i + 1)
+    clock.now = 3
+    assert cache.purge_expired() == 3
+    assert cache.drain(timeout=5)
+    assert sorted(removed) == [(f"k{i}", RemovalCause.EXPIRED) for i in range(3)]
+
+
+def test_non_positive_ttl_is_rejected(clock):
+    cache = LRUCache(10, clock=clock)
+    with pytest.raises(ValueError):
+        cache.put("a", 1, ttl=0)
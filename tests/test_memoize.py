@@ -0,0 +1,124 @@
+"""@memoize keys, caching behaviour and invalidation."""
+
+import asyncio
+import copy
+
+import pytest
+
+from lru_cache import CacheStats
+from memoize import make_key, memoize, normalize
+
+
+@pytest.mark.parametrize("a, b", [
+    ({1: 2}, {(1, 2)}),
+    ([1, 2], (1, 2)),
+    ({1, 2}, frozenset({1, 2})),
+    (bytearray(b"ab"), b"ab"),
+    ([[1], [2]], [(1,), (2,)]),
+    (("list", (1, 2)), [1, 2]),
+])
+def test_containers_of_different_types_get_different_keys(a, b):
+    assert normalize(a) != normalize(b)
+
+
+@pytest.mark.parametrize("value", [[1, [2, 3]], {"a": [1], "b": {2}}, {1, 2}, (1, "x"), b"x"])
+def test_equal_arguments_get_equal_hashable_keys(value):
+    key = normalize(value)
+    hash(key)
+    assert key == normalize(copy.deepcopy(value))
+
+
+def test_dict_keys_ignore_insertion_order():
+    assert normalize({"a": 1, "b": 2}) == normalize({"b": 2, "a": 1})
+    assert make_key((), {"x": 1, "y": 2}) == make_key((), {"y": 2, "x": 1})
+
+
+def test_unhashable_objects_are_rejected():
+    class Unhashable:
+        __hash__ = None
+
+    with pytest.raises(TypeError):
+        normalize(Unhashable())
+
+
+def test_typed_separates_equal_values_of_different_types():
+    assert make_key((1,), {}) == make_key((1.0,), {})
+    assert make_key((1,), {}, typed=True) != make_key((1.0,), {}, typed=True)
+
+
+def test_memoized_function_sees_argument_types():
+    @memoize()
+    def kind(value):
+        return type(value).__name__
+
+    assert kind({1: 2}) == "dict"
+    assert kind({(1, 2)}) == "set"
+    assert kind([1]) == "list"
+    assert kind((1,)) == "tuple"
+
+
+def test_results_are_cached_and_exceptions_are_not():
+    calls = []
+
+    @memoize(maxsize=2)
+    def square(x):
+        calls.append(x)
+        if x < 0:
+            raise ValueError(x)
+        return x * x
+
+    assert square(3) == 9 and square(3) == 9
+    assert calls == [3]
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            square(-1)
+    assert calls == [3, -1, -1]
+
+
+def test_invalidate_invalidate_if_and_clear():
+    @memoize()
+    def ident(x, scale=1):
+        return x * scale
+
+    for i in range(5):
+        ident(i)
+    ident([1], scale=2)
+    assert ident.invalidate(0)
+    assert not ident.invalidate(0)
+    assert ident.invalidate_if(lambda args, kwargs: kwargs.get("scale") == 2) == 1
+    assert ident.invalidate_if(lambda args, kwargs: args[0] >= 3) == 2
+    assert len(ident.cache) == 2
+    ident.cache_clear()
+    assert len(ident.cache) == 0
+
+
+def test_weight_budget_and_stats():
+    stats = CacheStats()
+
+    @memoize(weigher=lambda key, value: len(value), max_weight=10, stats=stats)
+    def blob(n):
+        return "x" * n
+
+    blob(4)
+    blob(4)
+    blob(8)
+    assert blob.cache.weight <= 10
+    snapshot = stats.snapshot()
+    assert snapshot["hits"] == 1
+    assert snapshot["loads"]["count"] == 2
+
+
+def test_async_functions_share_one_call():
+    calls = []
+
+    @memoize()
+    async def fetch(x):
+        calls.append(x)
+        await asyncio.sleep(0.01)
+        return x + 1
+
+    async def main():
+        return await asyncio.gather(*(fetch(1) for _ in range(5)))
+
+    assert asyncio.run(main()) == [2] * 5
+    assert calls == [1]
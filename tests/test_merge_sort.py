@@ -0,0 +1,150 @@
+"""merge_sort and parallel_merge_sort against sorted() on lists, arrays and adversarial run patterns."""
+
+import random
+from array import array
+from collections import UserList
+
+import pytest
+
+import merge_sort as module
+from merge_sort import MIN_RUN, merge_sort, parallel_merge_sort
+
+rng = random.Random(12)
+
+INPUTS = {
+    "empty": [],
+    "single": [1],
+    "random": [rng.randrange(1_000) for _ in range(2_000)],
+    "sorted": list(range(1_000)),
+    "descending": list(range(1_000, 0, -1)),
+    "equal": [7] * 500,
+    "runs": [i % 97 for i in range(3_000)],
+    "short": [rng.random() for _ in range(MIN_RUN - 1)],
+    "floats": [rng.uniform(-1, 1) for _ in range(1_500)],
+    "strings": [rng.choice("abcde") * rng.randrange(1, 4) for _ in range(800)],
+}
+
+
+@pytest.mark.parametrize("name", INPUTS)
+@pytest.mark.parametrize("reverse", [False, True])
+def test_matches_sorted(name, reverse):
+    data = list(INPUTS[name])
+    merge_sort(data, reverse=reverse)
+    assert data == sorted(INPUTS[name], reverse=reverse)
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_key_is_stable(reverse):
+    data = [(rng.randrange(10), i) for i in range(2_000)]
+    expected = sorted(data, key=lambda pair: pair[0], reverse=reverse)
+    merge_sort(data, key=lambda pair: pair[0], reverse=reverse)
+    assert data == expected
+
+
+def test_key_is_called_once_per_item():
+    calls = []
+
+    def key(item):
+        calls.append(item)
+        return -item
+
+    data = list(range(300))
+    merge_sort(data, key=key)
+    assert data == list(range(299, -1, -1))
+    assert len(calls) == 300
+
+
+@pytest.mark.parametrize("typecode", ["i", "q", "d", "B"])
+def test_arrays_sort_in_place(typecode):
+    values = [rng.randrange(256) for _ in range(2_000)]
+    data = array(typecode, values)
+    merge_sort(data)
+    assert data == array(typecode, sorted(values))
+    merge_sort(data, key=lambda x: x % 10, reverse=True)
+    assert list(data) == sorted(sorted(values), key=lambda x: x % 10, reverse=True)
+
+
+@pytest.mark.parametrize("workers", [2, 3, 4])
+@pytest.mark.parametrize("values", [
+    [rng.random() for _ in range(5_000)],
+    [rng.randrange(-10**12, 10**12) for _ in range(5_000)],
+    [rng.randrange(50) for _ in range(4_999)],
+])
+def test_parallel_matches_sorted(values, workers):
+    data = list(values)
+    parallel_merge_sort(data, workers=workers, threshold=100)
+    assert data == sorted(values)
+    assert [type(x) for x in data] == [type(x) for x in sorted(values)]
+
+
+@pytest.mark.parametrize("typecode", ["i", "d"])
+def test_parallel_sorts_arrays_in_place(typecode):
+    values = array(typecode, (rng.randrange(-1_000, 1_000) for _ in range(3_000)))
+    data = array(typecode, values)
+    parallel_merge_sort(data, workers=3, threshold=100)
+    assert data == array(typecode, sorted(values))
+
+
+@pytest.mark.parametrize("values", [
+    [1, 2.5, -3, 0.25] * 500,  # Mistura de int e float: nada vira float
+    [2**70, -2**64, 5, 1] * 500,  # Fora de int64
+    ["b", "a", "c"] * 500,
+    [True, False, 1, 0] * 500,
+])
+def test_values_without_a_typecode_sort_serially(values):
+    data = list(values)
+    parallel_merge_sort(data, workers=2, threshold=100)
+    assert data == sorted(values)
+    assert [type(x) for x in data] == [type(x) for x in sorted(values)]
+
+
+def test_typecode_choice():
+    assert module._typecode([1.0, 2.0]) == "d"
+    assert module._typecode([1, -2**63, 2**63 - 1]) == "q"
+    assert module._typecode([1, 2.0]) is None
+    assert module._typecode([2**63]) is None
+    assert module._typecode(["a"]) is None
+    assert module._typecode(UserList([1.0, 2.0])) is None
+    assert module._typecode((1.0, 2.0)) is None
+    assert module._typecode(array("h", [1])) == "h"
+    with pytest.raises(TypeError):
+        module._typecode(memoryview(b"abcd").cast("B", (2, 2)))
+
+
+def test_thread_fallback_matches_sorted():
+    values = [rng.random() for _ in range(3_000)]
+    data = list(values)
+    source = array("d", data)
+    module._thread_sort(data, source, "d", len(data), 3)
+    assert data == sorted(values)
+
+
+def test_without_shared_memory_threads_are_used(monkeypatch):
+    monkeypatch.setattr(module, "shared_memory", None)
+    values = [rng.randrange(1_000) for _ in range(3_000)]
+    data = list(values)
+    parallel_merge_sort(data, workers=2, threshold=100)
+    assert data == sorted(values)
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_numpy_arrays_sort_in_place(reverse):
+    np = pytest.importorskip("numpy")
+    values = [rng.uniform(-5, 5) for _ in range(1_000)]
+    data = np.array(values)
+    merge_sort(data, reverse=reverse)
+    assert data.tolist() == sorted(values, reverse=reverse)
+    small = np.array([3.0, 1.0, 2.0])
+    merge_sort(small, key=lambda x: -x, reverse=reverse)
+    assert small.tolist() == sorted([3.0, 1.0, 2.0], key=lambda x: -x, reverse=reverse)
+
+
+def test_parallel_sorts_other_sequences_serially():
+    values = [rng.random() for _ in range(2_000)]
+    data = UserList(values)
+    parallel_merge_sort(data, workers=2, threshold=100)
+    assert list(data) == sorted(values)
+    ordered = tuple(sorted(values))
+    parallel_merge_sort(ordered, workers=2, threshold=100)  # Already sorted: nothing to write
+    with pytest.raises(TypeError):
+        parallel_merge_sort((3.0, 1.0, 2.0), workers=2, threshold=1)  # Tuples cannot be sorted in place
@@ -0,0 +1,135 @@
+"""NamespacedLRUCache quotas, borrowing and namespace lifecycle."""
+
+import time
+
+import pytest
+
+from lru_cache import NamespacedLRUCache
+
+
+def fill(cache, namespace, count, start=0):
+    for i in range(start, start + count):
+        cache.put(namespace, f"{namespace}{i}", i)
+
+
+def check_accounting(cache):
+    assert len(cache) == sum(len(ns.cache) for ns in cache._namespaces.values())
+    for name, ns in cache._namespaces.items():
+        assert cache._excess[name] == len(ns.cache) - cache._quotas[name][0]
+        assert name in cache._by_excess[cache._excess[name]]
+    assert cache._top >= max(cache._excess.values(), default=cache._top)
+
+
+def test_borrowed_space_is_reclaimed_first():
+    cache = NamespacedLRUCache(10)
+    cache.add_namespace("a", min_share=0.5)
+    cache.add_namespace("b", min_share=0.3)
+    fill(cache, "b", 10)  # b borrows everything
+    assert len(cache) == 10
+    fill(cache, "a", 5)
+    assert len(cache) == 10
+    assert cache.stats()["a"]["size"] == 5
+    assert cache.stats()["b"]["size"] == 5
+    fill(cache, "a", 5, start=5)  # Once both borrow as much, a evicts its own entries
+    assert cache.stats()["b"]["size"] == 4
+    assert cache.stats()["a"]["size"] == 6
+    cache.add_namespace("a", min_share=0.7)
+    fill(cache, "a", 5, start=10)  # a may take b down to its minimum, never below
+    assert cache.stats()["b"]["size"] == 3
+    assert cache.stats()["a"]["size"] == 7
+    check_accounting(cache)
+
+
+def test_max_share_caps_a_namespace():
+    cache = NamespacedLRUCache(10)
+    cache.add_namespace("a", max_share=0.3)
+    fill(cache, "a", 10)
+    assert cache.stats()["a"]["size"] == 3
+    assert [cache.get("a", f"a{i}") for i in range(7, 10)] == [7, 8, 9]
+
+
+def test_minimums_cannot_exceed_capacity():
+    cache = NamespacedLRUCache(10)
+    cache.add_namespace("a", min_share=0.6)
+    with pytest.raises(ValueError):
+        cache.add_namespace("b", min_share=0.5)
+    cache.add_namespace("a", min_share=0.4)  # Changing a quota frees its old reservation
+    cache.add_namespace("b", min_share=0.5)
+    with pytest.raises(ValueError):
+        cache.add_namespace("c", min_share=0.5, max_share=0.2)
+
+
+def test_quota_change_trims_the_namespace():
+    cache = NamespacedLRUCache(10)
+    fill(cache, "a", 8)
+    cache.add_namespace("a", max_share=0.5)
+    assert cache.stats()["a"]["size"] == 5
+    check_accounting(cache)
+
+
+def test_auto_created_namespaces_are_dropped_when_empty():
+    cache = NamespacedLRUCache(4)
+    cache.add_namespace("pinned", min_share=1.0)
+    fill(cache, "s1", 2)
+    fill(cache, "s2", 2)
+    assert set(cache.namespaces()) == {"pinned", "s1", "s2"}
+    cache.invalidate("s1", "s10")
+    cache.invalidate("s1", "s11")
+    assert "s1" not in cache.namespaces()
+    fill(cache, "s3", 2)
+    fill(cache, "pinned", 4)  # Reclaims every borrowed entry
+    assert cache.namespaces() == ["pinned"]
+    fill(cache, "s4", 1)
+    cache.clear()
+    assert cache.namespaces() == ["pinned"]
+    assert len(cache) == 0
+    check_accounting(cache)
+
+
+def test_expired_last_entry_drops_an_auto_namespace():
+    cache = NamespacedLRUCache(4)
+    cache.put("s", "k", 1, ttl=0.05)
+    time.sleep(0.1)
+    assert cache.get("s", "k") is None
+    assert cache.namespaces() == []
+    assert len(cache) == 0
+
+
+def test_many_sessions_keep_accounting_consistent():
+    cache = NamespacedLRUCache(50)
+    cache.add_namespace("system", min_share=0.2)
+    fill(cache, "system", 10)
+    for session in range(500):
+        fill(cache, f"s{session}", 3)
+        if session % 7 == 0:
+            cache.put(f"s{session}", f"s{session}0", "updated")
+    assert len(cache) == 50
+    assert cache.stats()["system"]["size"] == 10
+    assert all(len(ns.cache) for ns in cache._namespaces.values())
+    assert len(cache.namespaces()) <= 41
+    check_accounting(cache)
+
+
+def test_remove_namespace_releases_its_entries_and_reservation():
+    cache = NamespacedLRUCache(10)
+    cache.add_namespace("a", min_share=1.0)
+    fill(cache, "a", 4)
+    cache.remove_namespace("a")
+    assert len(cache) == 0
+    cache.add_namespace("b", min_share=1.0)
+    check_accounting(cache)
+
+
+def test_full_cache_of_minimums_refuses_a_new_namespace():
+    cache = NamespacedLRUCache(10)
+    cache.add_namespace("a", min_share=0.6)
+    cache.add_namespace("b", min_share=0.4)
+    fill(cache, "a", 6)
+    fill(cache, "b", 4)
+    assert not cache.put("c", "c0", 0)
+    assert len(cache) <= cache.capacity
+    assert "c" not in cache.namespaces()
+    assert cache.put("a", "a99", 99)  # A namespace at its minimum still replaces its own entries
+    assert len(cache) == 10
+    assert cache.stats()["a"]["size"] == 6
+    check_accounting(cache)
@@ -0,0 +1,116 @@
+"""PersistentAVLTree: path copying keeps every published version intact."""
+
+import random
+import threading
+
+import pytest
+
+from avl_helpers import check_avl
+from avl_tree import AVLTree, PersistentAVLTree
+
+
+def build(keys):
+    tree = PersistentAVLTree()
+    for key in keys:
+        tree.insert_key(key)
+    return tree
+
+
+def test_snapshots_survive_inserts_and_deletes():
+    rng = random.Random(4)
+    keys = rng.sample(range(5_000), 1_000)
+    tree = PersistentAVLTree()
+    history = []
+    for key in keys:
+        tree.insert_key(key)
+        if len(history) < 20 and rng.random() < 0.05:
+            history.append((tree.snapshot(), sorted(check_avl(tree))))
+    for key in keys[:500]:
+        tree.delete_key(key)
+    assert check_avl(tree) == sorted(keys[500:])
+    for snapshot, expected in history:
+        assert check_avl(snapshot) == expected
+
+
+def test_insert_and_delete_return_nodes_and_bump_the_version():
+    tree = PersistentAVLTree()
+    node = tree.insert_key(3)
+    assert node.key == 3 and tree.version == 1
+    assert tree.insert_key(3) is node and tree.version == 1
+    assert tree.delete_key(7) is None and tree.version == 1
+    assert tree.delete_key(3) is node and tree.version == 2
+    assert tree.root is None
+
+
+def test_split_and_join_leave_their_inputs_intact():
+    tree = build(range(0, 400, 2))
+    before = tree.snapshot()
+    for pivot in (-1, 0, 101, 200, 398, 1_000):
+        less, greater = tree.split(pivot)
+        assert check_avl(less) == [k for k in range(0, 400, 2) if k < pivot]
+        assert check_avl(greater) == [k for k in range(0, 400, 2) if k >= pivot]
+        joined = PersistentAVLTree.join(less, greater)
+        assert check_avl(joined) == list(range(0, 400, 2))
+        assert check_avl(less) == [k for k in range(0, 400, 2) if k < pivot]
+    assert check_avl(tree) == list(range(0, 400, 2))
+    assert tree.root is before.root
+    less, greater = tree.split(100)
+    with pytest.raises(ValueError):
+        PersistentAVLTree.join(greater, less)
+
+
+@pytest.mark.parametrize("sizes", [(0, 50), (50, 0), (10, 400), (400, 10), (300, 300)])
+def test_set_operations_match_python_sets(sizes):
+    rng = random.Random(sum(sizes))
+    a_keys = set(rng.sample(range(1_000), sizes[0]))
+    b_keys = set(rng.sample(range(1_000), sizes[1]))
+    a = PersistentAVLTree.from_sorted(sorted(a_keys))
+    b = PersistentAVLTree.from_sorted(sorted(b_keys))
+    assert check_avl(a.union(b)) == sorted(a_keys | b_keys)
+    assert check_avl(a.intersection(b)) == sorted(a_keys & b_keys)
+    assert check_avl(a.difference(b)) == sorted(a_keys - b_keys)
+    assert check_avl(a) == sorted(a_keys)
+    assert check_avl(b) == sorted(b_keys)
+
+
+def test_mutable_operands_are_rejected():
+    with pytest.raises(TypeError):
+        build([1]).union(AVLTree.from_sorted([2]))
+    with pytest.raises(TypeError):
+        PersistentAVLTree.join(build([1]), AVLTree.from_sorted([2]))
+
+
+def test_delete_range_publishes_a_new_version():
+    tree = build(range(100))
+    snapshot = tree.snapshot()
+    removed = tree.delete_range(20, 30, inclusive=(True, False))
+    assert check_avl(removed) == list(range(20, 30))
+    assert check_avl(tree) == [k for k in range(100) if not 20 <= k < 30]
+    assert tree.version == snapshot.version + 1
+    assert check_avl(snapshot) == list(range(100))
+    assert tree.delete_range(20, 29).root is None
+    assert tree.version == snapshot.version + 1
+
+
+def test_readers_see_whole_versions_while_a_writer_runs():
+    tree = build(range(0, 1_000, 2))
+    stop = threading.Event()
+    errors = []
+
+    def reader():
+        while not stop.is_set():
+            keys = list(tree.snapshot())
+            if keys != sorted(keys) or len(keys) not in (499, 500):
+                errors.append(keys)
+
+    readers = [threading.Thread(target=reader) for _ in range(2)]
+    for thread in readers:
+        thread.start()
+    for key in range(0, 1_000, 2):
+        tree.delete_key(key)
+        tree.insert_key(key + 1)
+    stop.set()
+    for thread in readers:
+        thread.join()
+    assert not errors
+    assert check_avl(tree) == list(range(1, 1_000, 2))
@@ -0,0 +1,109 @@
+"""Removal listeners of LRUCache and ConcurrentLRUCache."""
+
+import pickle
+import threading
+
+from lru_cache import ConcurrentLRUCache, LRUCache, RemovalCause
+
+
+class Recorder:
+    def __init__(self):
+        self.events = []
+        self.threads = set()
+
+    def __call__(self, key, value, cause):
+        self.events.append((key, value, cause))
+        self.threads.add(threading.current_thread())
+
+
+def test_every_cause_is_reported_in_order():
+    now = [0.0]
+    cache = LRUCache(2, clock=lambda: now[0])
+    recorder = Recorder()
+    cache.add_removal_listener(recorder)
+    cache.put("a", 1)
+    cache.put("a", 2)  # REPLACED
+    cache.put("a", 2)  # Same object: nothing to release
+    cache.put("b", 3, ttl=1)
+    cache.put("c", 4)  # Evicts a
+    now[0] = 2
+    assert cache.get("b") is None  # EXPIRED
+    cache.invalidate("c")
+    cache.put("d", 5)
+    cache.clear()
+    assert cache.drain(timeout=5)
+    assert recorder.events == [
+        ("a", 1, RemovalCause.REPLACED),
+        ("a", 2, RemovalCause.SIZE),
+        ("b", 3, RemovalCause.EXPIRED),
+        ("c", 4, RemovalCause.EXPLICIT),
+        ("d", 5, RemovalCause.EXPLICIT),
+    ]
+    assert all(thread.name.startswith("lru-cache-release") for thread in recorder.threads)
+
+
+def test_rejected_update_reports_the_old_value_as_explicit():
+    cache = LRUCache(10, weigher=lambda key, value: len(value), max_weight=5)
+    recorder = Recorder()
+    cache.add_removal_listener(recorder)
+    cache.put("a", "abc")
+    assert not cache.put("a", "too heavy")
+    assert cache.get("a") is None
+    assert cache.drain(timeout=5)
+    assert recorder.events == [("a", "abc", RemovalCause.EXPLICIT)]
+
+
+def test_failing_listener_does_not_break_the_cache():
+    cache = LRUCache(1)
+    cache.add_removal_listener(lambda key, value, cause: 1 / 0)
+    recorder = Recorder()
+    cache.add_removal_listener(recorder)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.drain(timeout=5)
+    assert recorder.events == [("a", 1, RemovalCause.SIZE)]
+
+
+def test_removed_listener_is_not_called():
+    cache = LRUCache(1)
+    recorder = Recorder()
+    cache.add_removal_listener(recorder)
+    cache.remove_removal_listener(recorder)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.drain(timeout=5)
+    assert recorder.events == []
+
+
+def test_concurrent_cache_shares_one_release_thread():
+    cache = ConcurrentLRUCache(16, segments=8)
+    recorder = Recorder()
+    cache.add_removal_listener(recorder)
+    before = set(threading.enumerate())
+    for i in range(200):
+        cache.put(f"k{i}", i)
+    assert cache.drain(timeout=5)
+    started = set(threading.enumerate()) - before
+    assert len([thread for thread in started if thread.name.startswith("lru-cache-release")]) == 1
+    assert len(recorder.threads) == 1
+    assert len(recorder.events) == 200 - 16
+
+
+def test_restored_values_never_loaded_are_not_reported(tmp_path):
+    path = str(tmp_path / "cache.snap")
+    source = LRUCache(4)
+    for key in "abc":
+        source.put(key, key.upper())
+    source.save_snapshot(path, pickle)
+    cache = LRUCache(4)
+    recorder = Recorder()
+    cache.add_removal_listener(recorder)
+    cache.load_snapshot(path, pickle, warm="lazy")
+    cache.put("a", "new")  # Overwrites a value that was never loaded
+    cache.load_snapshot(path, pickle, warm="lazy")  # Replaces b and c, still cold
+    assert cache.get("a") == "A"
+    cache.put("a", "newer")  # a was loaded by the get above: reported
+    assert cache.drain(timeout=5)
+    assert recorder.events == [("a", "new", RemovalCause.REPLACED),
+                               ("a", "A", RemovalCause.REPLACED)]
+    assert cache._cold == 2
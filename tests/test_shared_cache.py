@@ -0,0 +1,91 @@
+"""SharedMemoryCache: entries shared across processes in one segment."""
+
+import multiprocessing
+import os
+import subprocess
+import sys
+import uuid
+
+import pytest
+
+from shared_cache import SharedMemoryCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    name = f"lru-test-{uuid.uuid4().hex[:12]}"
+    cache = SharedMemoryCache(name, slots=32, slot_size=128, ways=4,
+                              lock_path=str(tmp_path / "cache.lock"))
+    yield cache
+    cache.close()
+    cache.unlink()
+
+
+def _child_put(name, lock_path):
+    child = SharedMemoryCache(name, lock_path=lock_path)
+    child.put("from-child", b"hello")
+    child.close()
+
+
+def test_put_get_invalidate(cache):
+    assert cache.put("a", b"1")
+    assert cache.put("a", b"2")
+    assert cache.get("a") == b"2"
+    assert len(cache) == 1
+    assert cache.invalidate("a")
+    assert not cache.invalidate("a")
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_oversized_entries_are_refused(cache):
+    assert not cache.put("big", b"x" * 200)
+    assert cache.get("big") is None
+
+
+def test_capacity_is_bounded_by_clock_eviction(cache):
+    for i in range(200):
+        cache.put(f"k{i}", str(i).encode())
+    assert len(cache) == cache.slots
+    assert len(cache.keys()) == cache.slots
+    for key, value in cache.items():
+        assert value == key[1:].encode()
+
+
+def test_clear(cache):
+    for i in range(10):
+        cache.put(f"k{i}", b"v")
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.items() == []
+
+
+def test_entries_are_visible_to_other_processes(cache, tmp_path):
+    process = multiprocessing.get_context("spawn").Process(
+        target=_child_put, args=(cache.name, str(tmp_path / "cache.lock")))
+    process.start()
+    process.join(30)
+    assert process.exitcode == 0
+    assert cache.get("from-child") == b"hello"
+
+
+@pytest.mark.parametrize("ways", [0, 257])
+def test_ways_out_of_range(ways, tmp_path):
+    with pytest.raises(ValueError):
+        SharedMemoryCache("unused", ways=ways, lock_path=str(tmp_path / "lock"))
+
+
+def test_unlink_does_not_upset_the_resource_tracker(tmp_path):
+    script = (
+        "from shared_cache import SharedMemoryCache\n"
+        f"cache = SharedMemoryCache('lru-test-{uuid.uuid4().hex[:12]}', slots=8, slot_size=64,"
+        f" ways=2, lock_path={str(tmp_path / 'lock')!r})\n"
+        "cache.put('a', b'1')\n"
+        "cache.close()\n"
+        "cache.unlink()\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            timeout=60)
+    assert result.returncode == 0
+    assert "Traceback" not in result.stderr
@@ -0,0 +1,144 @@
+"""Single-flight loading of LRUCache.get_or_load and aget_or_load."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from lru_cache import CacheStats, ConcurrentLRUCache, LRUCache
+
+
+def run_threads(count, target):
+    barrier = threading.Barrier(count)
+    results, errors = [], []
+
+    def worker():
+        barrier.wait()
+        try:
+            results.append(target())
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+@pytest.mark.parametrize("factory", [lambda: LRUCache(10), lambda: ConcurrentLRUCache(10, segments=4)])
+def test_concurrent_misses_call_the_loader_once(factory):
+    cache = factory()
+    calls = []
+
+    def loader(key):
+        calls.append(key)
+        time.sleep(0.05)
+        return f"model:{key}"
+
+    results, errors = run_threads(16, lambda: cache.get_or_load("m", loader))
+    assert errors == []
+    assert results == ["model:m"] * 16
+    assert calls == ["m"]
+    assert cache.get("m") == "model:m"
+
+
+def test_loader_exception_reaches_every_waiter_and_is_not_cached():
+    cache = LRUCache(10)
+    calls = []
+
+    def failing(key):
+        calls.append(key)
+        time.sleep(0.05)
+        raise RuntimeError("load failed")
+
+    results, errors = run_threads(8, lambda: cache.get_or_load("m", failing))
+    assert results == []
+    assert len(errors) == 8 and all(isinstance(e, RuntimeError) for e in errors)
+    assert calls == ["m"]
+    assert cache._inflight == {}
+    assert cache.get_or_load("m", lambda key: "ok") == "ok"
+
+
+def test_hits_do_not_call_the_loader():
+    cache = LRUCache(10)
+    cache.put("m", None)
+    assert cache.get_or_load("m", lambda key: pytest.fail("loader called on a hit")) is None
+
+
+def test_refresh_after_returns_stale_value_and_reloads_in_background():
+    now = [0.0]
+    cache = LRUCache(10, clock=lambda: now[0])
+    versions = iter(["v1", "v2"])
+    reloaded = threading.Event()
+
+    def loader(key):
+        value = next(versions)
+        if value == "v2":
+            reloaded.set()
+        return value
+
+    assert cache.get_or_load("m", loader, refresh_after=10) == "v1"
+    now[0] = 11
+    assert cache.get_or_load("m", loader, refresh_after=10) == "v1"
+    assert reloaded.wait(5)
+    for _ in range(100):
+        if cache.get("m") == "v2":
+            break
+        time.sleep(0.01)
+    assert cache.get("m") == "v2"
+
+
+def test_stats_record_loads_and_failures():
+    stats = CacheStats()
+    cache = LRUCache(10, stats=stats)
+    cache.get_or_load("a", lambda key: 1)
+    with pytest.raises(ValueError):
+        cache.get_or_load("b", lambda key: (_ for _ in ()).throw(ValueError("boom")))
+    loads = stats.snapshot()["loads"]
+    assert loads["count"] == 2
+    assert loads["failures"] == 1
+
+
+def test_async_concurrent_misses_share_one_load():
+    cache = LRUCache(10)
+    calls = []
+
+    async def loader(key):
+        calls.append(key)
+        await asyncio.sleep(0.02)
+        return key.upper()
+
+    async def main():
+        return await asyncio.gather(*(cache.aget_or_load("m", loader) for _ in range(10)))
+
+    assert asyncio.run(main()) == ["M"] * 10
+    assert calls == ["m"]
+
+
+def test_async_exception_propagates_and_cancelling_a_waiter_keeps_the_load():
+    cache = LRUCache(10)
+
+    async def failing(key):
+        await asyncio.sleep(0.01)
+        raise KeyError(key)
+
+    async def slow(key):
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        results = await asyncio.gather(*(cache.aget_or_load("x", failing) for _ in range(3)),
+                                       return_exceptions=True)
+        assert all(isinstance(result, KeyError) for result in results)
+        first = asyncio.ensure_future(cache.aget_or_load("y", slow))
+        second = asyncio.ensure_future(cache.aget_or_load("y", slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == "done"
+
+    asyncio.run(main())
+    assert cache.get("x") is None
+    assert cache.get("y") == "done"
@@ -0,0 +1,122 @@
+"""LRUCache.save_snapshot / load_snapshot round-trips and warm restarts."""
+
+import json
+import pickle
+import threading
+import time
+
+import pytest
+
+from lru_cache import SNAPSHOT_MAGIC, LRUCache
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "cache.snap")
+
+
+def filled(count=20, **options):
+    cache = LRUCache(max(count, 1), **options)
+    for i in range(count):
+        cache.put(f"k{i}", {"id": i, "name": f"model-{i}"})
+    return cache
+
+
+@pytest.mark.parametrize("serializer", [pickle, json])
+@pytest.mark.parametrize("warm", ["eager", "lazy", "background"])
+def test_round_trip_keeps_values_and_recency(path, serializer, warm):
+    cache = filled()
+    cache.get("k0")  # Most recently used now
+    assert cache.save_snapshot(path, serializer) == 20
+    restored = LRUCache(100)
+    assert restored.load_snapshot(path, serializer, warm=warm) == 20
+    assert list(restored.keys()) == list(cache.keys())
+    assert restored.get("k3") == {"id": 3, "name": "model-3"}
+    assert dict(restored.items()) == dict(cache.items())
+
+
+def test_file_starts_with_the_magic(path):
+    filled().save_snapshot(path)
+    with open(path, "rb") as f:
+        assert f.read(len(SNAPSHOT_MAGIC)) == SNAPSHOT_MAGIC
+
+
+def test_key_only_snapshot_uses_the_loader(path):
+    filled(5).save_snapshot(path)
+    restored = LRUCache(100)
+    restored.load_snapshot(path, loader=lambda key: key.upper())
+    assert list(restored.items()) == [(f"k{i}", f"K{i}") for i in range(5)]
+    with pytest.raises(ValueError):
+        LRUCache(100).load_snapshot(path, serializer=pickle)
+
+
+def test_only_the_most_recent_entries_fit(path):
+    filled(20).save_snapshot(path, pickle)
+    restored = LRUCache(5)
+    assert restored.load_snapshot(path, pickle) == 5
+    assert list(restored.keys()) == [f"k{i}" for i in range(15, 20)]
+
+
+def test_expired_entries_are_skipped_and_ttls_carry_over(path):
+    now = [0.0]
+    cache = LRUCache(10, clock=lambda: now[0])
+    cache.put("short", 1, ttl=5)
+    cache.put("long", 2, ttl=50)
+    cache.put("forever", 3)
+    now[0] = 10
+    cache.save_snapshot(path, pickle)
+    later = [100.0]
+    restored = LRUCache(10, clock=lambda: later[0])
+    assert restored.load_snapshot(path, pickle) == 2
+    later[0] = 139
+    assert restored.get("long") == 2
+    later[0] = 141
+    assert restored.get("long") is None
+    assert restored.get("forever") == 3
+
+
+def test_background_warm_up_never_loads_a_key_twice(path):
+    filled(200).save_snapshot(path)
+    calls = {}
+    lock = threading.Lock()
+
+    def loader(key):
+        with lock:
+            calls[key] = calls.get(key, 0) + 1
+        time.sleep(0.0005)
+        return key
+
+    restored = LRUCache(300)
+    restored.load_snapshot(path, loader=loader, warm="background")
+    for i in range(200):
+        assert restored.get(f"k{i}") == f"k{i}"
+    for _ in range(200):
+        if not restored._cold:
+            break
+        time.sleep(0.01)
+    assert len(calls) == 200
+    assert max(calls.values()) == 1
+
+
+def test_failed_thaw_drops_the_entry(path):
+    filled(3).save_snapshot(path)
+    restored = LRUCache(10)
+
+    def loader(key):
+        if key == "k1":
+            raise OSError("weights missing")
+        return key
+
+    restored.load_snapshot(path, loader=loader, warm="lazy")
+    assert restored.get("k1") is None
+    assert list(restored.keys()) == ["k0", "k2"]
+
+
+def test_periodic_snapshots(path):
+    cache = filled(3)
+    cache.start_snapshots(path, interval=0.05, serializer=pickle)
+    cache.put("late", 1)
+    cache.stop_snapshots()
+    restored = LRUCache(10)
+    restored.load_snapshot(path, pickle)
+    assert restored.get("late") == 1
@@ -0,0 +1,154 @@
+"""TieredCache and its DiskTier: spilling, promotion, TTLs and recovery."""
+
+import pickle
+import threading
+import time
+
+import pytest
+
+from tiered_cache import DiskTier, TieredCache
+
+
+class GatedSerializer:
+    """pickle whose dumps() blocks until the test opens the gate."""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.started = threading.Event()
+
+    def dumps(self, value):
+        self.started.set()
+        assert self.gate.wait(10)
+        return pickle.dumps(value)
+
+    def loads(self, data):
+        return pickle.loads(data)
+
+
+@pytest.fixture
+def make_cache(tmp_path):
+    caches = []
+
+    def make(capacity=2, **options):
+        cache = TieredCache(capacity, str(tmp_path / "disk"), 1 << 20, **options)
+        caches.append(cache)
+        return cache
+
+    yield make
+    for cache in caches:
+        cache.close()
+
+
+def test_evicted_entries_are_spilled_and_promoted(make_cache):
+    cache = make_cache(capacity=2)
+    for i in range(5):
+        cache.put(f"k{i}", {"value": i})
+    cache.flush()
+    assert len(cache.memory) == 2
+    assert len(cache) == 5
+    assert cache.get("k0") == {"value": 0}
+    assert "k0" not in cache.disk
+    assert "k0" in cache.memory.keys()
+
+
+def test_pending_entries_stay_readable(make_cache):
+    serializer = GatedSerializer()
+    cache = make_cache(capacity=1, serializer=serializer)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert serializer.started.wait(5)
+    assert cache.get("a") == 1
+    serializer.gate.set()
+    cache.flush()
+
+
+def test_overwrite_during_spill_never_resurfaces_old_value(make_cache):
+    serializer = GatedSerializer()
+    cache = make_cache(capacity=2, serializer=serializer, default_ttl=0.3)
+    cache.put("k", "v1")
+    cache.put("x", 0)
+    cache.put("y", 0)  # Evicts k; the writer blocks while serializing v1
+    assert serializer.started.wait(5)
+    cache.put("k", "v2")
+    serializer.gate.set()
+    cache.flush()
+    assert cache.get("k") == "v2"
+    assert "k" not in cache.disk
+    time.sleep(0.4)
+    assert cache.get("k") is None
+
+
+def test_spilled_entries_keep_their_ttl(make_cache):
+    cache = make_cache(capacity=1, default_ttl=0.2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.flush()
+    assert "a" in cache.disk
+    time.sleep(0.3)
+    assert cache.get("a") is None
+
+
+def test_promoted_entries_keep_their_remaining_ttl(make_cache):
+    cache = make_cache(capacity=1, default_ttl=0.5)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.flush()
+    assert cache.get("a") == 1
+    time.sleep(0.6)
+    assert cache.get("a") is None
+
+
+def test_put_drops_the_copy_on_disk(make_cache):
+    cache = make_cache(capacity=1)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.flush()
+    cache.put("a", 3)
+    cache.flush()
+    assert "a" not in cache.disk
+    assert cache.get("a") == 3
+
+
+def test_clear_empties_both_tiers(make_cache):
+    cache = make_cache(capacity=1)
+    for i in range(4):
+        cache.put(f"k{i}", i)
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.get("k0") is None
+
+
+def test_disk_tier_recovers_its_index(tmp_path):
+    disk = DiskTier(str(tmp_path), 1 << 20)
+    disk.put("a", b"1")
+    disk.put("b", b"2")
+    disk.discard("a")
+    disk.close()
+    reopened = DiskTier(str(tmp_path), 1 << 20)
+    assert "a" not in reopened
+    assert reopened.get("b") == b"2"
+    reopened.close()
+
+
+def test_disk_tier_truncates_a_damaged_tail(tmp_path):
+    disk = DiskTier(str(tmp_path), 1 << 20)
+    disk.put("a", b"1")
+    disk.close()
+    segment = next(tmp_path.glob("*.seg"))
+    with open(segment, "ab") as f:
+        f.write(b"\x00garbage")
+    reopened = DiskTier(str(tmp_path), 1 << 20)
+    assert reopened.get("a") == b"1"
+    reopened.put("b", b"2")
+    reopened.close()
+    assert DiskTier(str(tmp_path), 1 << 20).get("b") == b"2"
+
+
+def test_disk_tier_stays_within_budget(tmp_path):
+    disk = DiskTier(str(tmp_path), 4096, segment_bytes=1024)
+    for i in range(100):
+        disk.put(f"k{i}", b"x" * 100)
+    assert disk.size_bytes <= 4096 + 1024
+    assert "k99" in disk
+    assert "k0" not in disk
+    disk.close()
@@ -0,0 +1,58 @@
+"""Weight-aware eviction of LRUCache."""
+
+import pytest
+
+from lru_cache import LRUCache
+
+
+def sized(max_weight, capacity=100):
+    return LRUCache(capacity, weigher=lambda key, value: len(value), max_weight=max_weight)
+
+
+def test_evicts_least_recently_used_until_the_new_entry_fits():
+    cache = sized(10)
+    cache.put("a", "xxxx")
+    cache.put("b", "xxxx")
+    cache.get("a")
+    assert cache.put("c", "xxxx")  # b is the least recently used
+    assert list(cache.keys()) == ["a", "c"]
+    assert cache.weight == 8
+    assert cache.put("d", "x" * 10)
+    assert list(cache.keys()) == ["d"] and cache.weight == 10
+
+
+def test_oversized_entries_are_rejected():
+    cache = sized(5)
+    cache.put("a", "xx")
+    assert not cache.put("b", "x" * 6)
+    assert list(cache.keys()) == ["a"]
+    assert cache.weight == 2
+
+
+def test_updates_replace_the_old_weight():
+    cache = sized(10)
+    cache.put("a", "xxxxxx")
+    cache.put("a", "xx")
+    cache.put("b", "xxxxxxxx")
+    assert list(cache.keys()) == ["a", "b"]
+    assert cache.weight == 10
+
+
+def test_capacity_still_applies_and_invalidate_releases_weight():
+    cache = sized(100, capacity=2)
+    for key in "abc":
+        cache.put(key, "x")
+    assert list(cache.keys()) == ["b", "c"]
+    cache.invalidate("b")
+    assert cache.weight == 1
+    cache.clear()
+    assert cache.weight == 0
+
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        LRUCache(10, max_weight=5)
+    cache = LRUCache(10, weigher=lambda key, value: -1)
+    with pytest.raises(ValueError):
+        cache.put("a", 1)
+    assert LRUCache(3).weight == 0
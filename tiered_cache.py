@@ -0,0 +1,414 @@
+"""
+Two-tier cache: an in-memory LRUCache that spills its evictions to disk.
+
+Entries pushed out of the memory tier by capacity pressure are serialized
+and appended to segment files by a background thread, so eviction never
+blocks the caller. A later hit on disk promotes the entry back to memory.
+"""
+
+import logging
+import math
+import os
+import pickle
+import queue
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from lru_cache import LRUCache, RemovalCause, T
+
+logger = logging.getLogger("tiered_cache")
+
+# crc32 of key + value, key length, value length (_TOMBSTONE marks a deletion)
+_RECORD = struct.Struct("<III")
+_TOMBSTONE = 0xFFFFFFFF
+# Wall-clock expiry time (NaN if none) prefixed to every spilled value
+_EXPIRES = struct.Struct("<d")
+_SEGMENT_SUFFIX = ".seg"
+_MISSING = object()
+_DELETE = object()  # Queue marker: drop the key from disk
+_STOP = object()  # Queue marker: stop the writer thread
+
+DEFAULT_SEGMENT_BYTES = 64 * 1024 * 1024
+
+
+class DiskTier:
+    """
+    Byte-budgeted key/value store on append-only segment files.
+
+    Every put appends a record to the active segment and updates an
+    in-memory index of key -> location, kept in least to most recently used
+    order. Deletions append tombstones, so reopening the directory replays
+    the segments and recovers the index. When live data outgrows the budget
+    the coldest keys are dropped, and once the files exceed it compaction
+    rewrites the live records into fresh segments.
+    """
+
+    def __init__(self, directory: str, max_bytes: int,
+                 segment_bytes: int = DEFAULT_SEGMENT_BYTES, compact_target: float = 0.8):
+        """
+        Open (or create) a disk tier.
+
+        Args:
+            directory: Directory holding the segment files
+            max_bytes: Budget for the total size of the segment files
+            segment_bytes: Size at which the active segment is sealed
+            compact_target: Share of max_bytes kept as live data when over budget
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+        self.compact_target = compact_target
+        self._lock = threading.Lock()
+        self._index: "OrderedDict[bytes, Tuple[int, int, int, int]]" = OrderedDict()
+        self._files: Dict[int, Any] = {}  # segment id -> open file
+        self._sizes: Dict[int, int] = {}  # segment id -> file size
+        self._live_bytes = 0
+        self._recover()
+
+    def _path(self, segment: int) -> Path:
+        return self.directory / f"{segment:08d}{_SEGMENT_SUFFIX}"
+
+    def _open(self, segment: int):
+        handle = open(self._path(segment), "a+b")
+        self._files[segment] = handle
+        self._sizes[segment] = handle.seek(0, os.SEEK_END)
+        return handle
+
+    def _recover(self) -> None:
+        """Rebuild the index by replaying every segment in order."""
+        segments = sorted(int(path.stem) for path in self.directory.glob(f"*{_SEGMENT_SUFFIX}"))
+        for segment in segments:
+            handle = self._open(segment)
+            handle.seek(0)
+            data = handle.read()
+            offset = 0
+            while offset + _RECORD.size <= len(data):
+                crc, key_len, value_len = _RECORD.unpack_from(data, offset)
+                body = offset + _RECORD.size
+                stored_len = 0 if value_len == _TOMBSTONE else value_len
+                end = body + key_len + stored_len
+                if end > len(data) or zlib.crc32(data[body:end]) != crc:
+                    break
+                key = data[body:body + key_len]
+                self._discard_location(key)
+                if value_len != _TOMBSTONE:
+                    self._index[key] = (segment, body + key_len, value_len, end - offset)
+                    self._live_bytes += end - offset
+                offset = end
+            if offset < len(data):
+                logger.warning(f"Truncating damaged tail of {self._path(segment)} at byte {offset}")
+                handle.truncate(offset)
+                self._sizes[segment] = offset
+        self._active = segments[-1] if segments else 0
+        if self._active not in self._files:
+            self._open(self._active)
+
+    def _append(self, key: bytes, value: Optional[bytes]) -> Tuple[int, int, int]:
+        """Append a record (a tombstone when value is None); return segment, value offset, size."""
+        if self._sizes[self._active] >= self.segment_bytes:
+            self._active += 1
+            self._open(self._active)
+        payload = key + (value or b"")
+        record = _RECORD.pack(zlib.crc32(payload), len(key),
+                              _TOMBSTONE if value is None else len(value)) + payload
+        handle = self._files[self._active]
+        offset = self._sizes[self._active]
+        handle.write(record)
+        handle.flush()
+        self._sizes[self._active] = offset + len(record)
+        return self._active, offset + _RECORD.size + len(key), len(record)
+
+    def _discard_location(self, key: bytes) -> bool:
+        location = self._index.pop(key, None)
+        if location is None:
+            return False
+        self._live_bytes -= location[3]
+        return True
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store serialized data under key as the most recently used entry."""
+        encoded = key.encode()
+        with self._lock:
+            self._discard_location(encoded)
+            segment, offset, size = self._append(encoded, data)
+            self._index[encoded] = (segment, offset, len(data), size)
+            self._live_bytes += size
+            self._enforce_budget()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the data stored under key, or None."""
+        encoded = key.encode()
+        with self._lock:
+            data = self._read_locked(encoded)
+            if data is not None:
+                self._index.move_to_end(encoded)
+            return data
+
+    def pop(self, key: str) -> Optional[bytes]:
+        """Return and remove the data stored under key, or None."""
+        with self._lock:
+            data = self._read_locked(key.encode())
+            if data is not None:
+                self._delete_locked(key.encode())
+            return data
+
+    def _read_locked(self, encoded: bytes) -> Optional[bytes]:
+        location = self._index.get(encoded)
+        if location is None:
+            return None
+        segment, offset, length, _ = location
+        handle = self._files[segment]
+        handle.seek(offset)
+        return handle.read(length)
+
+    def _delete_locked(self, encoded: bytes) -> None:
+        if self._discard_location(encoded):
+            self._append(encoded, None)
+
+    def discard(self, key: str) -> None:
+        """Remove key if it is stored."""
+        with self._lock:
+            self._delete_locked(key.encode())
+
+    def __contains__(self, key: str) -> bool:
+        return key.encode() in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of the segment files, including garbage awaiting compaction."""
+        return sum(self._sizes.values())
+
+    def _enforce_budget(self) -> None:
+        """Drop the coldest entries and compact once the files exceed max_bytes."""
+        if sum(self._sizes.values()) <= self.max_bytes:
+            return
+        target = self.max_bytes * self.compact_target
+        while self._index and self._live_bytes > target:
+            self._discard_location(next(iter(self._index)))
+        self._compact()
+
+    def _compact(self) -> None:
+        """Rewrite live records into fresh segments and delete the old files."""
+        old_segments = list(self._files)
+        live = [(key, self._read_locked(key)) for key in self._index]
+        self._active = max(old_segments) + 1
+        self._open(self._active)
+        self._index.clear()
+        self._live_bytes = 0
+        for key, data in live:
+            segment, offset, size = self._append(key, data)
+            self._index[key] = (segment, offset, len(data), size)
+            self._live_bytes += size
+        for segment in old_segments:
+            self._files.pop(segment).close()
+            del self._sizes[segment]
+            self._path(segment).unlink()
+
+    def clear(self) -> None:
+        """Delete every entry and segment file."""
+        with self._lock:
+            for segment, handle in self._files.items():
+                handle.close()
+                self._path(segment).unlink()
+            self._files.clear()
+            self._sizes.clear()
+            self._index.clear()
+            self._live_bytes = 0
+            self._active += 1
+            self._open(self._active)
+
+    def close(self) -> None:
+        """Close every segment file."""
+        with self._lock:
+            for handle in self._files.values():
+                handle.close()
+            self._files.clear()
+
+
+class _SpillingLRUCache(LRUCache[T]):
+    """Memory tier that hands entries evicted for capacity, and their remaining TTL, to a spill callback."""
+
+    def __init__(self, capacity: int, spill, **kwargs):
+        super().__init__(capacity, **kwargs)
+        self._spill = spill
+        self._tracked = True
+
+    def _remove(self, key: str, cause: str) -> T:
+        deadline = self._expires.get(key) if cause == RemovalCause.SIZE else None
+        value = super()._remove(key, cause)
+        if cause == RemovalCause.SIZE:
+            self._spill(key, value, None if deadline is None else deadline - self._clock())
+        return value
+
+
+class TieredCache:
+    """
+    Memory LRUCache backed by a DiskTier for the entries it evicts.
+
+    Evicted entries wait in a pending map until the background writer has
+    serialized them to disk, so they stay readable the whole time. Disk hits
+    are promoted back to memory and removed from disk. An entry with a TTL
+    keeps its deadline on disk (as wall-clock time, so it survives restarts)
+    and is dropped instead of promoted once it has passed.
+    """
+
+    def __init__(self, capacity: int, directory: str, max_disk_bytes: int,
+                 serializer: Any = pickle, segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+                 **memory_options):
+        """
+        Initialize a new tiered cache.
+
+        Args:
+            capacity: Maximum number of entries kept in memory
+            directory: Directory for the disk tier's segment files
+            max_disk_bytes: Byte budget of the disk tier
+            serializer: Object with dumps() and loads(), pickle by default
+            segment_bytes: Size at which a disk segment is sealed
+            **memory_options: Extra LRUCache options for the memory tier
+        """
+        self.serializer = serializer
+        self.disk = DiskTier(directory, max_disk_bytes, segment_bytes)
+        self.memory = _SpillingLRUCache(capacity, self._spill, **memory_options)
+        self._lock = threading.RLock()
+        # Evicted (value, expires_at) entries not yet written to disk
+        self._pending: Dict[str, Tuple[Any, Optional[float]]] = {}
+        self._queue: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="tiered-cache-writer",
+                                        daemon=True)
+        self._writer.start()
+
+    def _spill(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        """Queue an evicted entry for the disk tier; called with the lock held."""
+        entry = (value, None if ttl is None else time.time() + ttl)
+        self._pending[key] = entry
+        self._queue.put((key, entry))
+
+    def _write_loop(self) -> None:
+        """Serialize queued entries to disk on the background thread."""
+        while True:
+            key, entry = self._queue.get()
+            try:
+                if key is _STOP:
+                    return
+                if entry is _DELETE:
+                    self.disk.discard(key)
+                    continue
+                with self._lock:
+                    if self._pending.get(key, _MISSING) is not entry:
+                        continue  # Promoted or overwritten while queued
+                value, expires_at = entry
+                try:
+                    self.disk.put(key, _EXPIRES.pack(math.nan if expires_at is None else expires_at)
+                                  + self.serializer.dumps(value))
+                except Exception as e:
+                    logger.error(f"Failed to spill {key!r} to disk: {e}")
+                with self._lock:
+                    if self._pending.get(key, _MISSING) is entry:
+                        del self._pending[key]
+                    else:
+                        # Promoted or overwritten during the write: the record is stale
+                        self.disk.discard(key)
+            finally:
+                self._queue.task_done()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Retrieve an entry from memory, the pending spills or disk.
+
+        Args:
+            key: Identifier for the entry
+
+        Returns:
+            The value if found in either tier, None otherwise
+        """
+        with self._lock:
+            value = self.memory.get(key)
+            if value is not None:
+                return value
+            entry = self._pending.pop(key, _MISSING)
+            if entry is not _MISSING:
+                return self._promote(key, *entry)
+        data = self.disk.pop(key)
+        if data is None:
+            return None
+        expires_at = _EXPIRES.unpack_from(data)[0]
+        value = self.serializer.loads(data[_EXPIRES.size:])
+        with self._lock:
+            current = self.memory.get(key)
+            if current is not None:
+                return current
+            return self._promote(key, value, None if expires_at != expires_at else expires_at)
+    
+    def _promote(self, key: str, value: Any, expires_at: Optional[float]) -> Optional[Any]:
+        """Move an entry back to memory with its remaining TTL; None if it has expired."""
+        ttl = None
+        if expires_at is not None:
+            ttl = expires_at - time.time()
+            if ttl <= 0:
+                return None
+        self.memory.put(key, value, ttl)
+        return value
+
+    def put(self, key: str, value: Any) -> bool:
+        """
+        Add or update an entry in the memory tier, dropping any older copy on disk.
+
+        Args:
+            key: Identifier for the entry
+            value: The value to store
+
+        Returns:
+            True if the value was stored in memory
+        """
+        with self._lock:
+            self._pending.pop(key, None)
+            stored = self.memory.put(key, value)
+        if key in self.disk:
+            self._queue.put((key, _DELETE))
+        return stored
+
+    def flush(self) -> None:
+        """Block until every queued spill has been written to disk."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Write pending spills, stop the writer thread and close the segment files."""
+        self.flush()
+        self._queue.put((_STOP, None))
+        self._writer.join()
+        self.disk.close()
+
+    def clear(self) -> None:
+        """Remove every entry from both tiers."""
+        self.flush()
+        with self._lock:
+            self.memory.clear()
+            self._pending.clear()
+            self.disk.clear()
+
+    def __len__(self) -> int:
+        """Return the number of entries across both tiers."""
+        with self._lock:
+            pending = sum(1 for key in self._pending if key not in self.disk)
+            return len(self.memory) + pending + len(self.disk)
+
+    def keys(self):
+        """Return the keys held in memory, ordered from least to most recently used."""
+        return self.memory.keys()
+
+    def values(self):
+        """Return the values held in memory, ordered from least to most recently used."""
+        return self.memory.values()
+
+    def items(self):
+        """Return the (key, value) pairs held in memory, ordered from least to most recently used."""
+        return self.memory.items()